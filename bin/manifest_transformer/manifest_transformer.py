@@ -12,7 +12,12 @@ if t.TYPE_CHECKING:
 
 import sys
 from src.args import get_argparser, CleanArgs
-from src.csv import manifest_transformer, manifest_validator, write_output_file
+from src.csv import (
+    atomic_output_file,
+    load_probe_cache,
+    manifest_validator_and_transformer,
+    save_probe_cache,
+)
 from src import exceptions as exc
 from src import cli
 from src import summary
@@ -48,15 +53,20 @@ def main(clean_args: CleanArgs):
             maybe_json_params_file=clean_args.json_params_file,
         )
 
-    # Run the main function
-    manifest_validator(clean_args)
-    output_io = manifest_transformer(clean_args)
+    # Reuse the probe of the input file from an earlier run, if any
+    probe = (
+        load_probe_cache(clean_args.input_file, clean_args.probe_cache_file)
+        if clean_args.probe_cache_file
+        else None
+    )
 
-    # Write the output file
-    try:
-        write_output_file(output_io, clean_args.output_file)
-    finally:
-        output_io.close()
+    # Validate and transform the manifest in a single read, streaming the
+    # transformed rows to a provisional output file that only replaces the
+    # output file if the manifest is valid
+    with atomic_output_file(clean_args.output_file) as output:
+        manifest_validator_and_transformer(clean_args, output)
+    if probe is not None:
+        save_probe_cache(probe, clean_args.probe_cache_file)
     return
 
 
@@ -124,6 +124,38 @@ class SummaryFile:
         return _validate.assert_valid_output_file(summary_file)
 
 
+class ProbeCacheFile:
+    """
+    Validates a probe cache file.
+
+    A clean probe cache file is a file that may not exist but whose parent
+    directory is writable.
+
+    Special conditions:
+    - If the probe cache file is None, None is returned as the clean probe cache file.
+    - If the probe cache file is equal to the input file, a ValidationError is raised.
+    """
+
+    def __init__(
+        self,
+        input_file: "t.Union[str, Path]",
+        probe_cache_file: t.Optional[t.Union["Path", str]],
+    ):
+        self._input_file: "Path" = Path(input_file)
+        self._probe_cache_file: t.Optional["Path"] = (
+            Path(probe_cache_file) if probe_cache_file is not None else None
+        )
+
+    @property
+    def clean(self) -> t.Optional["Path"]:
+        if self._probe_cache_file is None:
+            return None
+        if self._probe_cache_file.resolve() == self._input_file.resolve():
+            msg = f"Probe cache file cannot be the same as the input file: got {str(self._probe_cache_file)!r}"
+            raise exceptions.ValidationError(msg)
+        return _validate.assert_valid_output_file(self._probe_cache_file)
+
+
 def strict_clean_index(index: int, is_1_indexed: bool = True) -> int:
     if is_1_indexed and index < 1:
         msg = f"Index must be greater than 0, not '{index}' - remember that indices are 1-indexed"
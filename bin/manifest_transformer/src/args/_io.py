@@ -3,6 +3,8 @@ from pathlib import Path
 
 from src import exceptions as exc
 
+_CHUNK_SIZE_1MB = 1024 * 1024
+
 
 def check_write_permissions(path: Path) -> None:
     if not os.access(path, os.W_OK):
@@ -21,11 +23,13 @@ def check_file_not_empty(path: Path) -> None:
     if not path.is_file():
         msg = f"The file '{str(path)}' is not a file."
         raise exc.ValidationError(msg)
+    # Read in chunks, stopping at the first that is not only whitespace
     with open(path, "r") as file:
-        contents = file.read()
-        if not contents or contents.isspace():
-            msg = f"The file '{str(path)}' is empty or contains only whitespace."
-            raise exc.ValidationError(msg)
+        for chunk in iter(lambda: file.read(_CHUNK_SIZE_1MB), ""):
+            if not chunk.isspace():
+                return
+    msg = f"The file '{str(path)}' is empty or contains only whitespace."
+    raise exc.ValidationError(msg)
 
 
 def finalise_output_file(input_path: Path, output_path: Path) -> Path:
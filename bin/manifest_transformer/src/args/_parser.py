@@ -256,6 +256,14 @@ def _add_common_arguments_to_parser(parser, use_name: bool):
         dest=const.ARG_SUMMARY,
         metavar="SUMMARY",
     )
+    parser.add_argument(
+        "--probe-cache",
+        type=Path,
+        default=None,
+        help=const.HELP__PROBE_CACHE_FILE,
+        dest=const.ARG_PROBE_CACHE,
+        metavar="PROBE_CACHE",
+    )
 
     # Required columns
     parser.add_argument(
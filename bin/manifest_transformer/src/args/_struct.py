@@ -29,6 +29,7 @@ class CleanArgs:
     forced_header_row_index: t.Optional[int]
     reheader_mapping: t.Dict[t.Union[str, int], str]
     reheader_append: bool
+    probe_cache_file: t.Optional[Path] = None
     _json_params_file: t.Optional[Path] = None
 
     @property
@@ -195,6 +196,7 @@ class CleanArgs:
         input_file__raw = valid_dict[const.ARG_INPUT]
         output_file__raw = valid_dict[const.ARG_OUTPUT]
         summary_file__raw = valid_dict[const.ARG_SUMMARY]
+        probe_cache_file__raw = valid_dict.get(const.ARG_PROBE_CACHE)
         output_file_delimiter__raw = valid_dict[const.JSON_PARAM__OUTPUT_DELIMITER]
         forced_input_file_delimiter__raw = valid_dict[const.ARG_FORCE_INPUT_DELIMITER]
         forced_header_row_index__raw = valid_dict[const.ARG_FORCE_HEADER_ROW_INDEX]
@@ -211,6 +213,9 @@ class CleanArgs:
         summary_file__clean = _clean.SummaryFile(
             input_file__raw, summary_file__raw
         ).clean
+        probe_cache_file__clean = _clean.ProbeCacheFile(
+            input_file__raw, probe_cache_file__raw
+        ).clean
         output_file_delimiter__clean = _clean.clean_output_delimiter(
             output_file_delimiter__raw
         )
@@ -272,6 +277,7 @@ class CleanArgs:
             forced_header_row_index=forced_header_row_index__clean,
             reheader_mapping=reheader_mapping__clean,
             reheader_append=reheader_append__clean,
+            probe_cache_file=probe_cache_file__clean,
         )
         return instance
 
@@ -314,7 +320,10 @@ class ArgDictValidator:
             const.JSON_PARAM__FORCED_INPUT_DELIMITER,
             const.JSON_PARAM__FORCED_HEADER_ROW_INDEX,
         ]
-        if set(NECESSARY_KEYS) != raw_dict.keys():
+        OPTIONAL_KEYS = [
+            const.JSON_PARAM__PROBE_CACHE_FILE,
+        ]
+        if set(NECESSARY_KEYS) != raw_dict.keys() - set(OPTIONAL_KEYS):
             missing_keys = set(NECESSARY_KEYS) - set(raw_dict.keys())
             msg = f"Cannot parse arguments because the following keys are missing: {missing_keys}"
             raise exc.ValidationError(msg)
@@ -326,7 +335,7 @@ class ArgDictValidator:
         # mode
         self._valid_values__mode(raw_dict[const.JSON_PARAM__MODE])
 
-        # input_file, output_file, summary_file
+        # input_file, output_file, summary_file, probe_cache_file
         self._valid_values__input_file(
             raw_dict[const.JSON_PARAM__INPUT_FILE],
         )
@@ -338,6 +347,10 @@ class ArgDictValidator:
             raw_dict[const.JSON_PARAM__SUMMARY_FILE],
             key=const.JSON_PARAM__SUMMARY_FILE,
         )
+        self._valid_values__optional_file(
+            raw_dict.get(const.JSON_PARAM__PROBE_CACHE_FILE),
+            key=const.JSON_PARAM__PROBE_CACHE_FILE,
+        )
 
         # column_order
         self._valid_values__column(
@@ -11,6 +11,7 @@ HELP__JSON_INPUT_FILE = (
 
 HELP__OUTPUT_FILE = "REQUIRED. Output file path for the transformed tabular manifest file (CSV/TSV). You can specify a path to write to a specific file or a directory (appends input filename)."
 HELP__SUMMARY_FILE = "By default, no runtime summary JSON file is written. You can specify a path to write to a specific file or a directory (appends script+timestamp filename)."
+HELP__PROBE_CACHE_FILE = "By default, the head of the input file is probed on every run to find its delimiter and header rows. You can specify a path to a JSON file to save the probe to, which later runs on the same, unmodified, input file reuse instead of probing it again."
 HELP__CAST_OUTPUT_AS_TSV = (
     "Write output file as a TSV. By default, the output file is a CSV."
 )
@@ -57,6 +58,7 @@ JSON_PARAM__MODE = ARG_SUBCOMMAND = "mode"
 JSON_PARAM__INPUT_FILE = ARG_INPUT = "input_file"
 JSON_PARAM__OUTPUT_FILE = ARG_OUTPUT = "output_file"
 JSON_PARAM__SUMMARY_FILE = ARG_SUMMARY = "summary_file"
+JSON_PARAM__PROBE_CACHE_FILE = ARG_PROBE_CACHE = "probe_cache_file"
 JSON_PARAM__COLUMN_ORDER = "column_order"
 JSON_PARAM__REQUIRED_COLUMNS = "required_columns"
 JSON_PARAM__OPTIONAL_COLUMNS = "optional_columns"
@@ -1,8 +1,17 @@
-from ._entrypoint import manifest_transformer, manifest_validator
-from ._io import write_output_file
+from ._entrypoint import (
+    manifest_transformer,
+    manifest_validator,
+    manifest_validator_and_transformer,
+)
+from ._io import atomic_output_file, write_output_file
+from .probe import load_probe_cache, save_probe_cache
 
 __all__ = [
+    "atomic_output_file",
+    "load_probe_cache",
     "manifest_transformer",
     "manifest_validator",
+    "manifest_validator_and_transformer",
+    "save_probe_cache",
     "write_output_file",
 ]
@@ -4,7 +4,11 @@ import csv
 from functools import partial
 
 from src.args import CleanArgs
-from src.csv.parser import CSVParser, get_column_order_as_indices
+from src.csv.parser import (
+    CSVParser,
+    NullRowsAccumulator,
+    get_column_order_as_indices,
+)
 from src.csv.properties import CSVFileProperties
 from src.csv._transform import reorder_rows, ReheaderColumns
 from src.csv import _validate
@@ -25,46 +29,28 @@ def process_rows(
     return processed_rows
 
 
-def manifest_transformer(clean_args: CleanArgs) -> io.StringIO:
+def manifest_transformer(
+    clean_args: CleanArgs, output: t.Optional[t.TextIO] = None
+) -> t.TextIO:
     """
-    Trim, reorder and reheader a manifest file.
+    Trim, reorder and reheader a manifest file, writing it to the output text
+    handle, or to a new StringIO if no output is given, which is returned.
+
+    The rows are streamed from the CSV reader to the CSV writer one at a time,
+    so memory does not grow with the size of the manifest.
     """
     # Ensure clean_args are 0-indexed.
     CA = clean_args.copy_as_0_indexed()
 
     # Prepare the CSV parser.
-    csv_file_properties = CSVFileProperties.from_clean_args(clean_args)
-    csv_parser = CSVParser.from_csv_file_properties(
-        file_path=clean_args.input_file,
-        csv_file_properties=csv_file_properties,
-    )
-
-    # Prepare the column order.
-    column_order = get_column_order_as_indices(
-        mode=CA.mode,
-        column_order=CA.column_order,
-        csv_parser=csv_parser,
-    )
+    csv_file_properties, csv_parser = _prepare_csv_parser(clean_args)
 
     # Transform the CSV file.
-    partial_reorder_rows = partial(reorder_rows, column_index_order=column_order)
-    reheader_rows = ReheaderColumns(
-        CA.reheader_mapping, mode=CA.mode.value, append=CA.reheader_append
-    ).reheader_rows
+    output_file = io.StringIO() if output is None else output
     with csv_parser.get_csv_reader() as csv_reader:
-        rows = iter(csv_reader)
-        transformed_rows = process_rows(
-            rows,
-            reorder_func=partial_reorder_rows,
-            reheader_func=reheader_rows,
-        )
-        transformed_rows = list(transformed_rows)
-
-    # Write the transformed CSV file.
-    output_file = io.StringIO()
-    csv_writer = csv.writer(output_file, delimiter=CA.output_file_delimiter)
-    csv_writer.writerows(transformed_rows)
-    output_file.seek(0)
+        _write_transformed_rows(CA, csv_parser, iter(csv_reader), output_file)
+    if output is None:
+        output_file.seek(0)
     return output_file
 
 
@@ -80,25 +66,126 @@ def manifest_validator(clean_args: CleanArgs) -> bool:
     CA_0_idx = clean_args.copy_as_0_indexed()
 
     # Prepare the CSV parser & properties.
-    csv_file_properties = CSVFileProperties.from_clean_args(CA_0_idx)
+    csv_file_properties, csv_parser = _prepare_csv_parser(CA_0_idx)
+
+    # Possibly abort early if in column name but the parser didn't detect any headers
+    _assert_column_headers_detected(CA_0_idx, csv_file_properties)
+
+    # Get the validation report.
+    validation_report = _validate.get_validation_report(
+        clean_args=CA_0_idx,
+        csv_parser=csv_parser,
+        csv_file_properties=csv_file_properties,
+    )
+    return _display_validation_report(validation_report)
+
+
+def manifest_validator_and_transformer(
+    clean_args: CleanArgs, output: t.Optional[t.TextIO] = None
+) -> t.TextIO:
+    """
+    Validate and transform a manifest file in a single read of it, as
+    manifest_validator() and then manifest_transformer() would.
+
+    The transformed rows are written to the output text handle, or to a new
+    StringIO if no output is given, which is returned, while the rows are fed
+    to the validation report. The output is provisional until the report
+    passes: if the CSV file is invalid an exception is thrown after the
+    output is written, so the output should be discarded, e.g. by writing it
+    to an atomic_output_file().
+
+    Usage:
+        >>> with atomic_output_file(clean_args.output_file) as output:
+        ...     manifest_validator_and_transformer(clean_args, output)
+    """
+    # Ensure clean_args are 0-indexed.
+    CA_0_idx = clean_args.copy_as_0_indexed()
+
+    # Prepare the CSV parser & properties, once for both.
+    csv_file_properties, csv_parser = _prepare_csv_parser(CA_0_idx)
+
+    # Possibly abort early if in column name but the parser didn't detect any headers
+    _assert_column_headers_detected(CA_0_idx, csv_file_properties)
+
+    # Transform the CSV file, while scanning it for the validation report. The
+    # column header row is only checked against the column counts of all rows
+    # by the validation report, once they are known.
+    null_rows = NullRowsAccumulator()
+    output_file = io.StringIO() if output is None else output
+    rows = csv_parser.scan_rows([null_rows])
+    _write_transformed_rows(
+        CA_0_idx, csv_parser, rows, output_file, assert_sanity=False
+    )
+
+    # Get the validation report, from the scan.
+    validation_report = _validate.build_validation_report(
+        clean_args=CA_0_idx,
+        csv_parser=csv_parser,
+        csv_file_properties=csv_file_properties,
+        null_rows=null_rows,
+    )
+    _display_validation_report(validation_report)
+    if output is None:
+        output_file.seek(0)
+    return output_file
+
+
+def _prepare_csv_parser(
+    clean_args: CleanArgs,
+) -> t.Tuple[CSVFileProperties, CSVParser]:
+    csv_file_properties = CSVFileProperties.from_clean_args(clean_args)
     csv_parser = CSVParser.from_csv_file_properties(
         file_path=clean_args.input_file,
         csv_file_properties=csv_file_properties,
     )
+    return csv_file_properties, csv_parser
 
-    # Possibly abort early if in column name but the parser didn't detect any headers
+
+def _assert_column_headers_detected(
+    CA_0_idx: CleanArgs, csv_file_properties: CSVFileProperties
+) -> None:
     _validate.assert_column_headers_detected(
         mode=CA_0_idx.mode,
         has_column_headers=csv_file_properties.has_column_headers(),
         has_user_forced_column_header_index=csv_file_properties.is_forced_column_headers_line_index(),
     )
 
-    # Get the validation report.
-    validation_report = _validate.get_validation_report(
-        clean_args=CA_0_idx,
+
+def _write_transformed_rows(
+    CA: CleanArgs,
+    csv_parser: CSVParser,
+    rows: t.Iterator[t.List[t.Any]],
+    output_file: t.TextIO,
+    assert_sanity: bool = True,
+) -> None:
+    # Prepare the column order.
+    column_order = get_column_order_as_indices(
+        mode=CA.mode,
+        column_order=CA.column_order,
         csv_parser=csv_parser,
-        csv_file_properties=csv_file_properties,
+        assert_sanity=assert_sanity,
     )
+
+    # Transform the rows.
+    partial_reorder_rows = partial(reorder_rows, column_index_order=column_order)
+    reheader_rows = ReheaderColumns(
+        CA.reheader_mapping, mode=CA.mode.value, append=CA.reheader_append
+    ).reheader_rows
+    transformed_rows = process_rows(
+        rows,
+        reorder_func=partial_reorder_rows,
+        reheader_func=reheader_rows,
+    )
+
+    # Write the transformed rows.
+    csv_writer = csv.writer(output_file, delimiter=CA.output_file_delimiter)
+    csv_writer.writerows(transformed_rows)
+    return
+
+
+def _display_validation_report(
+    validation_report: _validate.CSVValidationReport,
+) -> bool:
     is_valid = validation_report.is_valid()
 
     # Display the validation report.
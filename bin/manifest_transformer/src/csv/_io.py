@@ -1,21 +1,65 @@
 import typing as t
-import tempfile
+from contextlib import contextmanager
 from pathlib import Path
+import os
 import shutil
+import stat
+import tempfile
 
 if t.TYPE_CHECKING:
     import io
 
+_OUTPUT_BUFFER_SIZE_1MB = 1024 * 1024
 
-def write_output_file(output_io: "io.StringIO", output_file: "Path"):
-    output_io.seek(0)
-    with tempfile.NamedTemporaryFile(delete=True) as temp_handle:
-        temp_file = Path(temp_handle.name)
 
-        # Write the output to the temporary file
-        with temp_file.open("w") as temp_io:
-            temp_io.write(output_io.getvalue())
+@contextmanager
+def atomic_output_file(
+    output_file: t.Union[str, Path], buffering: int = _OUTPUT_BUFFER_SIZE_1MB
+) -> t.Generator[t.TextIO, None, None]:
+    """
+    Open a text handle that writes to a temporary file next to the output file,
+    which replaces the output file only once it is completely written.
+
+    The temporary file is fsynced and then moved into place with os.replace, so
+    the output file is never left partially written and is written only once.
+    It keeps the permissions of the output file it replaces, or else gets the
+    permissions of a newly created file. If an error is raised, the output file
+    is left untouched.
+    """
+    output_file = Path(output_file)
+    fd, temp_name = tempfile.mkstemp(
+        dir=output_file.parent, prefix=f".{output_file.name}.", suffix=".tmp"
+    )
+    temp_file = Path(temp_name)
+    try:
+        with open(fd, "w", buffering=buffering) as output:
+            yield output
+            output.flush()
+            # mkstemp creates the file readable and writable only by its owner
+            os.fchmod(output.fileno(), _get_output_file_mode(output_file))
+            os.fsync(output.fileno())
+        os.replace(temp_file, output_file)
+    except BaseException:
+        temp_file.unlink(missing_ok=True)
+        raise
 
-        # Copy the temporary file to the output file
-        shutil.copy(temp_file, output_file)
+
+def _get_output_file_mode(output_file: Path) -> int:
+    """
+    The permission bits of the existing output file, else those that open()
+    would create it with under the current umask.
+    """
+    try:
+        return stat.S_IMODE(output_file.stat().st_mode)
+    except FileNotFoundError:
+        # The umask can only be read by setting it
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def write_output_file(output_io: "io.StringIO", output_file: "Path"):
+    output_io.seek(0)
+    with atomic_output_file(output_file) as output:
+        shutil.copyfileobj(output_io, output, _OUTPUT_BUFFER_SIZE_1MB)
     return
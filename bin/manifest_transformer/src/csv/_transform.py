@@ -1,7 +1,11 @@
 import typing as t
 import itertools as it
+import operator
 from src import constants as const
 
+# Rows are reordered in blocks of this many rows by reorder_rows()
+_REORDER_BLOCK_SIZE = 4096
+
 
 class ReheaderColumns:
     def __init__(
@@ -139,48 +143,69 @@ class ReorderColumns:
 
     def __init__(self, column_index_order: t.Iterable[int]) -> None:
         self._reorder_sequence = list(column_index_order)
-        self._reorder_map: t.Dict[int, int] = self._create_reorder_map(
-            self._reorder_sequence
-        )
+        self._validate_reorder_sequence(self._reorder_sequence)
+        self._projection = self._compile_projection(self._reorder_sequence)
+        # Rows with fewer columns than this are ragged, and are reordered by index.
+        self._min_row_length = max(self._reorder_sequence, default=-1) + 1
 
-    def _create_reorder_map(self, column_index_order: t.List[int]) -> t.Dict[int, int]:
+    @staticmethod
+    def _validate_reorder_sequence(column_index_order: t.List[int]) -> None:
         """
-        Create a map of new index to old index.
+        Raise a ValueError if any index is negative or repeated.
         """
-        # Check for errors.
         if any(index < 0 for index in column_index_order):
             raise ValueError("Negative index.")
         if len(column_index_order) != len(set(column_index_order)):
             raise ValueError("Duplicate index.")
+        return
 
-        # Create the map.
-        reorder_map = {}
-        for new_index, old_index in enumerate(column_index_order):
-            reorder_map[new_index] = old_index
-        return reorder_map
+    @staticmethod
+    def _compile_projection(
+        column_index_order: t.List[int],
+    ) -> t.Optional[t.Callable[[t.List[t.Any]], t.Sequence[t.Any]]]:
+        """
+        Compile the column index order into a single itemgetter, that projects a
+        row with all the columns in one call, or None if there are no columns.
+        """
+        if not column_index_order:
+            return None
+        if len(column_index_order) == 1:
+            # A single index would be projected to the value, not a sequence of it.
+            index = column_index_order[0]
+            return operator.itemgetter(slice(index, index + 1))
+        return operator.itemgetter(*column_index_order)
+
+    def _reorder_ragged(self, row: t.List[t.Any]) -> t.List[t.Any]:
+        """
+        Reorder a row with fewer columns than the projection, ignoring the
+        out-of-bounds indices.
+        """
+        row_length = len(row)
+        return [row[index] for index in self._reorder_sequence if index < row_length]
 
     def reorder(self, row: t.List[t.Any]) -> t.List[t.Any]:
         """
         Reorder (and in some cases truncate) columns in a row.
         """
-        reorder_map = self._reorder_map
-        new_row_length = len(self._reorder_sequence)
-
-        if not row:
-            return []
-        if not new_row_length:
+        if self._projection is None:
             return []
+        if len(row) >= self._min_row_length:
+            return list(self._projection(row))
+        return self._reorder_ragged(row)
 
-        new_row = []
-        for new_index in range(new_row_length):
-            old_index = reorder_map.get(new_index, None)
-            # If the new index is out-of-bounds, then ignore it.
-            if old_index is None or old_index >= len(row):
-                continue
-            # If the new index is in-bounds, then append the corresponding value.
-            value = row[old_index]
-            new_row.append(value)
-        return new_row
+    def reorder_block(self, rows: t.Sequence[t.List[t.Any]]) -> t.List[t.List[t.Any]]:
+        """
+        Reorder (and in some cases truncate) columns in each of a block of rows.
+        """
+        projection = self._projection
+        if projection is None:
+            return [[] for _ in rows]
+        min_row_length = self._min_row_length
+        reorder_ragged = self._reorder_ragged
+        return [
+            list(projection(row)) if len(row) >= min_row_length else reorder_ragged(row)
+            for row in rows
+        ]
 
 
 def reorder_row(row: t.List[t.Any], column_index_order: t.List[int]) -> t.List[t.Any]:
@@ -216,5 +241,9 @@ def reorder_rows(
     - If an index is repeated, then a ValueError is raised.
     """
     transformer = ReorderColumns(column_index_order)
-    for row in rows:
-        yield transformer.reorder(row)
+    rows = iter(rows)
+    while True:
+        block = list(it.islice(rows, _REORDER_BLOCK_SIZE))
+        if not block:
+            return
+        yield from transformer.reorder_block(block)
@@ -5,6 +5,7 @@ from dataclasses import dataclass, field
 from src import exceptions as exc
 from src.enums import ColumnMode
 from src import constants as const
+from src.csv.parser import NullRowsAccumulator
 
 if t.TYPE_CHECKING:
     from src.csv.parser import CSVParser
@@ -208,8 +209,37 @@ def get_validation_report(
     csv_parser: "CSVParser",
     csv_file_properties: "CSVFileProperties",
 ) -> CSVValidationReport:
+    """
+    Validate the CSV file against the arguments.
+
+    The file is read once: each row is fed to the accumulators of the report,
+    while the parser collects the column header names and column counts that
+    the other checks reuse.
+    """
+    # Scan the file once, for the null rows, column headers and column counts
+    null_rows = NullRowsAccumulator()
+    csv_parser.scan([null_rows])
+    return build_validation_report(
+        clean_args=clean_args,
+        csv_parser=csv_parser,
+        csv_file_properties=csv_file_properties,
+        null_rows=null_rows,
+    )
+
+
+def build_validation_report(
+    clean_args: "CleanArgs",
+    csv_parser: "CSVParser",
+    csv_file_properties: "CSVFileProperties",
+    null_rows: NullRowsAccumulator,
+) -> CSVValidationReport:
+    """
+    Build the validation report of a CSV file that the parser has already
+    scanned, feeding the null_rows accumulator, so the file is not read again.
+    """
     CA_0_idx = clean_args.copy_as_0_indexed()
     CA_1_idx = clean_args.copy_as_1_indexed()
+
     # Find the detected column-headers detected and whether forced or not
     has_column_headers = csv_file_properties.has_column_headers()
     has_forced_columns_headers = (
@@ -257,7 +287,7 @@ def get_validation_report(
     ) = csv_parser.count_columns_comprehensively()
 
     # Find if any rows have null values
-    rows_with_nulls = csv_parser.find_rows_with_nulls(one_index=CA_1_idx.is_1_indexed)
+    rows_with_nulls = null_rows.find_rows_with_nulls(one_index=CA_1_idx.is_1_indexed)
 
     # Generate the validation report
     validation_report = CSVValidationReport(
@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 import typing as t
 import csv
+from abc import ABC, abstractmethod
 from contextlib import contextmanager
 from pathlib import Path
 from collections import Counter
@@ -15,6 +16,92 @@ if t.TYPE_CHECKING:
     from src.csv.properties import CSVFileProperties
 
 
+class RowAccumulator(ABC):
+    """
+    RowAccumulator collects a statistic of the rows of a CSV file as they are
+    read by CSVParser.scan(), so that any number of statistics are found in a
+    single read of the file.
+
+    Subclasses implement add_row(), and add_header() if the column header row
+    is of interest.
+    """
+
+    def add_header(self, row: t.List[str]) -> None:
+        return
+
+    @abstractmethod
+    def add_row(self, index: int, row: t.List[str]) -> None:
+        ...
+
+
+class ColumnHeaderAccumulator(RowAccumulator):
+    """
+    Keeps the column header row, if any.
+    """
+
+    def __init__(self) -> None:
+        self.column_header_names: t.Optional[t.Tuple[str, ...]] = None
+
+    def add_header(self, row: t.List[str]) -> None:
+        self.column_header_names = tuple(row)
+
+    def add_row(self, index: int, row: t.List[str]) -> None:
+        return
+
+
+class ColumnCountAccumulator(RowAccumulator):
+    """
+    Counts the rows of each column count, the column header row included.
+    """
+
+    def __init__(self) -> None:
+        self.column_count_histogram: t.Counter[int] = Counter()
+        self.first_row_column_count = 0
+        self.row_count = 0
+
+    def add_header(self, row: t.List[str]) -> None:
+        self.add_row(0, row)
+
+    def add_row(self, index: int, row: t.List[str]) -> None:
+        if self.row_count == 0:
+            self.first_row_column_count = len(row)
+        self.column_count_histogram[len(row)] += 1
+        self.row_count += 1
+
+    def count_columns_comprehensively(self) -> t.Tuple[int, bool]:
+        """
+        The most common column count, and whether all rows have it.
+        """
+        if len(self.column_count_histogram) == 0:
+            return (0, True)
+        # `most_common(1)` returns a list of one (column count, row count) tuple
+        column_count, row_freq = self.column_count_histogram.most_common(1)[0]
+        return (column_count, row_freq == self.row_count)
+
+
+class NullRowsAccumulator(RowAccumulator):
+    """
+    Collects the indices of the rows, after the column header row, with a null
+    value in any cell. Row indices count the column header row, if any.
+    """
+
+    def __init__(self, extra_null_values: t.Optional[t.List[str]] = None) -> None:
+        null_values: t.List[str] = const.get_null_values()
+        if extra_null_values is not None:
+            null_values.extend(extra_null_values)
+        self._null_values_set = set(const.transform_to_many_cases(null_values))
+        self.null_rows: t.List[int] = []
+
+    def add_row(self, index: int, row: t.List[str]) -> None:
+        if not self._null_values_set.isdisjoint(row):
+            self.null_rows.append(index)
+
+    def find_rows_with_nulls(self, one_index: bool = False) -> t.List[int]:
+        if one_index:
+            return [row + 1 for row in self.null_rows]
+        return list(self.null_rows)
+
+
 class CSVParser:
     def __init__(
         self,
@@ -30,6 +117,7 @@ class CSVParser:
         self._has_header = has_header
         self._columns_count = 0
         self._columns_count_comprehensively: t.Tuple[int, bool] = (0, True)
+        self._column_header_names: t.Optional[t.Tuple[str, ...]] = None
         self.__init__guard_kwargs(dialect=dialect, delimiter=delimiter)
         if dialect is not None:
             self._dialect = dialect
@@ -101,8 +189,92 @@ class CSVParser:
             finally:
                 pass
 
+    def scan(self, accumulators: t.Iterable[RowAccumulator] = ()) -> None:
+        """
+        Read the CSV file once, feeding the column header row, if any, and then
+        every row to each accumulator.
+
+        The column header names and the column counts are also collected, and
+        remembered, so later calls of column_header_names(), count_columns()
+        and count_columns_comprehensively() do not read the file again.
+
+        Usage:
+            >>> null_rows = NullRowsAccumulator()
+            >>> csv_parser.scan([null_rows])
+            >>> csv_parser.count_columns_comprehensively()  # no further read
+        """
+        for _ in self.scan_rows(accumulators):
+            pass
+        return
+
+    def scan_rows(
+        self, accumulators: t.Iterable[RowAccumulator] = ()
+    ) -> t.Iterator[t.List[str]]:
+        """
+        As scan(), but yield every row, the column header row included, once it
+        has been fed to the accumulators, so the rows can be transformed in the
+        same read of the file.
+
+        The column header names and column counts are only remembered once the
+        rows are exhausted.
+        """
+        column_headers = ColumnHeaderAccumulator()
+        column_counts = ColumnCountAccumulator()
+        all_accumulators = [column_headers, column_counts, *accumulators]
+        with self.get_csv_reader() as reader:
+            header_row = self._scan_header_row(reader, all_accumulators)
+            start_idx = 0 if header_row is None else 1
+            if header_row is not None:
+                yield header_row
+            # The column header accumulator has no interest in the other rows
+            add_row_funcs = [
+                accumulator.add_row for accumulator in all_accumulators[1:]
+            ]
+            for idx, row in enumerate(reader, start=start_idx):
+                for add_row in add_row_funcs:
+                    add_row(idx, row)
+                yield row
+        self._remember_scan(column_headers, column_counts)
+        return
+
+    def _remember_scan(
+        self,
+        column_headers: ColumnHeaderAccumulator,
+        column_counts: ColumnCountAccumulator,
+    ) -> None:
+        """
+        Remember the column header names and column counts of a finished scan,
+        so they are not read from the file again.
+        """
+        if column_headers.column_header_names is not None:
+            self._column_header_names = column_headers.column_header_names
+        self._columns_count = column_counts.first_row_column_count
+        self._columns_count_comprehensively = (
+            column_counts.count_columns_comprehensively()
+        )
+        return
+
+    def _scan_header_row(
+        self, reader: "_csv.reader", accumulators: t.Iterable[RowAccumulator]
+    ) -> t.Optional[t.List[str]]:
+        """
+        Read the column header row, if expected and the file is not empty, and
+        feed it to the accumulators.
+        """
+        if not self._has_header:
+            return None
+        header_row = next(reader, None)
+        if header_row is None:
+            return None
+        for accumulator in accumulators:
+            accumulator.add_header(header_row)
+        return header_row
+
     def translate_column_names_to_indices(
-        self, column_names: t.Iterable[str], one_index: bool = False
+        self,
+        column_names: t.Iterable[str],
+        one_index: bool = False,
+        assert_sanity: bool = True,
     ) -> t.Tuple[int, ...]:
         """
         Translate column names to column indices, in the order they are provided. The indices are 0-based.
@@ -111,8 +283,9 @@ class CSVParser:
 
         column_names: The column names to translate.
         one_index: Whether to return 1-based indices.
+        assert_sanity: Whether to check the header row against the column counts of all rows, which reads the whole file.
         """
-        column_names_ordered = self.column_header_names()
+        column_names_ordered = self.column_header_names(assert_sanity=assert_sanity)
         increment = 1 if one_index else 0
         indices = []
         for column_name in column_names:
@@ -146,24 +319,31 @@ class CSVParser:
         )
         return indices
 
-    def column_header_names(self) -> t.Tuple[str, ...]:
+    def column_header_names(self, assert_sanity: bool = True) -> t.Tuple[str, ...]:
         """
         Return the column names from the header row.
 
+        Unless assert_sanity is False, the header row is checked against the
+        column counts of all rows, which reads the whole file unless it was
+        already scanned.
+
         Raises a RuntimeError if called when initialisation was CSVParser(has_header=False).
         """
         if self._has_header:
             column_names = self._get_column_header_names()
-            self._assert_column_names_sanity(column_names)
+            if assert_sanity:
+                self._assert_column_names_sanity(column_names)
             return column_names
         else:
             msg = "CSVParser was not initialized to expect a header row. Create a new CSVParser with has_header=True."
             raise RuntimeError(msg)
 
     def _get_column_header_names(self) -> t.Tuple[str, ...]:
-        with self.get_csv_reader() as reader:
-            header_row = next(reader)
-            return tuple(header_row)
+        if self._column_header_names is None:
+            with self.get_csv_reader() as reader:
+                header_row = next(reader)
+                self._column_header_names = tuple(header_row)
+        return self._column_header_names
 
     def _assert_column_names_sanity(
         self, column_names: t.Tuple[str, ...]
@@ -217,22 +397,9 @@ class CSVParser:
         return self._columns_count_comprehensively
 
     def _get_columns_count_comprehensively(self) -> t.Tuple[int, bool]:
-        counter = Counter()
-        row_count = 0
-        with self.get_csv_reader() as reader:
-            for row in reader:
-                counter[len(row)] += 1
-                row_count += 1
-        # Explain the following code: `(counter.most_common(1)[0][0], len(counter) == 1)`
-        # `counter.most_common(1)` returns a list of tuples of the form (length, count).
-        # `counter.most_common(1)[0]` returns the first tuple in the list.
-        if len(counter) == 0:
-            column_count = 0
-            same_column_count_for_all_rows = True
-        else:
-            column_count, row_freq = counter.most_common(1)[0]
-            same_column_count_for_all_rows = row_freq == row_count
-        return (column_count, same_column_count_for_all_rows)
+        column_counts = ColumnCountAccumulator()
+        self.scan([column_counts])
+        return column_counts.count_columns_comprehensively()
 
     def find_duplicate_headers(
         self, one_index: bool = False
@@ -281,45 +448,23 @@ class CSVParser:
         Returns:
             A list of row indices that are completely empty.
         """
-        # Find null containing rows
-        null_rows = self._find_rows_with_nulls(extra_null_values=extra_null_values)
-        if one_index:
-            null_rows = [row + 1 for row in null_rows]
-        return null_rows
-
-    def _find_rows_with_nulls(
-        self, extra_null_values: t.Optional[t.List[str]] = None
-    ) -> t.List[int]:
-        # Prepare null values
-        null_values: t.List[str] = const.get_null_values()
-        if extra_null_values is not None:
-            null_values.extend(extra_null_values)
-        null_values = const.transform_to_many_cases(null_values)
-        null_values_set = set(null_values)
-
-        # Find null containing rows
-        null_rows = []
-        with self.get_csv_reader() as reader:
-            start_idx = 0
-            if self._has_header:
-                next(reader)
-                start_idx += 1
-            for idx, row in enumerate(reader, start=start_idx):
-                if any(cell in null_values_set for cell in row):
-                    null_rows.append(idx)
-        return null_rows
+        null_rows = NullRowsAccumulator(extra_null_values=extra_null_values)
+        self.scan([null_rows])
+        return null_rows.find_rows_with_nulls(one_index=one_index)
 
 
 def get_column_order_as_indices(
     csv_parser: "CSVParser",
     mode: ColumnMode,
     column_order: t.Iterable[t.Union[str, int]],
+    assert_sanity: bool = True,
 ) -> t.Tuple[int, ...]:
     try:
         indices = _get_column_order_as_indices(
             csv_parser=csv_parser,
             mode=mode,
             column_order=column_order,
+            assert_sanity=assert_sanity,
         )
     except RuntimeError as err:
         msg = "It is very likely that the CSV file has no header row or you did set/force the correct header index."
@@ -331,6 +476,7 @@ def _get_column_order_as_indices(
     csv_parser: "CSVParser",
     mode: ColumnMode,
     column_order: t.Iterable[t.Union[str, int]],
+    assert_sanity: bool = True,
 ) -> t.Tuple[int, ...]:
     if mode == ColumnMode.COLUMN_INDICES:
         column_order_as_indices = [int(elem) for elem in column_order]
@@ -339,6 +485,7 @@ def _get_column_order_as_indices(
         column_order_as_indices = csv_parser.translate_column_names_to_indices(
             column_names=column_names,
             one_index=False,
+            assert_sanity=assert_sanity,
         )
     else:
         raise NotImplementedError(f"Invalid mode: {mode!r}")
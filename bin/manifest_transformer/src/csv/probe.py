@@ -0,0 +1,356 @@
+import typing as t
+from contextlib import suppress
+from pathlib import Path
+import csv
+import functools
+import io
+import json
+import os
+
+from src import constants as const
+from src.csv._io import atomic_output_file
+
+_CHUNK_SIZE_1MB = 1024 * 1024
+# The head is read with room for the file headers before the sniffed 1MB
+_HEAD_SIZE_2MB = 2 * _CHUNK_SIZE_1MB
+_PROBE_CACHE_VERSION = 1
+_DIALECT_ATTRIBUTES = (
+    "delimiter",
+    "quotechar",
+    "escapechar",
+    "doublequote",
+    "skipinitialspace",
+    "lineterminator",
+    "quoting",
+)
+
+
+class FileFingerprint(t.NamedTuple):
+    """
+    Identifies a version of a file by its resolved path, size and modification time.
+    """
+
+    path: str
+    size: int
+    mtime_ns: int
+
+    @classmethod
+    def from_path(cls, file_path: t.Union[str, Path]) -> "FileFingerprint":
+        stat = os.stat(file_path)
+        return cls(
+            path=os.path.realpath(file_path),
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+        )
+
+
+class CSVFileProbe:
+    """
+    CSVFileProbe reads the head of a CSV file once into a buffer, and derives
+    from it, and then remembers, the properties that CSVFileProperties is built
+    from: the file header line indices, the first tabular line index and
+    offset, the sniffed dialect, whether the sniffer sees a column header row
+    and the column header line index matching some column names.
+
+    The remembered properties, or facts, are JSON serialisable, so they can be
+    saved to a probe cache file and loaded by a later run on the same version
+    of the file, which then does not read its head at all.
+
+    Use get_csv_file_probe() to share one probe per file fingerprint.
+    """
+
+    def __init__(
+        self,
+        fingerprint: FileFingerprint,
+        prefix: t.Optional[str] = None,
+        facts: t.Optional[t.Dict[str, t.Any]] = None,
+    ) -> None:
+        self.fingerprint = fingerprint
+        self._file_path = Path(fingerprint.path)
+        self._prefix = const.FILE_HEADER_LINE_PREFIX if prefix is None else prefix
+        self.facts: t.Dict[str, t.Any] = {} if facts is None else dict(facts)
+        self._head = ""
+        self._head_encoding = ""
+        self._is_head_complete = False
+        self.head_reads = 0
+
+    @property
+    def prefix(self) -> str:
+        return self._prefix
+
+    def _read_head(self, min_size: int) -> str:
+        """
+        The head of the file, of at least min_size characters unless the file is
+        shorter, read as text with line endings untranslated.
+        """
+        is_unread = self.head_reads == 0
+        if is_unread or (len(self._head) < min_size and not self._is_head_complete):
+            size = max(min_size, 2 * len(self._head), _HEAD_SIZE_2MB)
+            with open(self._file_path, newline="") as csv_file:
+                self._head = csv_file.read(size)
+                self._head_encoding = csv_file.encoding
+            self._is_head_complete = len(self._head) < size
+            self.head_reads += 1
+        return self._head
+
+    def _head_lines(self, max_line: int) -> t.List[str]:
+        """
+        The first max_line lines of the file, as returned by readline(), with
+        line endings untranslated.
+        """
+        min_size = 0
+        while True:
+            head = self._read_head(min_size)
+            lines = []
+            head_file = io.StringIO(head, newline="")
+            while len(lines) < max_line:
+                line = head_file.readline()
+                if not line:
+                    break
+                lines.append(line)
+            # A line without a line ending may be cut short by the head
+            is_cut_short = lines and not lines[-1].endswith(("\n", "\r"))
+            if self._is_head_complete or not is_cut_short:
+                return lines
+            min_size = 2 * len(head)
+
+    def _memoise(self, key: str, func: t.Callable[[], t.Any]) -> t.Any:
+        if key not in self.facts:
+            self.facts[key] = func()
+        return self.facts[key]
+
+    def file_header_indices(self, max_line: int = 20) -> t.List[int]:
+        """
+        Line indices of the file headers in the first max_line lines.
+        """
+
+        def _file_header_indices() -> t.List[int]:
+            return read_file_header_indices(
+                _translated_lines(self._head_lines(max_line)),
+                prefix=self._prefix,
+                max_line=max_line,
+            )
+
+        return list(
+            self._memoise(f"file_header_indices:{max_line}", _file_header_indices)
+        )
+
+    def first_tabular_line(self) -> t.Tuple[int, int]:
+        """
+        The 0-indexed line index and byte offset of the first line that is not a
+        file header line.
+        """
+        line_idx, offset, _ = self._first_tabular_line()
+        return line_idx, offset
+
+    def _first_tabular_line(self) -> t.Tuple[int, int, int]:
+        def _first_tabular_line() -> t.List[int]:
+            file_header_idxs = self.file_header_indices()
+            stop_row_idx = max(file_header_idxs) + 1 if file_header_idxs else 0
+            lines = self._head_lines(stop_row_idx)
+            char_offset = sum(map(len, lines))
+            head = self._read_head(char_offset)
+            offset = len(head[:char_offset].encode(self._head_encoding))
+            return [stop_row_idx, offset, char_offset]
+
+        line_idx, offset, char_offset = self._memoise(
+            "first_tabular_line", _first_tabular_line
+        )
+        return line_idx, offset, char_offset
+
+    def _tabular_sample(self) -> str:
+        """
+        The first 1MB of the file from the first tabular line.
+        """
+        _, _, char_offset = self._first_tabular_line()
+        end = char_offset + _CHUNK_SIZE_1MB
+        head = self._read_head(end)
+        return head[char_offset:end]
+
+    def sniff_dialect(
+        self, delimiters: t.Optional[t.Iterable[str]] = None
+    ) -> t.Type[csv.Dialect]:
+        """
+        The dialect sniffed by csv.Sniffer from the first 1MB of the file from
+        the first tabular line, trying only the given delimiters, if any.
+
+        Raises a csv.Error if the dialect cannot be sniffed.
+        """
+        delimiters = None if delimiters is None else "".join(delimiters)
+
+        def _sniff_dialect() -> t.Dict[str, t.Any]:
+            try:
+                dialect = csv.Sniffer().sniff(
+                    self._tabular_sample(), delimiters=delimiters
+                )
+            except csv.Error as err:
+                return {"error": str(err)}
+            return {name: getattr(dialect, name) for name in _DIALECT_ATTRIBUTES}
+
+        attributes = self._memoise(f"dialect:{delimiters!r}", _sniff_dialect)
+        if "error" in attributes:
+            raise csv.Error(attributes["error"])
+        return type("dialect", (csv.Dialect,), {"_name": "sniffed", **attributes})
+
+    def has_header(self) -> bool:
+        """
+        Whether csv.Sniffer considers the first tabular line to be a column
+        header row.
+
+        Raises a csv.Error if the sniffer cannot tell.
+        """
+
+        def _has_header() -> t.Dict[str, t.Any]:
+            try:
+                return {"has_header": csv.Sniffer().has_header(self._tabular_sample())}
+            except csv.Error as err:
+                return {"error": str(err)}
+
+        result = self._memoise("has_header", _has_header)
+        if "error" in result:
+            raise csv.Error(result["error"])
+        return result["has_header"]
+
+    def column_headers_line_index_by_name(
+        self,
+        column_names: t.Sequence[str],
+        max_line: int = 20,
+        case_sensitive: bool = True,
+    ) -> int:
+        """
+        The line index of the column headers, matching the column names in the
+        first max_line lines, or -1 if none match.
+        """
+
+        def _column_headers_line_index_by_name() -> int:
+            return read_column_headers_line_index_by_name(
+                _translated_lines(self._head_lines(max_line)),
+                column_names=column_names,
+                max_line=max_line,
+                case_sensitive=case_sensitive,
+            )
+
+        arguments = [list(column_names), max_line, case_sensitive]
+        key = f"column_headers_by_name:{json.dumps(arguments)}"
+        return self._memoise(key, _column_headers_line_index_by_name)
+
+
+def _translated_lines(lines: t.List[str]) -> t.TextIO:
+    """
+    The lines as a text handle with universal newlines translated, as if the
+    file was opened without newline="".
+    """
+    return io.StringIO("".join(lines), newline=None)
+
+
+def read_file_header_indices(
+    csv_file: t.TextIO,
+    prefix: t.Optional[str] = None,
+    max_line: t.Optional[int] = 20,
+) -> t.List[int]:
+    """
+    Read the line indices of the file headers from an open CSV file, in its
+    first max_line lines, or all of them if max_line is None.
+    """
+    prefix = const.FILE_HEADER_LINE_PREFIX if prefix is None else prefix
+    file_header_indices = []
+    line_idx = 0
+    while True:
+        line = csv_file.readline()
+        if not line:
+            break
+        if line.startswith(prefix):
+            file_header_indices.append(line_idx)
+        line_idx += 1
+        if max_line is not None and line_idx >= max_line:
+            break
+    return file_header_indices
+
+
+def read_column_headers_line_index_by_name(
+    csv_file: t.TextIO,
+    column_names: t.Sequence[str],
+    max_line: t.Optional[int] = 20,
+    case_sensitive: bool = False,
+) -> int:
+    """
+    Read the line index of the column headers from an open CSV file, matching
+    the column names in its first max_line lines, or -1 if none match.
+    """
+    column_names = column_names if case_sensitive else [n.lower() for n in column_names]
+    scores = {}
+    line_idx = 0
+    while True:
+        line = csv_file.readline()
+        # Break if EOF or max_line reached
+        if not line or (max_line is not None and line_idx >= max_line):
+            break
+        line = line if case_sensitive else line.lower()
+        score = [1 for column_name in column_names if column_name in line]
+        scores[line_idx] = sum(score)
+        # Increment line index
+        line_idx += 1
+
+    # Return the first line index with the highest score, i.e. the most likely line index
+    # otherwise return -1 if no column headers found.
+    ascending_idxs = sorted(scores.items(), key=lambda x: x[0])
+    first_best_idx, max_score = max(ascending_idxs, key=lambda x: x[1]) if scores else 0
+    best_idx = first_best_idx if max_score else -1
+    return best_idx
+
+
+def get_csv_file_probe(
+    file_path: t.Union[str, Path], prefix: t.Optional[str] = None
+) -> CSVFileProbe:
+    """
+    Get the shared probe for the current version of a CSV file.
+    """
+    fingerprint = FileFingerprint.from_path(file_path)
+    prefix = const.FILE_HEADER_LINE_PREFIX if prefix is None else prefix
+    return _get_csv_file_probe(fingerprint, prefix)
+
+
+@functools.lru_cache(maxsize=32)
+def _get_csv_file_probe(fingerprint: FileFingerprint, prefix: str) -> CSVFileProbe:
+    return CSVFileProbe(fingerprint, prefix=prefix)
+
+
+def load_probe_cache(
+    file_path: t.Union[str, Path],
+    cache_file: t.Union[str, Path],
+    prefix: t.Optional[str] = None,
+) -> CSVFileProbe:
+    """
+    Get the shared probe for the current version of a CSV file, seeded with the
+    facts saved in the probe cache file for the same version of the file, if
+    any. A missing, unreadable or stale cache file is ignored.
+    """
+    probe = get_csv_file_probe(file_path, prefix=prefix)
+    with suppress(OSError, ValueError, KeyError, TypeError):
+        with open(cache_file) as cache_handle:
+            cache = json.load(cache_handle)
+        is_same_file = (
+            cache["version"] == _PROBE_CACHE_VERSION
+            and FileFingerprint(*cache["fingerprint"]) == probe.fingerprint
+            and cache["prefix"] == probe.prefix
+        )
+        if is_same_file:
+            for key, value in cache["facts"].items():
+                probe.facts.setdefault(key, value)
+    return probe
+
+
+def save_probe_cache(probe: CSVFileProbe, cache_file: t.Union[str, Path]) -> None:
+    """
+    Save the facts of the probe to the probe cache file, replacing it.
+    """
+    cache = {
+        "version": _PROBE_CACHE_VERSION,
+        "fingerprint": list(probe.fingerprint),
+        "prefix": probe.prefix,
+        "facts": probe.facts,
+    }
+    with atomic_output_file(cache_file) as cache_handle:
+        json.dump(cache, cache_handle, indent=2)
+        cache_handle.write("\n")
+    return
@@ -2,19 +2,21 @@ import csv
 import typing as t
 from dataclasses import dataclass, field
 from csv import Dialect
-import functools
 from pathlib import Path
 
 from src.exceptions import DelimiterError, UserInterventionRequired
 from src import constants as const
 from src.enums import ColumnMode
 from src.cli import display_warning
+from src.csv.probe import (
+    get_csv_file_probe,
+    read_column_headers_line_index_by_name,
+    read_file_header_indices,
+)
 
 if t.TYPE_CHECKING:
     from src.args._struct import CleanArgs
 
-_CHUNK_SIZE_1MB = 1024 * 1024
-
 
 @dataclass
 class CSVFileProperties:
@@ -219,33 +221,16 @@ def find_csv_dialect(
     prefix: The prefix of the file header line, typically '##'.
     delimiters: A string containing possible delimiters, e.g. ',;\t'. This is opional, as the dialect can be detected without it.
     """
-    if prefix is None:
-        prefix = const.FILE_HEADER_LINE_PREFIX
-    _, offset = find_first_tabular_line_index_and_offset(csv_file_path, prefix=prefix)
-    dialect = _find_csv_dialect(csv_file_path, offset=offset, delimiters=delimiters)
-    return dialect
-
-
-def _find_csv_dialect(
-    csv_file_path: t.Union[str, Path],
-    offset: int,
-    delimiters: t.Optional[str] = None,
-) -> Dialect:  # noqa: C901
     err_msg = f"Could not determine CSV delimeter for file {str(csv_file_path)!r}"
     if delimiters is None:
         err_msg = f"{err_msg}. Please provide a possible delimiter."
     else:
         err_msg = f"{err_msg} despite tying delimiters {delimiters!r}. This suggests that the file is not a tabular file or the file has a syntax error (e.g. differing numbers of column counts across many rows)."
+    probe = get_csv_file_probe(csv_file_path, prefix=prefix)
     try:
-        with open(csv_file_path, newline="") as csv_file:
-            csv_file.seek(offset)
-            # Read the first 1MB of the file
-            chunk = csv_file.read(_CHUNK_SIZE_1MB)
-            dialect = csv.Sniffer().sniff(chunk, delimiters=delimiters)
+        dialect = probe.sniff_dialect(delimiters=delimiters)
     except csv.Error as e:
         raise DelimiterError(err_msg) from e
-    if dialect is None:
-        raise DelimiterError(err_msg)
     return dialect
 
 
@@ -262,33 +247,16 @@ def find_file_headers(
     """
     if prefix is None:
         prefix = const.FILE_HEADER_LINE_PREFIX
+    if max_line is not None:
+        probe = get_csv_file_probe(csv_file_path, prefix=prefix)
+        return probe.file_header_indices(max_line=max_line)
     with open(csv_file_path, "r") as csv_file:
-        file_header_indices = _find_file_headers(
+        file_header_indices = read_file_header_indices(
             csv_file, prefix=prefix, max_line=max_line
         )
     return file_header_indices
 
 
-def _find_file_headers(
-    csv_file: t.TextIO,
-    prefix: t.Optional[str] = None,
-    max_line: t.Optional[int] = 20,
-) -> t.List[int]:
-    prefix = const.FILE_HEADER_LINE_PREFIX if prefix is None else prefix
-    file_header_indices = []
-    line_idx = 0
-    while True:
-        line = csv_file.readline()
-        if not line:
-            break
-        if line.startswith(prefix):
-            file_header_indices.append(line_idx)
-        line_idx += 1
-        if max_line is not None and line_idx >= max_line:
-            break
-    return file_header_indices
-
-
 def find_column_headers(
     csv_file_path: t.Union[str, Path],
     column_names: t.Optional[t.Sequence[str]] = None,
@@ -358,8 +326,13 @@ def find_column_headers_by_name(
     read the entire file.
     case_sensitive: Whether to perform case sensitive matching of column names.
     """
+    if max_line is not None:
+        probe = get_csv_file_probe(csv_file_path)
+        return probe.column_headers_line_index_by_name(
+            column_names, max_line=max_line, case_sensitive=case_sensitive
+        )
     with open(csv_file_path, "r") as csv_file:
-        idx = _find_column_headers_by_name(
+        idx = read_column_headers_line_index_by_name(
             csv_file,
             column_names=column_names,
             max_line=max_line,
@@ -368,34 +341,6 @@ def find_column_headers_by_name(
     return idx
 
 
-def _find_column_headers_by_name(
-    csv_file: t.TextIO,
-    column_names: t.Sequence[str],
-    max_line: t.Optional[int] = 20,
-    case_sensitive: bool = False,
-) -> int:
-    column_names = column_names if case_sensitive else [n.lower() for n in column_names]
-    scores = {}
-    line_idx = 0
-    while True:
-        line = csv_file.readline()
-        # Break if EOF or max_line reached
-        if not line or (max_line is not None and line_idx >= max_line):
-            break
-        line = line if case_sensitive else line.lower()
-        score = [1 for column_name in column_names if column_name in line]
-        scores[line_idx] = sum(score)
-        # Increment line index
-        line_idx += 1
-
-    # Return the first line index with the highest score, i.e. the most likely line index
-    # otherwise return -1 if no column headers found.
-    ascending_idxs = sorted(scores.items(), key=lambda x: x[0])
-    first_best_idx, max_score = max(ascending_idxs, key=lambda x: x[1]) if scores else 0
-    best_idx = first_best_idx if max_score else -1
-    return best_idx
-
-
 def find_column_headers_by_heuristic(
     csv_file_path: t.Union[str, Path],
     prefix: t.Optional[str] = None,
@@ -415,26 +360,18 @@ def find_column_headers_by_heuristic(
     In most cases you do no want to suppress errors but if you do the return
     value will be -1.
     """
-    prefix = const.FILE_HEADER_LINE_PREFIX if prefix is None else prefix
-    first_line, offset = find_first_tabular_line_index_and_offset(
-        csv_file_path, prefix=prefix
-    )
-    with open(csv_file_path, newline="") as csv_file:
-        csv_file.seek(offset)
-        # Read the first 1MB of the file
-        chunk = csv_file.read(_CHUNK_SIZE_1MB)
-        # Count the number of lines in the chunk
-        try:
-            has_header = csv.Sniffer().has_header(chunk)
-        except csv.Error as e:
-            if not _suppress_csv_lib_errors:
-                raise e
-            else:
-                has_header = False
+    probe = get_csv_file_probe(csv_file_path, prefix=prefix)
+    first_line, _ = probe.first_tabular_line()
+    try:
+        has_header = probe.has_header()
+    except csv.Error as e:
+        if not _suppress_csv_lib_errors:
+            raise e
+        else:
+            has_header = False
     return first_line if has_header else -1
 
 
-@functools.lru_cache(maxsize=32)
 def find_first_tabular_line_index_and_offset(
     csv_file_path: t.Union[str, Path], prefix: t.Optional[str] = None
 ) -> t.Tuple[int, int]:
@@ -448,30 +385,4 @@ def find_first_tabular_line_index_and_offset(
     csv_file_path: The path to the CSV file. prefix: The prefix of any file
     header line, typically '##'.
     """
-    prefix = const.FILE_HEADER_LINE_PREFIX if prefix is None else prefix
-    file_header_idxs = find_file_headers(csv_file_path, prefix=prefix)
-    stop_row_idx = max(file_header_idxs) + 1 if file_header_idxs else 0  # 0-indexed
-
-    offset = 0
-    result_offset = None
-
-    current_row_idx = 0  # 0-indexed
-    with open(csv_file_path, newline="") as csv_file:
-        while True:
-            line = csv_file.readline()
-            offset = csv_file.tell() - len(line)
-            if stop_row_idx == current_row_idx:
-                result_idx = current_row_idx
-                result_offset = offset
-                break
-            current_row_idx += 1
-
-    if result_offset is None:
-        # This should never happen
-        msg = (
-            f"File {csv_file_path!r} cannot calculate the offset, "
-            f"because more rows were skipped ({stop_row_idx}) "
-            f"than there are in the file ({current_row_idx})."
-        )
-        raise ValueError(msg)
-    return result_idx, result_offset
+    return get_csv_file_probe(csv_file_path, prefix=prefix).first_tabular_line()
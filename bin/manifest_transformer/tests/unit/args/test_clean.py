@@ -432,3 +432,32 @@ def test_SummaryFile__without_a_path_specified(input_file_setup, fixed_datetime)
 
     # Then
     assert actual == expected
+
+
+def test_ProbeCacheFile__with_a_file_path(input_file_setup, example_dir_setup):
+    # Given
+    input_file = input_file_setup
+    probe_cache_file = example_dir_setup / "probe_cache.json"
+
+    # When
+    actual = _clean.ProbeCacheFile(input_file, probe_cache_file).clean
+
+    # Then
+    assert actual == probe_cache_file
+
+
+def test_ProbeCacheFile__without_a_path_specified(input_file_setup):
+    # When
+    actual = _clean.ProbeCacheFile(input_file_setup, None).clean
+
+    # Then
+    assert actual is None
+
+
+def test_ProbeCacheFile__with_a_file_path__that_is_equal_input_file(input_file_setup):
+    # Given
+    input_file = input_file_setup
+
+    # When
+    with pytest.raises(exc.ValidationError):
+        _clean.ProbeCacheFile(input_file, input_file).clean
@@ -252,6 +252,29 @@ def test_check_file_not_empty(prepare_empty_file):
         assert True
 
 
+@pytest.mark.parametrize(
+    "contents, should_throw",
+    [
+        pytest.param(" \n\t" * 10, True, id="whitespace_over_several_chunks"),
+        pytest.param(" \n\t" * 10 + "a,b", False, id="contents_after_chunks"),
+    ],
+)
+def test_check_file_not_empty__reads_in_chunks(
+    tmp_path: Path, monkeypatch, contents: str, should_throw: bool
+):
+    # Given
+    monkeypatch.setattr("src.args._io._CHUNK_SIZE_1MB", 4)
+    file = tmp_path / "manifest.csv"
+    file.write_text(contents)
+
+    # When and then
+    if should_throw:
+        with pytest.raises(exc.ValidationError):
+            check_file_not_empty(file)
+    else:
+        check_file_not_empty(file)
+
+
 @pytest.mark.parametrize("path_setup", FINALISE_OUTPUT_PARAMS, indirect=True)
 def test_finalise_output_file(path_setup):
     # Given - inputs are set by path_setup
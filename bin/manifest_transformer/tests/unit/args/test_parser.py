@@ -202,6 +202,7 @@ def test_get_argpaser__namespace__vars(cmd):
         const.ARG_OUTPUT,
         const.ARG_OUTPUT_DELIMITER,
         const.ARG_SUMMARY,
+        const.ARG_PROBE_CACHE,
         const.ARG_REHEADER,
         const.ARG_REHEADER_APPEND,
         const.ARG_FORCE_HEADER_ROW_INDEX,
@@ -220,6 +221,7 @@ def test_get_argpaser__namespace__vars(cmd):
     assert namespace.output_file == namespace_dict[const.ARG_OUTPUT]
     assert namespace.output_file_delimiter == namespace_dict[const.ARG_OUTPUT_DELIMITER]
     assert namespace.summary_file == namespace_dict[const.ARG_SUMMARY]
+    assert namespace.probe_cache_file == namespace_dict[const.ARG_PROBE_CACHE]
     assert namespace.reheader_mapping == namespace_dict[const.ARG_REHEADER]
     assert namespace.reheader_append == namespace_dict[const.ARG_REHEADER_APPEND]
     assert (
@@ -472,6 +472,125 @@ def test_manifest_transformer(
     assert "placeholder" not in output_delimiter.join(first_row)
 
 
+def test_manifest_transformer__streams_to_output(
+    tmp_path: Path,
+    make_csv_file: t.Callable[[bool, int, bool, bool, bool, t.Optional[str]], "Path"],
+    make_json_cmd: t.Callable[[t.Dict[str, t.Any]], t.List[str]],
+):
+    # Given
+    csv_file = make_csv_file(
+        is_erroneous=False,
+        columns=5,
+        delimiter=",",
+        include_file_header=True,
+        include_column_header=True,
+        include_null_values=False,
+        null_value=None,
+    )
+    json_params = json_params__column_indices()
+    json_params[const.JSON_PARAM__INPUT_FILE] = str(csv_file)
+    json_params[const.JSON_PARAM__OUTPUT_FILE] = "output.csv"
+    json_params[const.JSON_PARAM__OUTPUT_DELIMITER] = "\t"
+    cmd = make_json_cmd(json_params)
+    clean_args = CleanArgs.from_namespace(get_argparser().parse_args(cmd))
+    output_file = tmp_path / "output.tsv"
+
+    # When
+    with open(output_file, "w", newline="") as output:
+        returned_output = _entrypoint.manifest_transformer(clean_args, output)
+
+    # Then
+    assert returned_output is output
+    assert output_file.read_text() == _entrypoint.manifest_transformer(
+        clean_args
+    ).read().replace("\r\n", "\n")
+
+
+@pytest.mark.parametrize(
+    "column_mode",
+    [const.SUBCOMMAND__COLUMN_NAMES, const.SUBCOMMAND__COLUMN_INDICES],
+)
+def test_manifest_validator_and_transformer__matches_validator_then_transformer(
+    column_mode: str,
+    monkeypatch: pytest.MonkeyPatch,
+    make_csv_file: t.Callable[[bool, int, bool, bool, bool, t.Optional[str]], "Path"],
+    make_json_cmd: t.Callable[[t.Dict[str, t.Any]], t.List[str]],
+):
+    # Given
+    csv_file = make_csv_file(
+        is_erroneous=False,
+        columns=5,
+        delimiter=",",
+        include_file_header=True,
+        include_column_header=True,
+        include_null_values=False,
+        null_value=None,
+    )
+    if column_mode == const.SUBCOMMAND__COLUMN_NAMES:
+        json_params = json_params__column_names()
+        json_params[REQ_COL_KEY] = ["col_3", "col_0"]
+        json_params[OPT_COL_KEY] = []
+        json_params[COL_ORDER_KEY] = ["col_3", "col_0"]
+        json_params[const.JSON_PARAM__REHEADER] = {"col_0": "NAME"}
+    else:
+        json_params = json_params__column_indices()
+    json_params[const.JSON_PARAM__INPUT_FILE] = str(csv_file)
+    json_params[const.JSON_PARAM__OUTPUT_FILE] = "output.csv"
+    cmd = make_json_cmd(json_params)
+    clean_args = CleanArgs.from_namespace(get_argparser().parse_args(cmd))
+    assert _entrypoint.manifest_validator(clean_args)
+    expected = _entrypoint.manifest_transformer(clean_args).read()
+    reads = []
+    get_csv_reader = _entrypoint.CSVParser.get_csv_reader
+
+    def counting_get_csv_reader(self):
+        reads.append(1)
+        return get_csv_reader(self)
+
+    monkeypatch.setattr(
+        _entrypoint.CSVParser, "get_csv_reader", counting_get_csv_reader
+    )
+
+    # When
+    io_object = _entrypoint.manifest_validator_and_transformer(clean_args)
+
+    # Then
+    assert io_object.read() == expected
+    # The whole file is read once, and in column names mode the column header
+    # row is also read on its own, to find the column order
+    assert len(reads) == (2 if column_mode == const.SUBCOMMAND__COLUMN_NAMES else 1)
+
+
+def test_manifest_validator_and_transformer__invalid_file_raises(
+    make_csv_file: t.Callable[[bool, int, bool, bool, bool, t.Optional[str]], "Path"],
+    make_json_cmd: t.Callable[[t.Dict[str, t.Any]], t.List[str]],
+):
+    # Given
+    csv_file = make_csv_file(
+        is_erroneous=True,
+        columns=5,
+        delimiter=",",
+        include_file_header=False,
+        include_column_header=True,
+        include_null_values=False,
+        null_value=None,
+    )
+    json_params = json_params__column_names()
+    json_params[REQ_COL_KEY] = ["col_3", "col_0"]
+    json_params[OPT_COL_KEY] = []
+    json_params[COL_ORDER_KEY] = ["col_3", "col_0"]
+    json_params[const.JSON_PARAM__REHEADER] = {}
+    json_params[const.JSON_PARAM__FORCED_INPUT_DELIMITER] = ","
+    json_params[const.JSON_PARAM__INPUT_FILE] = str(csv_file)
+    json_params[const.JSON_PARAM__OUTPUT_FILE] = "output.csv"
+    cmd = make_json_cmd(json_params)
+    clean_args = CleanArgs.from_namespace(get_argparser().parse_args(cmd))
+
+    # When/Then
+    with pytest.raises(ValidationError, match="differing numbers of columns"):
+        _entrypoint.manifest_validator_and_transformer(clean_args)
+
+
 def capture_bad_files(csv_file, new_csv_lines, delimeter, json_params):
     import json
 
@@ -3,7 +3,7 @@ from pathlib import Path
 
 import pytest
 
-from src.csv.parser import CSVParser
+from src.csv.parser import CSVParser, NullRowsAccumulator, RowAccumulator
 from src.csv.properties import (
     CSVFileProperties,
     find_first_tabular_line_index_and_offset,
@@ -406,6 +406,62 @@ def test_CSVParser_find_rows_with_nulls__using_non_default_null_values(
     assert len(null_rows) in expected, csv_file_path.read_text()
 
 
+class _RowCountAccumulator(RowAccumulator):
+    def __init__(self) -> None:
+        self.header_count = 0
+        self.row_indices: t.List[int] = []
+
+    def add_header(self, row: t.List[str]) -> None:
+        self.header_count += 1
+
+    def add_row(self, index: int, row: t.List[str]) -> None:
+        self.row_indices.append(index)
+
+
+def test_CSVParser_scan__feeds_all_accumulators_in_a_single_read(
+    make_csv_file, monkeypatch
+):
+    # Given
+    csv_file_path = make_csv_file(
+        is_erroneous=False,
+        columns=5,
+        include_file_header=True,
+        include_column_header=True,
+        include_null_values=True,
+        null_value="NA",
+    )
+    _, offset = find_first_tabular_line_index_and_offset(csv_file_path)
+
+    def make_parser() -> CSVParser:
+        return CSVParser(
+            csv_file_path, has_header=True, offset=offset, dialect=None, delimiter=","
+        )
+
+    parser = make_parser()
+    expected_null_rows = parser.find_rows_with_nulls()
+    expected_column_names = parser.column_header_names()
+    expected_column_counts = parser.count_columns_comprehensively()
+    parser = make_parser()
+    row_counts = _RowCountAccumulator()
+    null_rows = NullRowsAccumulator()
+    reads = []
+    get_csv_reader = parser.get_csv_reader
+    monkeypatch.setattr(
+        parser, "get_csv_reader", lambda: reads.append(1) or get_csv_reader()
+    )
+
+    # When
+    parser.scan([row_counts, null_rows])
+
+    # Then
+    assert row_counts.header_count == 1
+    assert row_counts.row_indices == list(range(1, len(row_counts.row_indices) + 1))
+    assert null_rows.find_rows_with_nulls() == expected_null_rows
+    assert parser.column_header_names() == expected_column_names
+    assert parser.count_columns_comprehensively() == expected_column_counts
+    assert len(reads) == 1
+
+
 @pytest.mark.parametrize(
     "column_headers, expected",
     [
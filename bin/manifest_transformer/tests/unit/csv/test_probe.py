@@ -0,0 +1,123 @@
+import typing as t
+from pathlib import Path
+import json
+import os
+
+import pytest
+
+from src.csv import probe as csv_probe
+from src.csv.probe import (
+    CSVFileProbe,
+    FileFingerprint,
+    load_probe_cache,
+    save_probe_cache,
+)
+from src.csv.properties import CSVFileProperties
+
+
+def _make_probe(csv_file: Path) -> CSVFileProbe:
+    return CSVFileProbe(FileFingerprint.from_path(csv_file))
+
+
+@pytest.mark.parametrize("include_file_header", [True, False])
+def test_CSVFileProbe__reads_the_head_once(
+    include_file_header: bool,
+    make_csv_file: t.Callable[..., Path],
+):
+    # Given
+    csv_file = make_csv_file(
+        is_erroneous=False,
+        columns=5,
+        include_file_header=include_file_header,
+        include_column_header=True,
+    )
+    probe = _make_probe(csv_file)
+
+    # When
+    file_header_indices = probe.file_header_indices()
+    line_index, offset = probe.first_tabular_line()
+    dialect = probe.sniff_dialect()
+    has_header = probe.has_header()
+    by_name_index = probe.column_headers_line_index_by_name(["col_0", "col_1"])
+
+    # Then
+    lines = csv_file.read_text().splitlines(keepends=True)
+    expected_line_index = len(file_header_indices)
+    assert bool(file_header_indices) == include_file_header
+    assert line_index == expected_line_index
+    assert offset == len("".join(lines[:expected_line_index]).encode())
+    assert dialect.delimiter == ","
+    assert has_header
+    assert by_name_index == expected_line_index
+    assert probe.head_reads == 1
+
+
+def test_load_probe_cache__skips_probing_the_same_file(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    make_csv_file: t.Callable[..., Path],
+):
+    # Given
+    csv_file = make_csv_file(
+        is_erroneous=False,
+        columns=5,
+        include_file_header=True,
+        include_column_header=True,
+    )
+    cache_file = tmp_path / "probe_cache.json"
+    column_names = ["col_0", "col_1"]
+    probe = _make_probe(csv_file)
+    monkeypatch.setattr("src.csv.properties.get_csv_file_probe", lambda *_, **__: probe)
+    expected = CSVFileProperties.from_csv_file(csv_file, column_names=column_names)
+    save_probe_cache(probe, cache_file)
+
+    # When
+    monkeypatch.setattr(
+        csv_probe, "get_csv_file_probe", lambda *_, **__: _make_probe(csv_file)
+    )
+    cached_probe = load_probe_cache(csv_file, cache_file)
+    monkeypatch.setattr(
+        "src.csv.properties.get_csv_file_probe", lambda *_, **__: cached_probe
+    )
+    actual = CSVFileProperties.from_csv_file(csv_file, column_names=column_names)
+
+    # Then
+    assert actual == expected
+    assert actual.delimiter == expected.delimiter
+    assert probe.head_reads == 1
+    assert cached_probe.head_reads == 0
+
+
+def test_load_probe_cache__ignores_a_stale_or_invalid_cache(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    make_csv_file: t.Callable[..., Path],
+):
+    # Given
+    csv_file = make_csv_file(
+        is_erroneous=False,
+        columns=5,
+        include_file_header=False,
+        include_column_header=True,
+    )
+    cache_file = tmp_path / "probe_cache.json"
+    probe = _make_probe(csv_file)
+    probe.file_header_indices()
+    save_probe_cache(probe, cache_file)
+    # Modify the file, so its fingerprint changes
+    stat = csv_file.stat()
+    os.utime(csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    monkeypatch.setattr(
+        csv_probe, "get_csv_file_probe", lambda *_, **__: _make_probe(csv_file)
+    )
+
+    # When
+    stale_probe = load_probe_cache(csv_file, cache_file)
+    cache_file.write_text(json.dumps({"version": 1}))
+    invalid_probe = load_probe_cache(csv_file, cache_file)
+    missing_probe = load_probe_cache(csv_file, tmp_path / "missing.json")
+
+    # Then
+    assert stale_probe.facts == {}
+    assert invalid_probe.facts == {}
+    assert missing_probe.facts == {}
@@ -196,6 +196,36 @@ def test_reorder_row__raises_error(row, column_index_order):
         _transform.reorder_row(row, column_index_order)
 
 
+@pytest.mark.parametrize(
+    "column_index_order",
+    [
+        pytest.param([], id="no_columns"),
+        pytest.param([2], id="single_column"),
+        pytest.param([3, 0, 2], id="reorder_and_truncate"),
+        pytest.param([0, 1, 2, 3, 4, 5], id="wider_than_rows"),
+    ],
+)
+def test_ReorderColumns__projection_matches_index_reorder(column_index_order):
+    # Given rows of every length up to wider than the projection, i.e. ragged rows
+    rows = [[f"v{i}" for i in range(length)] for length in range(8)]
+    rows = rows * (_transform._REORDER_BLOCK_SIZE // len(rows) + 1)
+    expected = [
+        [row[index] for index in column_index_order if index < len(row)] for row in rows
+    ]
+    transformer = _transform.ReorderColumns(column_index_order)
+
+    # When
+    reordered = [transformer.reorder(row) for row in rows]
+    reordered_block = transformer.reorder_block(rows)
+    reordered_rows = list(_transform.reorder_rows(iter(rows), column_index_order))
+
+    # Then
+    assert reordered == expected
+    assert reordered_block == expected
+    assert reordered_rows == expected
+    assert all(isinstance(row, list) for row in reordered_block)
+
+
 @pytest.mark.parametrize(
     "rows, column_name_remap, expected",
     [
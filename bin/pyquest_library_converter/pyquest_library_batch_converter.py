@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import typing as t
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from pathlib import Path
+
+from pyquest_library_converter import main as convert_library
+from src.args.args_parsing import get_argparser
+from src.args.args_cleaner import ArgsCleaner
+from src.batch import (
+    JOB_STATUS__FAILED,
+    JOB_STATUS__SUCCEEDED,
+    BatchJob,
+    BatchJobResult,
+    parse_job_argv,
+    read_batch_manifest,
+    summarise_batch,
+    write_batch_summary,
+)
+from src.exceptions import ValidationError
+from src import constants as const
+from src import cli
+
+
+if sys.version_info < (3, 8):
+    raise RuntimeError("This script requires Python 3.8 or later")
+
+
+def get_batch_argparser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Transforms the oligo sequences of several libraries to a format that can be used in PyQuest, in a single invocation"
+    )
+    parser.add_argument(
+        const._ARG_BATCH_MANIFEST,
+        type=Path,
+        help=const._HELP__BATCH_MANIFEST,
+        metavar="MANIFEST",
+    )
+    parser.add_argument(
+        const._ARG_BATCH_SUMMARY,
+        type=Path,
+        help=const._HELP__BATCH_SUMMARY,
+        metavar="SUMMARY",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        default=False,
+        help=const._HELP__BATCH_VERBOSE,
+        dest=const._ARG_VERBOSE,
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=const._HELP__BATCH_WORKERS,
+        dest=const._ARG_BATCH_WORKERS,
+    )
+    return parser
+
+
+def run_job(job: BatchJob) -> BatchJobResult:
+    """
+    Validate the arguments of a job and convert its library, as
+    pyquest_library_converter.py would.
+
+    Errors are recorded in the result, so one failing job does not stop the
+    others.
+    """
+    start_time = time.perf_counter()
+    try:
+        namespace = parse_job_argv(job.argv, get_argparser(), job.index)
+        args_cleaner = ArgsCleaner(namespace)
+        args_cleaner.validate()
+        clean_args = args_cleaner.to_clean_dict()
+        # Reports are displayed by the batch, in job order
+        clean_args[const._ARG_VERBOSE] = False
+        report = convert_library(**clean_args, command=job.get_command())
+    except Exception as err:
+        return BatchJobResult(
+            index=job.index,
+            input_file=job.input_file,
+            output_file=job.output_file,
+            status=JOB_STATUS__FAILED,
+            elapsed_seconds=time.perf_counter() - start_time,
+            error=f"{type(err).__name__}: {err}",
+        )
+    return BatchJobResult(
+        index=job.index,
+        input_file=job.input_file,
+        output_file=job.output_file,
+        status=JOB_STATUS__SUCCEEDED,
+        elapsed_seconds=time.perf_counter() - start_time,
+        report=report.to_dict(),
+    )
+
+
+def batch_main(
+    manifest_file: t.Union[str, Path],
+    summary_file: t.Union[str, Path],
+    verbose: bool = False,
+    workers: int = 1,
+) -> t.Dict[str, t.Any]:
+    """
+    Run every job of a batch manifest and write the aggregated JSON summary.
+
+    Jobs are run by a pool of worker processes, forked from this process, so
+    each job is spared the interpreter startup and imports of a separate
+    invocation. Results are collected in manifest order.
+    """
+    if workers < 1:
+        msg = f"Workers {workers!r} must be an integer >= 1."
+        raise ValidationError(msg)
+    start_time = time.perf_counter()
+    jobs = read_batch_manifest(manifest_file, get_argparser())
+    results = run_jobs(jobs, workers)
+    summary = summarise_batch(results, time.perf_counter() - start_time)
+    write_batch_summary(summary, summary_file)
+    if verbose:
+        display_batch_report(results, summary)
+    return summary
+
+
+def run_jobs(jobs: t.Sequence[BatchJob], workers: int = 1) -> t.List[BatchJobResult]:
+    """
+    Run the jobs in a pool of worker processes, if more than one worker is
+    given, collecting the results in job order.
+    """
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+            return list(executor.map(run_job, jobs))
+    return [run_job(job) for job in jobs]
+
+
+def display_batch_report(
+    results: t.Sequence[BatchJobResult], summary: t.Dict[str, t.Any]
+) -> None:
+    for result in results:
+        cli.display_info(
+            f"--- JOB {result.index} REPORT: {result.input_file} -> {result.output_file} ---"
+        )
+        if result.succeeded:
+            cli.display_info("\n".join(result.report["summary"]))
+        else:
+            cli.display_info(f"Failed: {result.error}")
+    cli.display_info("--- BATCH REPORT ---")
+    cli.display_info(
+        f"{summary['succeeded']} of {summary['jobs']} jobs succeeded, converting {summary['rows']} sequences."
+    )
+    return
+
+
+def display_failed_jobs(summary: t.Dict[str, t.Any]) -> None:
+    for result in summary["results"]:
+        if result["status"] == JOB_STATUS__FAILED:
+            cli.display_error(result["error"], f"Error: Job {result['job']} failed!")
+    return
+
+
+def main() -> None:
+    parser = get_batch_argparser()
+    namespace = parser.parse_args()
+    try:
+        summary = batch_main(**vars(namespace))
+    except ValidationError as err:
+        cli.display_error(err, "Error: Argument validation!")
+        sys.exit(1)
+    display_failed_jobs(summary)
+    if summary["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import typing as t
+import argparse
+import itertools
+import platform
+import shlex
+import sys
+import tempfile
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+from pathlib import Path
+
+from pyquest_library_converter import main as convert_library
+from src.args.args_parsing import get_argparser
+from src.args.args_cleaner import ArgsCleaner
+from src.benchmark import (
+    BenchmarkCase,
+    BenchmarkRun,
+    SyntheticLibrary,
+    compare_to_baseline,
+    format_benchmark,
+    read_benchmark,
+    write_benchmark,
+)
+from src.csv.probe import get_csv_file_probe
+from src.enums import OligoCasing
+from src.exceptions import ValidationError
+from src.stage_timer import (
+    STAGE__HEADER_SCAN,
+    STAGE__SNIFF,
+    StageTimer,
+    get_peak_rss_bytes,
+)
+from src import constants as const
+from src import cli
+
+
+if sys.version_info < (3, 8):
+    raise RuntimeError("This script requires Python 3.8 or later")
+
+
+def get_benchmark_argparser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Benchmarks the conversion of synthetic libraries by pyquest_library_converter.py, timing each stage"
+    )
+    parser.add_argument(
+        const._ARG_BENCHMARK_RESULTS,
+        type=Path,
+        help=const._HELP__BENCHMARK_RESULTS,
+        metavar="RESULTS",
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=[100_000],
+        metavar="ROWS",
+        help=const._HELP__BENCHMARK_ROWS,
+        dest=const._ARG_BENCHMARK_ROWS,
+    )
+    parser.add_argument(
+        "--oligo-length",
+        type=int,
+        nargs="+",
+        default=[200],
+        metavar="OLIGO_LENGTH",
+        help=const._HELP__BENCHMARK_OLIGO_LENGTH,
+        dest=const._ARG_BENCHMARK_OLIGO_LENGTH,
+    )
+    parser.add_argument(
+        "--reverse-fraction",
+        type=float,
+        default=0.0,
+        help=const._HELP__BENCHMARK_REVERSE_FRACTION,
+        dest=const._ARG_BENCHMARK_REVERSE_FRACTION,
+    )
+    parser.add_argument(
+        "--casing",
+        type=str,
+        choices=[OligoCasing.UPPER.value, OligoCasing.LOWER.value],
+        default=OligoCasing.UPPER.value,
+        help=const._HELP__BENCHMARK_CASING,
+        dest=const._ARG_BENCHMARK_CASING,
+    )
+    parser.add_argument(
+        "--null-fraction",
+        type=float,
+        default=0.0,
+        help=const._HELP__BENCHMARK_NULL_FRACTION,
+        dest=const._ARG_BENCHMARK_NULL_FRACTION,
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help=const._HELP__BENCHMARK_SEED,
+        dest=const._ARG_BENCHMARK_SEED,
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help=const._HELP__BENCHMARK_REPEAT,
+        dest=const._ARG_BENCHMARK_REPEAT,
+    )
+    parser.add_argument(
+        "--converter-args",
+        type=shlex.split,
+        default=[],
+        help=const._HELP__BENCHMARK_CONVERTER_ARGS,
+        dest=const._ARG_BENCHMARK_CONVERTER_ARGS,
+    )
+    parser.add_argument(
+        "--work-dir",
+        type=Path,
+        default=None,
+        help=const._HELP__BENCHMARK_WORK_DIR,
+        dest=const._ARG_BENCHMARK_WORK_DIR,
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=None,
+        help=const._HELP__BENCHMARK_BASELINE,
+        dest=const._ARG_BENCHMARK_BASELINE,
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help=const._HELP__BENCHMARK_TOLERANCE,
+        dest=const._ARG_BENCHMARK_TOLERANCE,
+    )
+    return parser
+
+
+def run_conversion(argv: t.Sequence[str]) -> BenchmarkRun:
+    """
+    Convert a library as pyquest_library_converter.py would, timing each stage
+    from the dialect sniff and the header scan of the argument validation to
+    the writing of the output.
+
+    Warnings, e.g. of null rows, are not displayed, though they are still
+    raised, so their cost is measured.
+    """
+    stage_timer = StageTimer()
+    start_time = time.perf_counter()
+    namespace = get_argparser().parse_args(list(argv))
+    with stage_timer.stage(STAGE__SNIFF):
+        get_csv_file_probe(getattr(namespace, const._ARG_INPUT)).dialect
+    with stage_timer.stage(STAGE__HEADER_SCAN):
+        args_cleaner = ArgsCleaner(namespace)
+        args_cleaner.validate()
+        clean_args = args_cleaner.to_clean_dict()
+    clean_args[const._ARG_VERBOSE] = False
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        report = convert_library(**clean_args, stage_timer=stage_timer)
+    return BenchmarkRun(
+        elapsed_seconds=time.perf_counter() - start_time,
+        stage_seconds=stage_timer.seconds,
+        stage_peak_rss_bytes=stage_timer.peak_rss_bytes,
+        peak_rss_bytes=get_peak_rss_bytes(),
+        rows=report.row_count,
+    )
+
+
+def run_benchmark(
+    libraries: t.Sequence[SyntheticLibrary],
+    work_dir: t.Union[str, Path],
+    repeat: int = 3,
+    converter_args: t.Sequence[str] = (),
+) -> t.Dict[str, t.Any]:
+    """
+    Write each synthetic library to the work directory, then convert it repeat
+    times, and collect the timings into a JSON serialisable summary.
+
+    Each conversion runs in a fresh worker process, forked from this one, so
+    its peak RSS and the shared file probe are its own.
+    """
+    if repeat < 1:
+        msg = f"Repeat {repeat!r} must be an integer >= 1."
+        raise ValidationError(msg)
+    work_dir = Path(work_dir)
+    cases = []
+    for index, library in enumerate(libraries, start=1):
+        library_file = work_dir / f"library_{index}.csv"
+        output_file = work_dir / f"library_{index}.pyquest.tsv"
+        library.write(library_file)
+        case = BenchmarkCase(library, input_bytes=library_file.stat().st_size)
+        argv = library.get_converter_argv(library_file, output_file, converter_args)
+        for _ in range(repeat):
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                case.runs.append(executor.submit(run_conversion, argv).result())
+        library_file.unlink()
+        output_file.unlink()
+        cases.append(case)
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "converter_args": shlex.join(converter_args),
+        "cases": [case.to_dict() for case in cases],
+    }
+
+
+def benchmark_main(
+    results_file: t.Union[str, Path],
+    row_counts: t.Sequence[int] = (100_000,),
+    oligo_lengths: t.Sequence[int] = (200,),
+    reverse_fraction: float = 0.0,
+    casing: t.Union[str, OligoCasing] = OligoCasing.UPPER,
+    null_fraction: float = 0.0,
+    seed: int = 0,
+    repeat: int = 3,
+    converter_args: t.Sequence[str] = (),
+    work_dir: t.Optional[t.Union[str, Path]] = None,
+    baseline_file: t.Optional[t.Union[str, Path]] = None,
+    tolerance: float = 0.1,
+) -> t.Tuple[t.Dict[str, t.Any], t.List[str]]:
+    """
+    Benchmark a synthetic library of each row count and oligo length, write the
+    JSON results and print a summary of them.
+
+    Returns the results, and the cases slower than the baseline, if any.
+    """
+    libraries = [
+        SyntheticLibrary(
+            row_count=row_count,
+            oligo_length=oligo_length,
+            reverse_fraction=reverse_fraction,
+            casing=OligoCasing(casing),
+            null_fraction=null_fraction,
+            seed=seed,
+        )
+        for row_count, oligo_length in itertools.product(row_counts, oligo_lengths)
+    ]
+    baseline = read_benchmark(baseline_file) if baseline_file is not None else None
+    if work_dir is None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            results = run_benchmark(libraries, temp_dir, repeat, converter_args)
+    else:
+        results = run_benchmark(libraries, work_dir, repeat, converter_args)
+    write_benchmark(results, results_file)
+
+    cli.display_info("--- BENCHMARK REPORT ---")
+    cli.display_info("\n".join(format_benchmark(results)))
+    regressions: t.List[str] = []
+    if baseline is not None:
+        lines, regressions = compare_to_baseline(results, baseline, tolerance)
+        cli.display_info("--- BASELINE COMPARISON ---")
+        cli.display_info("\n".join(lines))
+    return results, regressions
+
+
+def display_regressions(regressions: t.List[str], tolerance: float) -> None:
+    for case in regressions:
+        cli.display_error(
+            f"{case} is more than {tolerance:.0%} slower than the baseline.",
+            "Error: Throughput regression!",
+        )
+    return
+
+
+def main() -> None:
+    parser = get_benchmark_argparser()
+    namespace = parser.parse_args()
+    try:
+        _, regressions = benchmark_main(**vars(namespace))
+    except ValidationError as err:
+        cli.display_error(err, "Error: Argument validation!")
+        sys.exit(1)
+    display_regressions(regressions, namespace.tolerance)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,21 +3,36 @@
 import typing as t
 import sys
 
-from functools import partial
 from pathlib import Path
-import tempfile
-import shutil
 
 from src.csv.csv_reader import CSVReaderFactory
 from src.csv.filter import filter_rows, NullRowSplitter
+from src.csv.spool import RowSpool
 from src.csv.write import write_rows
+from src.enums import Compression, MismatchModel, OligoCasing
 from src.report import Report
+from src.oligo_index import OligoIndexBuilder
+from src.duplicates import DuplicateDetector
+from src.stage_timer import (
+    STAGE__DUPLICATES,
+    STAGE__INDEX,
+    STAGE__READ,
+    STAGE__SCAN,
+    STAGE__TRIM,
+    STAGE__WRITE,
+    NullStageTimer,
+    StageTimer,
+)
 from src.dna.primer_scanner import PrimerScanner
-from src.dna import helpers as dna_helpers
+from src.dna.transform import SequenceTransformPlan
+from src.dna.multi_primer_scanner import (
+    MultiPrimerScanner,
+    MultiPrimerTransformPlan,
+    PrimerPair,
+)
 from src.args.args_parsing import get_argparser
 from src.args.args_cleaner import ArgsCleaner
 from src.exceptions import ValidationError, UndevelopedFeatureError, NullDataError
-from src.enums import OligoCasing
 from src import constants as const
 from src import cli
 
@@ -37,108 +52,249 @@ def main(
     sequence_index: int,
     reverse_complement_flag: bool,
     warn_null_data: bool,
+    cpus: int = 1,
+    primer_scan_confidence: t.Optional[float] = None,
+    output_compression: Compression = Compression.NONE,
+    primer_panel: t.Optional[t.Sequence[PrimerPair]] = None,
+    primer_assignments_file: t.Optional[t.Union[str, Path]] = None,
+    primer_max_mismatches: int = 0,
+    primer_mismatch_model: MismatchModel = MismatchModel.HAMMING,
+    index_file: t.Optional[t.Union[str, Path]] = None,
+    duplicate_max_mismatches: t.Optional[int] = None,
+    duplicates_file: t.Optional[t.Union[str, Path]] = None,
+    command: t.Optional[str] = None,
+    stage_timer: t.Optional[StageTimer] = None,
     **options,
-):
+) -> Report:
     report = Report()
+    timer = stage_timer if stage_timer is not None else NullStageTimer()
     input_file = Path(input_file)
     output_file = Path(output_file)
-    output_headers = [
-        const._OUTPUT_HEADER__ID,
-        const._OUTPUT_HEADER__NAME,
-        const._OUTPUT_HEADER__SEQUENCE,
-    ]
 
-    # Scan the file once to auto-detect the best primers
+    # Parse the file once: scan it to auto-detect the best primers while
+    # spooling the rows so they can be replayed for trimming and writing
     csv_reader_factory = CSVReaderFactory(input_file, skip_n_rows=adjusted_skip_n_rows)
-    with csv_reader_factory.get_csv_reader() as csv_reader:
-        primer_scanner = PrimerScanner(
-            forward_primer=forward_primer, reverse_primer=reverse_primer
+    with RowSpool() as row_spool:
+        with csv_reader_factory.get_csv_reader() as csv_reader:
+            with timer.stage(STAGE__SCAN):
+                primer_scanner = PrimerScanner(
+                    forward_primer=forward_primer,
+                    reverse_primer=reverse_primer,
+                    max_mismatches=primer_max_mismatches,
+                    mismatch_model=primer_mismatch_model,
+                )
+                rows = filter_rows(
+                    csv_reader, name_index=name_index, sequence_index=sequence_index
+                )
+                null_row_splitter = NullRowSplitter(rows)
+                spooled_rows = timer.time_rows(
+                    STAGE__READ, row_spool.spool(null_row_splitter.not_null_rows())
+                )
+                oligos_to_scan = (sequence for _, _, sequence in spooled_rows)
+                primer_scanner.scan_all(
+                    oligos_to_scan, processes=cpus, confidence=primer_scan_confidence
+                )
+                detected_forward_primer = primer_scanner.predict_forward_primer()
+                detected_reverse_primer = primer_scanner.predict_reverse_primer()
+                # With a primer panel, primers are found per oligo when trimming
+                report.add_scanning_summary(
+                    primer_scanner.summary(include_primers=primer_panel is None)
+                )
+                null_report = null_row_splitter.report_null_rows(
+                    null_row_splitter.null_rows(),
+                    raise_error=not warn_null_data,
+                    start_index=adjusted_skip_n_rows,
+                )
+                report.add_null_data_summary(null_report)
+                primer_scanner.raise_errors()
+                oligo_case = primer_scanner.get_oligos_case()
+
+        # Plan the sequence operations once, then apply them in a single pass
+        transform_plan = get_transform_plan(
+            primer_panel=primer_panel,
+            forward_primer=detected_forward_primer,
+            reverse_primer=detected_reverse_primer,
+            reverse_complement_flag=reverse_complement_flag,
+            oligo_case=oligo_case,
+            max_mismatches=primer_max_mismatches,
+            mismatch_model=primer_mismatch_model,
         )
-        dict_rows = filter_rows(
-            csv_reader, name_index=name_index, sequence_index=sequence_index
+
+        # Replay the spooled rows and write them atomically to the output file,
+        # indexing the output sequences and detecting duplicates in the same
+        # pass if requested
+        index_builder = OligoIndexBuilder() if index_file is not None else None
+        duplicate_detector = (
+            DuplicateDetector(
+                duplicate_max_mismatches, expected_row_count=len(row_spool)
+            )
+            if duplicate_max_mismatches is not None
+            else None
         )
-        null_row_splitter = NullRowSplitter(dict_rows)
-        oligos_to_scan = [
-            row[const._OUTPUT_HEADER__SEQUENCE]
-            for row in null_row_splitter.not_null_rows()
-        ]
-        primer_scanner.scan_all(oligos_to_scan)
-        detected_forward_primer = primer_scanner.predict_forward_primer()
-        detected_reverse_primer = primer_scanner.predict_reverse_primer()
-        report.add_scanning_summary(primer_scanner.summary())
-        null_report = null_row_splitter.report_null_rows(
-            null_row_splitter.null_rows(),
-            raise_error=not warn_null_data,
-            start_index=adjusted_skip_n_rows,
+        rows = timer.time_rows(
+            STAGE__TRIM, transform_plan.transform_rows(row_spool.rows(), report=report)
+        )
+        rows = collect_rows(rows, index_builder, STAGE__INDEX, timer)
+        rows = collect_rows(rows, duplicate_detector, STAGE__DUPLICATES, timer)
+        with timer.stage(STAGE__WRITE):
+            write_rows(
+                rows,
+                output_file=output_file,
+                headers=const._OUTPUT_HEADERS,
+                compression=output_compression,
+                threads=cpus,
+                command=command,
+            )
+        write_index(index_builder, index_file, report, timer)
+        write_duplicates(duplicate_detector, report, duplicates_file, command, timer)
+        write_primer_assignments(
+            transform_plan, row_spool, report, primer_assignments_file, command
         )
-        report.add_null_data_summary(null_report)
-        primer_scanner.raise_errors()
-        oligo_case = primer_scanner.get_oligos_case()
-
-    # Prepare closured functions for processing sequences
-    _reverse_complement_sequences_closure = partial(
-        dna_helpers.reverse_complement_sequences,
-        header=const._OUTPUT_HEADER__SEQUENCE,
-    )
-    _closure_upper_case_sequences = partial(
-        dna_helpers.upper_case_sequences, sequence_header=const._OUTPUT_HEADER__SEQUENCE
-    )
-    _closure_lower_case_sequences = partial(
-        dna_helpers.lower_case_sequences, sequence_header=const._OUTPUT_HEADER__SEQUENCE
-    )
-    trim_sequences_closure = partial(
-        dna_helpers.trim_sequences,
-        sequence_header=const._OUTPUT_HEADER__SEQUENCE,
-        id_header=const._OUTPUT_HEADER__ID,
-        forward_primer=detected_forward_primer,
-        reverse_primer=detected_reverse_primer,
-    )
 
-    # Define conditional functions for processing sequences
-    conditionally_reverse_complement_sequences = (
-        _reverse_complement_sequences_closure
-        if reverse_complement_flag
-        else dna_helpers.noop_sequences
+    if verbose:
+        cli.display_info("--- PROCESSING REPORT ---")
+        cli.display_info(report.summary())
+        cli.display_info("Done.")
+    return report
+
+
+def get_transform_plan(
+    primer_panel: t.Optional[t.Sequence[PrimerPair]],
+    forward_primer: str,
+    reverse_primer: str,
+    reverse_complement_flag: bool,
+    oligo_case: OligoCasing,
+    max_mismatches: int,
+    mismatch_model: MismatchModel,
+) -> t.Union[SequenceTransformPlan, MultiPrimerTransformPlan]:
+    """
+    Plan trimming the detected primer pair, or the primer pair found per oligo
+    when using a primer panel.
+    """
+    if primer_panel is None:
+        return SequenceTransformPlan(
+            forward_primer=forward_primer,
+            reverse_primer=reverse_primer,
+            reverse_complement_flag=reverse_complement_flag,
+            oligo_case=oligo_case,
+            max_mismatches=max_mismatches,
+            mismatch_model=mismatch_model,
+        )
+    return MultiPrimerTransformPlan(
+        scanner=MultiPrimerScanner(primer_panel),
+        reverse_complement_flag=reverse_complement_flag,
+        oligo_case=oligo_case,
     )
-    conditionally_upper_case_sequences = (
-        _closure_upper_case_sequences
-        if oligo_case == OligoCasing.LOWER
-        else dna_helpers.noop_sequences
+
+
+def collect_rows(
+    rows: t.Iterable[t.Tuple[int, str, str]],
+    collector: t.Optional[t.Union[OligoIndexBuilder, DuplicateDetector]],
+    stage: str,
+    timer: t.Union[StageTimer, NullStageTimer],
+) -> t.Iterable[t.Tuple[int, str, str]]:
+    """
+    Pass the rows through the collector as they are written, if there is one.
+    """
+    if collector is None:
+        return rows
+    return timer.time_rows(stage, collector.add_rows(rows))
+
+
+def write_index(
+    index_builder: t.Optional[OligoIndexBuilder],
+    index_file: t.Optional[t.Union[str, Path]],
+    report: Report,
+    timer: t.Union[StageTimer, NullStageTimer],
+) -> None:
+    if index_builder is None:
+        return
+    with timer.stage(STAGE__INDEX):
+        index_builder.write(index_file)
+    report.add_oligo_index_summary(index_builder.summary())
+    return
+
+
+def write_duplicates(
+    duplicate_detector: t.Optional[DuplicateDetector],
+    report: Report,
+    duplicates_file: t.Optional[t.Union[str, Path]],
+    command: t.Optional[str],
+    timer: t.Union[StageTimer, NullStageTimer],
+) -> None:
+    if duplicate_detector is None:
+        return
+    with timer.stage(STAGE__DUPLICATES), duplicate_detector:
+        report_duplicates(duplicate_detector, report, duplicates_file, command=command)
+    return
+
+
+def write_primer_assignments(
+    transform_plan: t.Union[SequenceTransformPlan, MultiPrimerTransformPlan],
+    row_spool: RowSpool,
+    report: Report,
+    primer_assignments_file: t.Optional[t.Union[str, Path]],
+    command: t.Optional[str],
+) -> None:
+    """
+    Report the primer pair assigned to each oligo when using a primer panel,
+    writing them to the primer assignments file if given.
+    """
+    if not isinstance(transform_plan, MultiPrimerTransformPlan):
+        return
+    report.add_primer_assignment_summary(transform_plan.summary())
+    if primer_assignments_file is None:
+        return
+    assignment_rows = (
+        (row_id, name, pair_name, orientation.value)
+        for (row_id, name, _), (pair_name, orientation) in zip(
+            row_spool.rows(), transform_plan.assignments()
+        )
     )
-    conditionally_lower_case_sequences = (
-        _closure_lower_case_sequences
-        if oligo_case == OligoCasing.LOWER
-        else dna_helpers.noop_sequences
+    write_rows(
+        assignment_rows,
+        output_file=Path(primer_assignments_file),
+        headers=const._PRIMER_ASSIGNMENT_HEADERS,
+        command=command,
     )
+    return
 
-    # Prepare a temporary file to write to
-    with tempfile.NamedTemporaryFile(delete=True) as temp_handle:
-        temp_file = Path(temp_handle.name)
 
-        # Read the input file and write to a temporary file
-        csv_reader_factory = CSVReaderFactory(
-            input_file, skip_n_rows=adjusted_skip_n_rows
-        )
-        with csv_reader_factory.get_csv_reader() as csv_reader:
-            dict_rows = filter_rows(
-                csv_reader, name_index=name_index, sequence_index=sequence_index
+def report_duplicates(
+    duplicate_detector: DuplicateDetector,
+    report: Report,
+    duplicates_file: t.Optional[t.Union[str, Path]] = None,
+    command: t.Optional[str] = None,
+) -> None:
+    """
+    Resolve the duplicates found by the detector into the report, writing each
+    of them to the duplicates file if given.
+    """
+    duplicates = duplicate_detector.iter_duplicates()
+    if duplicates_file is None:
+        for _ in duplicates:
+            pass
+    else:
+        duplicate_rows = (
+            (
+                duplicate.kind.value,
+                duplicate.mismatches,
+                const._OUTPUT_IDS_DELIMITER.join(map(str, duplicate.row_ids)),
             )
-            null_row_splitter = NullRowSplitter(dict_rows)
-            dict_rows = null_row_splitter.not_null_rows()
-            dict_rows = conditionally_upper_case_sequences(dict_rows)
-            dict_rows = trim_sequences_closure(dict_rows, report=report)
-            dict_rows = conditionally_reverse_complement_sequences(dict_rows)
-            dict_rows = conditionally_lower_case_sequences(dict_rows)
-            write_rows(dict_rows, output_file=temp_file, headers=output_headers)
-
-        # Copy the temporary file to the output file
-        shutil.copy(temp_file, output_file)
-
-    # At this point, the temporary file has been deleted
-    if verbose:
-        cli.display_info("--- PROCESSING REPORT ---")
-        cli.display_info(report.summary())
-        cli.display_info("Done.")
+            for duplicate in duplicates
+        )
+        write_rows(
+            duplicate_rows,
+            output_file=Path(duplicates_file),
+            headers=const._DUPLICATE_HEADERS,
+            command=command,
+        )
+    report.add_duplicates(
+        exact_duplicate_groups=duplicate_detector.exact_group_count,
+        exact_duplicate_rows=duplicate_detector.exact_row_count,
+        near_duplicate_pairs=duplicate_detector.near_pair_count,
+        duplicate_summary=duplicate_detector.summary(),
+    )
     return
 
 
@@ -8,9 +8,11 @@ from types import MappingProxyType
 from src.exceptions import ValidationError
 from src import constants as const
 from src.dna.helpers import find_invalid_chars_in_dna_sequence
+from src.dna.multi_primer_scanner import PrimerPair, read_primer_panel
+from src.csv.compression import OUTPUT_COMPRESSIONS
 from src.csv.csv_helper import CSVHelper
 from src.csv.filter import is_null
-from src.enums import NameAndSequenceArgs
+from src.enums import NameAndSequenceArgs, Compression, MismatchModel
 from src.cli import display_warning
 
 if t.TYPE_CHECKING:
@@ -30,6 +32,7 @@ class ArgsCleaner:
         self._use_forced_header_index = False
         self._header_row_index_0_idx = -1
         self._computed_skip_n_rows = None
+        self._primer_panel: t.Optional[t.List[PrimerPair]] = None
 
     def summary(self) -> str:
         """
@@ -48,6 +51,18 @@ class ArgsCleaner:
         raw_reverse_complement_flag = self._get_arg(const._ARG_REVERSE_COMPLEMENT_FLAG)
         raw_force_header_index = self._get_arg(const._ARG_FORCE_HEADER_INDEX)
         raw_warn_null_data = self._get_arg(const._ARG_WARN_NULL_DATA)
+        raw_cpus = self._get_arg(const._ARG_CPUS)
+        raw_primer_scan_confidence = self._get_arg(const._ARG_PRIMER_SCAN_CONFIDENCE)
+        raw_output_compression = self._get_arg(const._ARG_OUTPUT_COMPRESSION)
+        raw_primer_panel = self._get_arg(const._ARG_PRIMER_PANEL)
+        raw_primer_assignments = self._get_arg(const._ARG_PRIMER_ASSIGNMENTS)
+        raw_primer_max_mismatches = self._get_arg(const._ARG_PRIMER_MAX_MISMATCHES)
+        raw_primer_mismatch_model = self._get_arg(const._ARG_PRIMER_MISMATCH_MODEL)
+        raw_index = self._get_arg(const._ARG_INDEX)
+        raw_duplicate_max_mismatches = self._get_arg(
+            const._ARG_DUPLICATE_MAX_MISMATCHES
+        )
+        raw_duplicates = self._get_arg(const._ARG_DUPLICATES)
         is_validated = self._validated
         if is_validated:
             clean_input = self.get_clean_input()
@@ -62,6 +77,21 @@ class ArgsCleaner:
             clean_sequence_index = self.get_clean_sequence_index()
             clean_reverse_complement_flag = self.get_clean_reverse_complement_flag()
             clean_warn_null_data = self.get_clean_warn_null_data()
+            clean_cpus = self.get_clean_cpus()
+            clean_primer_scan_confidence = self.get_clean_primer_scan_confidence()
+            clean_output_compression = self.get_clean_output_compression().value
+            clean_primer_panel = self.get_clean_primer_panel()
+            clean_primer_panel = (
+                [primer_pair.name for primer_pair in clean_primer_panel]
+                if clean_primer_panel is not None
+                else None
+            )
+            clean_primer_assignments = self.get_clean_primer_assignments()
+            clean_primer_max_mismatches = self.get_clean_primer_max_mismatches()
+            clean_primer_mismatch_model = self.get_clean_primer_mismatch_model().value
+            clean_index = self.get_clean_index()
+            clean_duplicate_max_mismatches = self.get_clean_duplicate_max_mismatches()
+            clean_duplicates = self.get_clean_duplicates()
         else:
             special_value = "N/A"
             clean_input = special_value
@@ -76,6 +106,16 @@ class ArgsCleaner:
             clean_sequence_index = special_value
             clean_reverse_complement_flag = special_value
             clean_warn_null_data = special_value
+            clean_cpus = special_value
+            clean_primer_scan_confidence = special_value
+            clean_output_compression = special_value
+            clean_primer_panel = special_value
+            clean_primer_assignments = special_value
+            clean_primer_max_mismatches = special_value
+            clean_primer_mismatch_model = special_value
+            clean_index = special_value
+            clean_duplicate_max_mismatches = special_value
+            clean_duplicates = special_value
         summary = f"""\
         Validated arguments: {is_validated}
         Input: {str(raw_input)!r} -> {str(clean_input)!r}
@@ -91,6 +131,16 @@ class ArgsCleaner:
         Reverse complement flag: {raw_reverse_complement_flag!r} -> {clean_reverse_complement_flag!r}
         Force header index: {raw_force_header_index!r} -> {clean_forced_header_index!r}
         Warn instead of error null data: {raw_warn_null_data!r} -> {clean_warn_null_data!r}
+        CPUs: {raw_cpus!r} -> {clean_cpus!r}
+        Primer scan confidence: {raw_primer_scan_confidence!r} -> {clean_primer_scan_confidence!r}
+        Output compression: {raw_output_compression!r} -> {clean_output_compression!r}
+        Primer panel: {str(raw_primer_panel)!r} -> {clean_primer_panel!r}
+        Primer assignments: {str(raw_primer_assignments)!r} -> {str(clean_primer_assignments)!r}
+        Primer max mismatches: {raw_primer_max_mismatches!r} -> {clean_primer_max_mismatches!r}
+        Primer mismatch model: {raw_primer_mismatch_model!r} -> {clean_primer_mismatch_model!r}
+        Index: {str(raw_index)!r} -> {str(clean_index)!r}
+        Detect duplicates: {raw_duplicate_max_mismatches!r} -> {clean_duplicate_max_mismatches!r}
+        Duplicates: {str(raw_duplicates)!r} -> {str(clean_duplicates)!r}
         """
         summary = dedent(summary).rstrip()
         return summary
@@ -118,6 +168,16 @@ class ArgsCleaner:
         KEY_REVERSE_COMPLEMENT_FLAG = const._ARG_REVERSE_COMPLEMENT_FLAG
         KEY_FORCE_HEADER_INDEX = const._ARG_FORCE_HEADER_INDEX
         KEY_WARN_NULL_DATA = const._ARG_WARN_NULL_DATA
+        KEY_CPUS = const._ARG_CPUS
+        KEY_PRIMER_SCAN_CONFIDENCE = const._ARG_PRIMER_SCAN_CONFIDENCE
+        KEY_OUTPUT_COMPRESSION = const._ARG_OUTPUT_COMPRESSION
+        KEY_PRIMER_PANEL = const._ARG_PRIMER_PANEL
+        KEY_PRIMER_ASSIGNMENTS = const._ARG_PRIMER_ASSIGNMENTS
+        KEY_PRIMER_MAX_MISMATCHES = const._ARG_PRIMER_MAX_MISMATCHES
+        KEY_PRIMER_MISMATCH_MODEL = const._ARG_PRIMER_MISMATCH_MODEL
+        KEY_INDEX = const._ARG_INDEX
+        KEY_DUPLICATE_MAX_MISMATCHES = const._ARG_DUPLICATE_MAX_MISMATCHES
+        KEY_DUPLICATES = const._ARG_DUPLICATES
         clean_dict = {
             KEY_INPUT: self.get_clean_input(),
             KEY_ADJUSTED_SKIP_N_ROWS: self.get_clean_adjusted_skip_n_rows(),
@@ -130,6 +190,16 @@ class ArgsCleaner:
             KEY_REVERSE_COMPLEMENT_FLAG: self.get_clean_reverse_complement_flag(),
             KEY_FORCE_HEADER_INDEX: self.get_clean_forced_header_index(),
             KEY_WARN_NULL_DATA: self.get_clean_warn_null_data(),
+            KEY_CPUS: self.get_clean_cpus(),
+            KEY_PRIMER_SCAN_CONFIDENCE: self.get_clean_primer_scan_confidence(),
+            KEY_OUTPUT_COMPRESSION: self.get_clean_output_compression(),
+            KEY_PRIMER_PANEL: self.get_clean_primer_panel(),
+            KEY_PRIMER_ASSIGNMENTS: self.get_clean_primer_assignments(),
+            KEY_PRIMER_MAX_MISMATCHES: self.get_clean_primer_max_mismatches(),
+            KEY_PRIMER_MISMATCH_MODEL: self.get_clean_primer_mismatch_model(),
+            KEY_INDEX: self.get_clean_index(),
+            KEY_DUPLICATE_MAX_MISMATCHES: self.get_clean_duplicate_max_mismatches(),
+            KEY_DUPLICATES: self.get_clean_duplicates(),
         }
         return clean_dict
 
@@ -189,6 +259,46 @@ class ArgsCleaner:
         self._assert_has_validated_all()
         return self._get_arg(const._ARG_WARN_NULL_DATA)
 
+    def get_clean_cpus(self) -> int:
+        self._assert_has_validated_all()
+        return self._get_arg(const._ARG_CPUS)
+
+    def get_clean_primer_scan_confidence(self) -> t.Optional[float]:
+        self._assert_has_validated_all()
+        return self._get_arg(const._ARG_PRIMER_SCAN_CONFIDENCE)
+
+    def get_clean_output_compression(self) -> Compression:
+        self._assert_has_validated_all()
+        return Compression(self._get_arg(const._ARG_OUTPUT_COMPRESSION))
+
+    def get_clean_primer_panel(self) -> t.Optional[t.List[PrimerPair]]:
+        self._assert_has_validated_all()
+        return self._primer_panel
+
+    def get_clean_primer_assignments(self) -> t.Optional[Path]:
+        self._assert_has_validated_all()
+        return self._get_arg(const._ARG_PRIMER_ASSIGNMENTS)
+
+    def get_clean_primer_max_mismatches(self) -> int:
+        self._assert_has_validated_all()
+        return self._get_arg(const._ARG_PRIMER_MAX_MISMATCHES)
+
+    def get_clean_primer_mismatch_model(self) -> MismatchModel:
+        self._assert_has_validated_all()
+        return MismatchModel(self._get_arg(const._ARG_PRIMER_MISMATCH_MODEL))
+
+    def get_clean_index(self) -> t.Optional[Path]:
+        self._assert_has_validated_all()
+        return self._get_arg(const._ARG_INDEX)
+
+    def get_clean_duplicate_max_mismatches(self) -> t.Optional[int]:
+        self._assert_has_validated_all()
+        return self._get_arg(const._ARG_DUPLICATE_MAX_MISMATCHES)
+
+    def get_clean_duplicates(self) -> t.Optional[Path]:
+        self._assert_has_validated_all()
+        return self._get_arg(const._ARG_DUPLICATES)
+
     def validate(self):
         validators = [
             self._validate_codependent_input_args,
@@ -197,6 +307,16 @@ class ArgsCleaner:
             self._validate_reverse_primer,
             self._validate_reverse_complement_flag,
             self._validate_warn_null_data,
+            self._validate_cpus,
+            self._validate_primer_scan_confidence,
+            self._validate_output_compression,
+            self._validate_primer_panel,
+            self._validate_primer_assignments,
+            self._validate_primer_max_mismatches,
+            self._validate_primer_mismatch_model,
+            self._validate_index,
+            self._validate_duplicate_max_mismatches,
+            self._validate_duplicates,
         ]
         for validator in validators:
             validator()
@@ -321,6 +441,181 @@ class ArgsCleaner:
             raise ValidationError(msg)
         return
 
+    def _validate_cpus(self):
+        cpus = self._get_arg(const._ARG_CPUS)
+        if not isinstance(cpus, int) or cpus < 1:
+            msg = f"CPUs {cpus!r} must be an integer >= 1."
+            raise ValidationError(msg)
+        return
+
+    def _validate_primer_scan_confidence(self):
+        confidence = self._get_arg(const._ARG_PRIMER_SCAN_CONFIDENCE)
+        if confidence is None:
+            return
+        if not 0 < confidence < 1:
+            msg = f"Primer scan confidence {confidence!r} must be between 0 and 1 (exclusive)."
+            raise ValidationError(msg)
+        return
+
+    def _validate_primer_panel(self):
+        panel_file = self._get_arg(const._ARG_PRIMER_PANEL)
+        if panel_file is None:
+            return
+        self._assert_primer_panel_exists(panel_file)
+        self._validate_primer_panel_and_primers_together()
+        self._primer_panel = self._read_valid_primer_panel(panel_file)
+        return
+
+    def _validate_primer_panel_and_primers_together(self):
+        forward_primer = self._get_arg(const._ARG_FORWARD_PRIMER)
+        reverse_primer = self._get_arg(const._ARG_REVERSE_PRIMER)
+        if forward_primer or reverse_primer:
+            msg = "A primer panel cannot be used with a forward or reverse primer."
+            raise ValidationError(msg)
+        return
+
+    def _validate_primer_assignments(self):
+        assignments_file = self._get_arg(const._ARG_PRIMER_ASSIGNMENTS)
+        if assignments_file is None:
+            return
+        self._validate_primer_assignments_and_primer_panel_together()
+        self._assert_auxiliary_output_file(
+            Path(assignments_file),
+            "Primer assignments file",
+            (self._get_arg(const._ARG_INPUT), self._normalise_output_to_file()),
+            "input or output file",
+        )
+        return
+
+    def _validate_primer_assignments_and_primer_panel_together(self):
+        if self._get_arg(const._ARG_PRIMER_PANEL) is None:
+            msg = "Primer assignments can only be written when using a primer panel."
+            raise ValidationError(msg)
+        return
+
+    def _validate_primer_max_mismatches(self):
+        max_mismatches = self._get_arg(const._ARG_PRIMER_MAX_MISMATCHES)
+        if not isinstance(max_mismatches, int) or max_mismatches < 0:
+            msg = f"Primer max mismatches {max_mismatches!r} must be an integer >= 0."
+            raise ValidationError(msg)
+        if max_mismatches == 0:
+            return
+        self._validate_primer_max_mismatches_and_primer_panel_together()
+        self._validate_primer_max_mismatches_and_primers_together(max_mismatches)
+        return
+
+    def _validate_primer_max_mismatches_and_primer_panel_together(self):
+        if self._get_arg(const._ARG_PRIMER_PANEL) is not None:
+            msg = "Primer mismatches cannot be allowed when using a primer panel."
+            raise ValidationError(msg)
+        return
+
+    def _validate_primer_max_mismatches_and_primers_together(self, max_mismatches):
+        for primer in (
+            self._get_arg(const._ARG_FORWARD_PRIMER),
+            self._get_arg(const._ARG_REVERSE_PRIMER),
+        ):
+            if primer and max_mismatches >= len(primer):
+                msg = f"Primer max mismatches {max_mismatches!r} must be less than the length of primer {primer!r}."
+                raise ValidationError(msg)
+        return
+
+    def _validate_primer_mismatch_model(self):
+        model = self._get_arg(const._ARG_PRIMER_MISMATCH_MODEL)
+        choices = [model.value for model in MismatchModel]
+        if model not in choices:
+            msg = f"Primer mismatch model {model!r} must be one of {choices!r}."
+            raise ValidationError(msg)
+        return
+
+    def _validate_index(self):
+        index_file = self._get_arg(const._ARG_INDEX)
+        if index_file is None:
+            return
+        self._assert_auxiliary_output_file(
+            Path(index_file),
+            "Index file",
+            (
+                self._get_arg(const._ARG_INPUT),
+                self._normalise_output_to_file(),
+                self._get_arg(const._ARG_PRIMER_ASSIGNMENTS),
+            ),
+            "input, output or primer assignments file",
+        )
+        return
+
+    def _validate_duplicate_max_mismatches(self):
+        max_mismatches = self._get_arg(const._ARG_DUPLICATE_MAX_MISMATCHES)
+        if max_mismatches is None:
+            return
+        if not isinstance(max_mismatches, int) or max_mismatches < 0:
+            msg = (
+                f"Duplicate max mismatches {max_mismatches!r} must be an integer >= 0."
+            )
+            raise ValidationError(msg)
+        return
+
+    def _validate_duplicates(self):
+        duplicates_file = self._get_arg(const._ARG_DUPLICATES)
+        if duplicates_file is None:
+            return
+        self._validate_duplicates_and_duplicate_max_mismatches_together()
+        self._assert_auxiliary_output_file(
+            Path(duplicates_file),
+            "Duplicates file",
+            (
+                self._get_arg(const._ARG_INPUT),
+                self._normalise_output_to_file(),
+                self._get_arg(const._ARG_PRIMER_ASSIGNMENTS),
+                self._get_arg(const._ARG_INDEX),
+            ),
+            "input, output, primer assignments or index file",
+        )
+        return
+
+    def _validate_duplicates_and_duplicate_max_mismatches_together(self):
+        if self._get_arg(const._ARG_DUPLICATE_MAX_MISMATCHES) is None:
+            msg = "Duplicates can only be written when detecting duplicates."
+            raise ValidationError(msg)
+        return
+
+    def _validate_output_compression(self):
+        compression = self._get_arg(const._ARG_OUTPUT_COMPRESSION)
+        choices = [compression.value for compression in OUTPUT_COMPRESSIONS]
+        if compression not in choices:
+            msg = f"Output compression {compression!r} must be one of {choices!r}."
+            raise ValidationError(msg)
+        return
+
+    def _assert_primer_panel_exists(self, panel_file):
+        if not Path(panel_file).is_file():
+            msg = f"Primer panel {str(panel_file)!r} does not exist."
+            raise ValidationError(msg)
+        return
+
+    def _read_valid_primer_panel(self, panel_file) -> t.List[PrimerPair]:
+        primer_panel = read_primer_panel(panel_file)
+        for primer_pair in primer_panel:
+            for primer in (primer_pair.forward, primer_pair.reverse):
+                self._assert_valid_primer(primer, f"primer pair {primer_pair.name!r}")
+        return primer_panel
+
+    def _assert_auxiliary_output_file(
+        self,
+        file_path: Path,
+        description: str,
+        reserved_files: t.Tuple[t.Optional[Path], ...],
+        reserved_description: str,
+    ):
+        if not file_path.parent.exists():
+            msg = f"{description} {str(file_path)!r} directory does not exist."
+            raise ValidationError(msg)
+        self._check_write_permissions(file_path.parent)
+        if file_path in reserved_files:
+            msg = f"{description} {str(file_path)!r} must not be the {reserved_description}."
+            raise ValidationError(msg)
+        return
+
     def _assert_has_validated_all(self, throw=True) -> bool:
         if not self._validated:
             msg = "ArgsCleaner.validate() must be called before accessing cleaned args."
@@ -2,6 +2,8 @@ import argparse
 from pathlib import Path
 
 from src import constants as const
+from src.csv.compression import OUTPUT_COMPRESSIONS
+from src.enums import Compression, MismatchModel
 
 
 def get_argparser() -> argparse.ArgumentParser:
@@ -83,6 +85,91 @@ def get_argparser() -> argparse.ArgumentParser:
         dest=const._ARG_WARN_NULL_DATA,
     )
 
+    # Parallelism
+    parser.add_argument(
+        "--cpus",
+        type=int,
+        default=1,
+        help=const._HELP__CPUS,
+        dest=const._ARG_CPUS,
+    )
+    parser.add_argument(
+        "--primer-scan-confidence",
+        type=float,
+        default=None,
+        help=const._HELP__PRIMER_SCAN_CONFIDENCE,
+        dest=const._ARG_PRIMER_SCAN_CONFIDENCE,
+    )
+
+    # Primer panel
+    parser.add_argument(
+        "--primer-panel",
+        type=Path,
+        default=None,
+        help=const._HELP__PRIMER_PANEL,
+        dest=const._ARG_PRIMER_PANEL,
+    )
+    parser.add_argument(
+        "--primer-assignments",
+        type=Path,
+        default=None,
+        help=const._HELP__PRIMER_ASSIGNMENTS,
+        dest=const._ARG_PRIMER_ASSIGNMENTS,
+    )
+
+    # Tolerant primer matching
+    parser.add_argument(
+        "--primer-max-mismatches",
+        type=int,
+        default=0,
+        help=const._HELP__PRIMER_MAX_MISMATCHES,
+        dest=const._ARG_PRIMER_MAX_MISMATCHES,
+    )
+    parser.add_argument(
+        "--primer-mismatch-model",
+        type=str,
+        choices=[model.value for model in MismatchModel],
+        default=MismatchModel.HAMMING.value,
+        help=const._HELP__PRIMER_MISMATCH_MODEL,
+        dest=const._ARG_PRIMER_MISMATCH_MODEL,
+    )
+
+    # Output
+    parser.add_argument(
+        "--output-compression",
+        type=str,
+        choices=[compression.value for compression in OUTPUT_COMPRESSIONS],
+        default=Compression.NONE.value,
+        help=const._HELP__OUTPUT_COMPRESSION,
+        dest=const._ARG_OUTPUT_COMPRESSION,
+    )
+    parser.add_argument(
+        "--index",
+        type=Path,
+        default=None,
+        help=const._HELP__INDEX,
+        dest=const._ARG_INDEX,
+    )
+
+    # Duplicate detection
+    parser.add_argument(
+        "--detect-duplicates",
+        type=int,
+        nargs="?",
+        const=0,
+        default=None,
+        metavar="MAX_MISMATCHES",
+        help=const._HELP__DUPLICATE_MAX_MISMATCHES,
+        dest=const._ARG_DUPLICATE_MAX_MISMATCHES,
+    )
+    parser.add_argument(
+        "--duplicates",
+        type=Path,
+        default=None,
+        help=const._HELP__DUPLICATES,
+        dest=const._ARG_DUPLICATES,
+    )
+
     # Mutually exclusive argument group for oligo sequence name
     name_group = parser.add_mutually_exclusive_group(required=True)
     name_group.add_argument(
@@ -0,0 +1,234 @@
+import typing as t
+from dataclasses import dataclass, field
+from pathlib import Path
+import json
+import shlex
+
+from src import constants as const
+from src.csv.write import atomic_output_file
+from src.exceptions import ValidationError
+
+if t.TYPE_CHECKING:
+    import argparse
+
+_MANIFEST_KEY__DEFAULTS = "defaults"
+_MANIFEST_KEY__JOBS = "jobs"
+_JOB_KEY__INPUT = "input"
+_JOB_KEY__OUTPUT = "output"
+
+JOB_STATUS__SUCCEEDED = "succeeded"
+JOB_STATUS__FAILED = "failed"
+
+
+@dataclass(frozen=True)
+class BatchJob:
+    """
+    A library conversion job, as the arguments that pyquest_library_converter.py
+    would be given for it.
+    """
+
+    index: int
+    argv: t.Tuple[str, ...]
+
+    @property
+    def input_file(self) -> str:
+        return self.argv[0]
+
+    @property
+    def output_file(self) -> str:
+        return self.argv[1]
+
+    def get_command(self) -> str:
+        """
+        The single library command line equivalent to this job.
+        """
+        return " ".join([const._CONVERTER_SCRIPT_NAME, shlex.join(self.argv)])
+
+
+@dataclass
+class BatchJobResult:
+    index: int
+    input_file: str
+    output_file: str
+    status: str
+    elapsed_seconds: float
+    error: t.Optional[str] = None
+    report: t.Optional[t.Dict[str, t.Any]] = field(default=None, repr=False)
+
+    @property
+    def succeeded(self) -> bool:
+        return self.status == JOB_STATUS__SUCCEEDED
+
+    def to_dict(self) -> t.Dict[str, t.Any]:
+        return {
+            "job": self.index,
+            "input": self.input_file,
+            "output": self.output_file,
+            "status": self.status,
+            "error": self.error,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "report": self.report,
+        }
+
+
+def read_batch_manifest(
+    manifest_file: t.Union[str, Path], parser: "argparse.ArgumentParser"
+) -> t.List[BatchJob]:
+    """
+    Read the jobs from a JSON batch manifest.
+
+    The manifest holds a list of jobs, and optionally defaults shared by every
+    job. Each job gives its input and output, and any other option of
+    pyquest_library_converter.py by its long name:
+
+        {
+            "defaults": {"sequence-header": "mseq", "revcomp": true},
+            "jobs": [
+                {"input": "lib_1.csv", "output": "lib_1.pyquest.tsv", "name-index": 1},
+                {"input": "lib_2.csv", "output": "lib_2.pyquest.tsv", "forward": "ACGT"}
+            ]
+        }
+
+    The options of every job are parsed with the given argument parser, so a
+    malformed manifest is rejected before any job is run.
+    """
+    manifest = _read_json(manifest_file)
+    _validate_batch_manifest(manifest, manifest_file)
+    defaults = manifest.get(_MANIFEST_KEY__DEFAULTS, {})
+    return [
+        _read_batch_job(index, job_options, defaults, parser)
+        for index, job_options in enumerate(manifest[_MANIFEST_KEY__JOBS], start=1)
+    ]
+
+
+def _read_json(manifest_file: t.Union[str, Path]) -> t.Any:
+    try:
+        with open(manifest_file) as manifest_handle:
+            return json.load(manifest_handle)
+    except json.JSONDecodeError as err:
+        msg = f"Batch manifest {str(manifest_file)!r} is not valid JSON: {err}"
+        raise ValidationError(msg) from err
+
+
+def _validate_batch_manifest(
+    manifest: t.Any, manifest_file: t.Union[str, Path]
+) -> None:
+    if not isinstance(manifest, dict) or not isinstance(
+        manifest.get(_MANIFEST_KEY__JOBS), list
+    ):
+        msg = f"Batch manifest {str(manifest_file)!r} must be an object with a list of {_MANIFEST_KEY__JOBS!r}."
+        raise ValidationError(msg)
+    if not isinstance(manifest.get(_MANIFEST_KEY__DEFAULTS, {}), dict):
+        msg = f"Batch manifest {_MANIFEST_KEY__DEFAULTS!r} must be an object."
+        raise ValidationError(msg)
+    if not manifest[_MANIFEST_KEY__JOBS]:
+        msg = f"Batch manifest {str(manifest_file)!r} has no jobs."
+        raise ValidationError(msg)
+    return
+
+
+def _read_batch_job(
+    index: int,
+    job_options: t.Any,
+    defaults: t.Dict[str, t.Any],
+    parser: "argparse.ArgumentParser",
+) -> BatchJob:
+    if not isinstance(job_options, dict):
+        msg = f"Batch job {index} must be an object."
+        raise ValidationError(msg)
+    options = {**defaults, **job_options}
+    argv = job_options_to_argv(options, parser, index)
+    return BatchJob(index=index, argv=tuple(argv))
+
+
+def job_options_to_argv(
+    options: t.Dict[str, t.Any], parser: "argparse.ArgumentParser", index: int
+) -> t.List[str]:
+    """
+    Convert the options of a batch job to the argument list of a single library
+    run, checking that they parse.
+
+    Each option is converted to the flag of the long option of the parser it
+    names. Flags are given as booleans, and other options as a string or number.
+    """
+    _assert_job_has_input_and_output(options, index)
+    option_flags = _get_option_flags(parser)
+    argv = [str(options[_JOB_KEY__INPUT]), str(options[_JOB_KEY__OUTPUT])]
+    for key, value in options.items():
+        if key not in (_JOB_KEY__INPUT, _JOB_KEY__OUTPUT):
+            argv.extend(_job_option_to_argv(key, value, option_flags, index))
+    parse_job_argv(argv, parser, index)
+    return argv
+
+
+def _assert_job_has_input_and_output(options: t.Dict[str, t.Any], index: int) -> None:
+    for key in (_JOB_KEY__INPUT, _JOB_KEY__OUTPUT):
+        if not options.get(key):
+            msg = f"Batch job {index} has no {key!r}."
+            raise ValidationError(msg)
+    return
+
+
+def _get_option_flags(parser: "argparse.ArgumentParser") -> t.Dict[str, str]:
+    """
+    Map the name of each long option of the parser, e.g. 'sequence-header', to
+    its flag, e.g. '--sequence-header'.
+    """
+    return {
+        flag[2:]: flag
+        for flag in parser._option_string_actions
+        if flag.startswith("--")
+    }
+
+
+def _job_option_to_argv(
+    key: str, value: t.Any, option_flags: t.Dict[str, str], index: int
+) -> t.List[str]:
+    # Options may be given with underscores in place of hyphens
+    flag = option_flags.get(key.replace("_", "-"))
+    if flag is None:
+        msg = f"Batch job {index} has an unknown option {key!r}."
+        raise ValidationError(msg)
+    if isinstance(value, bool):
+        return [flag] if value else []
+    return [] if value is None else [flag, str(value)]
+
+
+def parse_job_argv(
+    argv: t.Sequence[str], parser: "argparse.ArgumentParser", index: int
+) -> "argparse.Namespace":
+    """
+    Parse the arguments of a batch job, raising a ValidationError rather than
+    exiting if they are invalid.
+    """
+    try:
+        return parser.parse_args(list(argv))
+    except SystemExit as err:
+        # argparse has already printed the reason to stderr
+        msg = f"Batch job {index} has invalid arguments: {shlex.join(argv)}"
+        raise ValidationError(msg) from err
+
+
+def summarise_batch(
+    results: t.Sequence[BatchJobResult], elapsed_seconds: float
+) -> t.Dict[str, t.Any]:
+    """
+    Aggregate the results of every batch job into a JSON serialisable summary.
+    """
+    succeeded = [result for result in results if result.succeeded]
+    return {
+        "jobs": len(results),
+        "succeeded": len(succeeded),
+        "failed": len(results) - len(succeeded),
+        "rows": sum(result.report["rows"] for result in succeeded),
+        "elapsed_seconds": round(elapsed_seconds, 3),
+        "results": [result.to_dict() for result in results],
+    }
+
+
+def write_batch_summary(
+    summary: t.Dict[str, t.Any], summary_file: t.Union[str, Path]
+) -> None:
+    with atomic_output_file(summary_file) as output:
+        json.dump(summary, output, indent=2)
+        output.write("\n")
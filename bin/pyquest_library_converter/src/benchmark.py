@@ -0,0 +1,275 @@
+import typing as t
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+import json
+import random
+import statistics
+
+from src.csv.write import atomic_output_file
+from src.dna.helpers import reverse_complement
+from src.enums import OligoCasing
+from src.exceptions import ValidationError
+
+# Illumina P5 and P7 adapter sequences, so the primers look like real ones
+DEFAULT_FORWARD_PRIMER = "AATGATACGGCGACCACCGA"
+DEFAULT_REVERSE_PRIMER = "ATCTCGTATGCCGTCTTCTGCTTG"
+_NAME_HEADER = "oligo_name"
+_SEQUENCE_HEADER = "mseq"
+
+
+@dataclass(frozen=True)
+class SyntheticLibrary:
+    """
+    A reproducible synthetic oligo library: each oligo is the forward primer, a
+    random middle and the reverse primer, in the reverse complement orientation
+    for reverse_fraction of the oligos, with null sequences for null_fraction
+    of them.
+    """
+
+    row_count: int
+    oligo_length: int
+    reverse_fraction: float = 0.0
+    casing: OligoCasing = OligoCasing.UPPER
+    null_fraction: float = 0.0
+    seed: int = 0
+    forward_primer: str = DEFAULT_FORWARD_PRIMER
+    reverse_primer: str = DEFAULT_REVERSE_PRIMER
+
+    def __post_init__(self) -> None:
+        primers_length = len(self.forward_primer) + len(self.reverse_primer)
+        for name, is_valid, msg in (
+            (
+                "row_count",
+                lambda row_count: row_count >= 1,
+                f"Row count {self.row_count!r} must be an integer >= 1.",
+            ),
+            (
+                "oligo_length",
+                lambda oligo_length: oligo_length > primers_length,
+                f"Oligo length {self.oligo_length!r} must be greater than the length of the primers ({primers_length}).",
+            ),
+            (
+                "reverse_fraction",
+                lambda fraction: 0 <= fraction <= 1,
+                f"Reverse fraction {self.reverse_fraction!r} must be between 0 and 1.",
+            ),
+            (
+                "null_fraction",
+                lambda fraction: 0 <= fraction <= 1,
+                f"Null fraction {self.null_fraction!r} must be between 0 and 1.",
+            ),
+            (
+                "casing",
+                lambda casing: casing in (OligoCasing.UPPER, OligoCasing.LOWER),
+                f"Casing {self.casing.value!r} must be upper or lower.",
+            ),
+        ):
+            if not is_valid(getattr(self, name)):
+                raise ValidationError(msg)
+
+    @property
+    def name(self) -> str:
+        return (
+            f"rows={self.row_count} length={self.oligo_length} "
+            f"reverse={self.reverse_fraction:g} casing={self.casing.value} "
+            f"null={self.null_fraction:g} seed={self.seed}"
+        )
+
+    def iter_oligos(self) -> t.Iterator[str]:
+        rng = random.Random(self.seed)
+        middle_length = (
+            self.oligo_length - len(self.forward_primer) - len(self.reverse_primer)
+        )
+        for _ in range(self.row_count):
+            if rng.random() < self.null_fraction:
+                yield ""
+                continue
+            oligo = (
+                self.forward_primer
+                + "".join(rng.choices("ACGT", k=middle_length))
+                + self.reverse_primer
+            )
+            if rng.random() < self.reverse_fraction:
+                oligo = reverse_complement(oligo)
+            yield oligo.lower() if self.casing == OligoCasing.LOWER else oligo
+
+    def write(self, library_file: t.Union[str, Path]) -> None:
+        """
+        Write the library as a CSV file, with a column header row.
+        """
+        with atomic_output_file(library_file) as library:
+            library.write(f"{_NAME_HEADER},{_SEQUENCE_HEADER}\n")
+            for index, oligo in enumerate(self.iter_oligos(), start=1):
+                library.write(f"oligo_{index},{oligo}\n")
+
+    def get_converter_argv(
+        self,
+        library_file: t.Union[str, Path],
+        output_file: t.Union[str, Path],
+        converter_args: t.Sequence[str] = (),
+    ) -> t.List[str]:
+        """
+        The arguments of pyquest_library_converter.py to convert the library.
+        """
+        argv = [
+            str(library_file),
+            str(output_file),
+            "--name-header",
+            _NAME_HEADER,
+            "--sequence-header",
+            _SEQUENCE_HEADER,
+            "--forward",
+            self.forward_primer,
+            "--reverse",
+            self.reverse_primer,
+        ]
+        if self.null_fraction:
+            argv.append("--suppress-null-errors")
+        return argv + list(converter_args)
+
+
+@dataclass
+class BenchmarkRun:
+    elapsed_seconds: float
+    stage_seconds: t.Dict[str, float]
+    stage_peak_rss_bytes: t.Dict[str, t.Optional[int]]
+    peak_rss_bytes: t.Optional[int]
+    rows: int
+
+    def to_dict(self) -> t.Dict[str, t.Any]:
+        return {
+            "elapsed_seconds": round(self.elapsed_seconds, 4),
+            "stage_seconds": {
+                stage: round(seconds, 4)
+                for stage, seconds in self.stage_seconds.items()
+            },
+            "stage_peak_rss_bytes": self.stage_peak_rss_bytes,
+            "peak_rss_bytes": self.peak_rss_bytes,
+            "rows": self.rows,
+        }
+
+
+@dataclass
+class BenchmarkCase:
+    library: SyntheticLibrary
+    input_bytes: int
+    runs: t.List[BenchmarkRun] = field(default_factory=list)
+
+    def to_dict(self) -> t.Dict[str, t.Any]:
+        """
+        The case, its runs and a summary of them: the median time of each
+        stage and of the whole conversion, the throughput at the median time,
+        and the highest peak RSS.
+        """
+        median_seconds = statistics.median(run.elapsed_seconds for run in self.runs)
+        stages = {stage: None for run in self.runs for stage in run.stage_seconds}
+        peak_rss_bytes = [
+            run.peak_rss_bytes for run in self.runs if run.peak_rss_bytes is not None
+        ]
+        return {
+            "case": self.library.name,
+            "library": {**asdict(self.library), "casing": self.library.casing.value},
+            "input_bytes": self.input_bytes,
+            "median_seconds": round(median_seconds, 4),
+            "median_stage_seconds": {
+                stage: round(
+                    statistics.median(
+                        run.stage_seconds.get(stage, 0.0) for run in self.runs
+                    ),
+                    4,
+                )
+                for stage in stages
+            },
+            "rows_per_second": round(self.library.row_count / median_seconds),
+            "megabytes_per_second": round(self.input_bytes / median_seconds / 1e6, 2),
+            "peak_rss_bytes": max(peak_rss_bytes, default=None),
+            "runs": [run.to_dict() for run in self.runs],
+        }
+
+
+def compare_to_baseline(
+    results: t.Dict[str, t.Any],
+    baseline: t.Dict[str, t.Any],
+    tolerance: float = 0.1,
+) -> t.Tuple[t.List[str], t.List[str]]:
+    """
+    Compare the median time of each case, and of each of its stages, to the
+    same case of a baseline summary.
+
+    Returns the comparison lines, and the cases whose median time is more than
+    tolerance slower than the baseline. Cases missing from the baseline are
+    skipped.
+    """
+    baseline_cases = {case["case"]: case for case in baseline.get("cases", [])}
+    lines = []
+    regressions = []
+    for case in results["cases"]:
+        baseline_case = baseline_cases.get(case["case"])
+        if baseline_case is None:
+            lines.append(f"{case['case']}: not in the baseline.")
+            continue
+        ratio = case["median_seconds"] / baseline_case["median_seconds"]
+        lines.extend(_compare_case_to_baseline(case, baseline_case, ratio))
+        if ratio > 1 + tolerance:
+            regressions.append(case["case"])
+    return lines, regressions
+
+
+def _compare_case_to_baseline(
+    case: t.Dict[str, t.Any], baseline_case: t.Dict[str, t.Any], ratio: float
+) -> t.List[str]:
+    lines = [
+        f"{case['case']}: {case['median_seconds']:.3f}s vs "
+        f"{baseline_case['median_seconds']:.3f}s ({ratio:.2f}x)"
+    ]
+    for stage, seconds in case["median_stage_seconds"].items():
+        baseline_seconds = baseline_case["median_stage_seconds"].get(stage)
+        if baseline_seconds:
+            lines.append(
+                f"  {stage}: {seconds:.3f}s vs {baseline_seconds:.3f}s "
+                f"({seconds / baseline_seconds:.2f}x)"
+            )
+    return lines
+
+
+def format_benchmark(results: t.Dict[str, t.Any]) -> t.List[str]:
+    """
+    Summarise each case of a benchmark in a few lines.
+    """
+    lines = []
+    for case in results["cases"]:
+        peak_rss = (
+            f"{case['peak_rss_bytes'] / 1e6:.0f} MB"
+            if case["peak_rss_bytes"] is not None
+            else "unknown"
+        )
+        lines.append(
+            f"{case['case']}: {case['median_seconds']:.3f}s, "
+            f"{case['rows_per_second']} rows/s, "
+            f"{case['megabytes_per_second']} MB/s, peak RSS {peak_rss}"
+        )
+        lines.append(
+            "  "
+            + ", ".join(
+                f"{stage} {seconds:.3f}s"
+                for stage, seconds in case["median_stage_seconds"].items()
+            )
+        )
+    return lines
+
+
+def read_benchmark(results_file: t.Union[str, Path]) -> t.Dict[str, t.Any]:
+    try:
+        with open(results_file) as results_handle:
+            return json.load(results_handle)
+    except json.JSONDecodeError as err:
+        msg = f"Benchmark results {str(results_file)!r} are not valid JSON: {err}"
+        raise ValidationError(msg) from err
+
+
+def write_benchmark(
+    results: t.Dict[str, t.Any], results_file: t.Union[str, Path]
+) -> None:
+    with atomic_output_file(results_file) as output:
+        json.dump(results, output, indent=2)
+        output.write("\n")
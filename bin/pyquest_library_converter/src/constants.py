@@ -13,12 +13,61 @@ _ARG_NAME_INDEX = "name_index"
 _ARG_SEQ_HEADER = "sequence_header"
 _ARG_SEQ_INDEX = "sequence_index"
 _ARG_WARN_NULL_DATA = "warn_null_data"
+_ARG_CPUS = "cpus"
+_ARG_PRIMER_SCAN_CONFIDENCE = "primer_scan_confidence"
+_ARG_OUTPUT_COMPRESSION = "output_compression"
+_ARG_PRIMER_PANEL = "primer_panel"
+_ARG_PRIMER_ASSIGNMENTS = "primer_assignments_file"
+_ARG_PRIMER_MAX_MISMATCHES = "primer_max_mismatches"
+_ARG_PRIMER_MISMATCH_MODEL = "primer_mismatch_model"
+_ARG_INDEX = "index_file"
+_ARG_DUPLICATE_MAX_MISMATCHES = "duplicate_max_mismatches"
+_ARG_DUPLICATES = "duplicates_file"
+
+_CONVERTER_SCRIPT_NAME = "pyquest_library_converter.py"
+_ARG_BATCH_MANIFEST = "manifest_file"
+_ARG_BATCH_SUMMARY = "summary_file"
+_ARG_BATCH_WORKERS = "workers"
+_ARG_BENCHMARK_RESULTS = "results_file"
+_ARG_BENCHMARK_ROWS = "row_counts"
+_ARG_BENCHMARK_OLIGO_LENGTH = "oligo_lengths"
+_ARG_BENCHMARK_REVERSE_FRACTION = "reverse_fraction"
+_ARG_BENCHMARK_CASING = "casing"
+_ARG_BENCHMARK_NULL_FRACTION = "null_fraction"
+_ARG_BENCHMARK_SEED = "seed"
+_ARG_BENCHMARK_REPEAT = "repeat"
+_ARG_BENCHMARK_CONVERTER_ARGS = "converter_args"
+_ARG_BENCHMARK_WORK_DIR = "work_dir"
+_ARG_BENCHMARK_BASELINE = "baseline_file"
+_ARG_BENCHMARK_TOLERANCE = "tolerance"
 
 
 _OUTPUT_HEADER__ID = "#id"
 _OUTPUT_DELIMITER = "\t"
 _OUTPUT_HEADER__NAME = "name"
 _OUTPUT_HEADER__SEQUENCE = "sequence"
+_OUTPUT_HEADERS = (_OUTPUT_HEADER__ID, _OUTPUT_HEADER__NAME, _OUTPUT_HEADER__SEQUENCE)
+# Rows are carried as (id, name, sequence) tuples, in output header order
+_ROW_INDEX__ID = 0
+_ROW_INDEX__NAME = 1
+_ROW_INDEX__SEQUENCE = 2
+_OUTPUT_HEADER__PRIMER_PAIR = "primer_pair"
+_OUTPUT_HEADER__ORIENTATION = "orientation"
+_PRIMER_ASSIGNMENT_HEADERS = (
+    _OUTPUT_HEADER__ID,
+    _OUTPUT_HEADER__NAME,
+    _OUTPUT_HEADER__PRIMER_PAIR,
+    _OUTPUT_HEADER__ORIENTATION,
+)
+_OUTPUT_HEADER__DUPLICATE = "#duplicate"
+_OUTPUT_HEADER__MISMATCHES = "mismatches"
+_OUTPUT_HEADER__IDS = "ids"
+_OUTPUT_IDS_DELIMITER = ","
+_DUPLICATE_HEADERS = (
+    _OUTPUT_HEADER__DUPLICATE,
+    _OUTPUT_HEADER__MISMATCHES,
+    _OUTPUT_HEADER__IDS,
+)
 
 _TEMPLATE_GROUP_HEADER = "The column name or header in the CSV/TSV for the {}."
 _TEMPLATE_GROUP_IDX = "1-indexed integer for the column index in a CSV/TSV for the {}."
@@ -39,6 +88,38 @@ _HELP__REVERSE_PRIMER = (
 _HELP__SKIP_N_ROWS = "Choose how many data rows to skip before processing. Any headers or comments are always automatically skipped. If unset defaults to 0. E.g 0 (no data rows skipped), 1 (skip first row) and N (skip N data rows)."
 _HELP__FORCE_HEADER_INDEX = "Force the input file parser to use this index for the column header row (1-index). By default, the script auto-detects the index of column header row, if any. If also using '--skip', the script will automatically skip all rows up to and including index before then skipping the speficied N data rows."
 _HELP__REVERSE_COMPLEMENT_FLAG = "Reverse complement the oligo sequence."
+_HELP__CPUS = "Number of CPUs (processes) to use when scanning the oligo sequences for primers, and threads to use when compressing bgzip output. If unset defaults to 1."
+_HELP__PRIMER_SCAN_CONFIDENCE = "Stop counting primers once the choice between each primer and its reverse complement is statistically certain at this confidence level (exclusive range 0 to 1, e.g. 0.999). All oligo sequences are still checked for casing and invalid characters. If unset, all oligo sequences are scanned for primers."
+_HELP__PRIMER_PANEL = "CSV/TSV file of named primer pairs, with the columns name, forward and reverse, for libraries that pool amplicons. Each oligo is trimmed by the primer pair, and orientation, found at its ends. An oligo in the reverse orientation starts with the reverse complement of the reverse primer and ends with the reverse complement of the forward primer. Cannot be used with '--forward' or '--reverse'."
+_HELP__PRIMER_ASSIGNMENTS = "Output file path for the primer pair and orientation assigned to each oligo, when using '--primer-panel'."
+_HELP__PRIMER_MAX_MISMATCHES = "Trim primers that differ from an end of the oligo sequence by up to this many mismatches, e.g. 1 for a single synthesis error. Must be less than the length of each primer. If unset defaults to 0, only trimming exact matches."
+_HELP__PRIMER_MISMATCH_MODEL = "How primer mismatches are counted when '--primer-max-mismatches' is greater than 0: hamming (substitutions only) or edit (substitutions, insertions and deletions). If unset defaults to hamming."
+_HELP__INDEX = "Output file path for a binary index of the output sequences, written in the same pass as the output file. It maps each distinct sequence to the ids of its rows, with sequence length statistics, and can be memory-mapped instead of rebuilding the lookup from the output file."
+_HELP__DUPLICATE_MAX_MISMATCHES = "Detect output sequences that collide after trimming: exact duplicates and, if a number of mismatches is given, pairs of sequences of the same length within that many mismatches. The duplicates are summarised in the report. If unset, duplicates are not detected."
+_HELP__DUPLICATES = "Output file path for every exact duplicate group and near duplicate pair, with their ids, when using '--detect-duplicates'."
+_HELP__OUTPUT_COMPRESSION = "Compress the output file: none, gzip or bgzip (blocked gzip, readable by gzip and indexable by htslib). If unset defaults to none. Compressed input files (gzip, bgzip or bzip2) are always detected automatically."
+
+_HELP__BATCH_MANIFEST = "JSON manifest of library conversion jobs. Each job gives its 'input' and 'output', and any other option of pyquest_library_converter.py by its long name (e.g. 'forward', 'name-index' or 'revcomp'). Options shared by every job can be given once in 'defaults'."
+_HELP__BATCH_SUMMARY = "Output file path for the aggregated JSON summary of every job."
+_HELP__BATCH_WORKERS = "Number of jobs to run concurrently, each in a worker process. If unset defaults to 1."
+_HELP__BATCH_VERBOSE = "Print the report of each job."
+
+_HELP__BENCHMARK_RESULTS = "Output file path for the JSON benchmark results, with the time of each stage and the peak RSS of every run."
+_HELP__BENCHMARK_ROWS = "Number of rows of the synthetic libraries. Several values benchmark a library of each size. If unset defaults to 100000."
+_HELP__BENCHMARK_OLIGO_LENGTH = "Length of the oligos of the synthetic libraries, primers included. Several values benchmark a library of each length. If unset defaults to 200."
+_HELP__BENCHMARK_REVERSE_FRACTION = "Fraction of the oligos in the reverse complement orientation. If unset defaults to 0."
+_HELP__BENCHMARK_CASING = (
+    "Casing of the oligos: upper or lower. If unset defaults to upper."
+)
+_HELP__BENCHMARK_NULL_FRACTION = (
+    "Fraction of the rows with a null sequence. If unset defaults to 0."
+)
+_HELP__BENCHMARK_SEED = "Seed of the random oligo sequences, so libraries can be reproduced. If unset defaults to 0."
+_HELP__BENCHMARK_REPEAT = "Number of times each library is converted, each in a fresh worker process. If unset defaults to 3."
+_HELP__BENCHMARK_CONVERTER_ARGS = "Further options of pyquest_library_converter.py for every conversion, as a single quoted string (e.g. '--cpus 4 --detect-duplicates 1')."
+_HELP__BENCHMARK_WORK_DIR = "Directory to write the synthetic libraries and converted outputs to. If unset defaults to a temporary directory."
+_HELP__BENCHMARK_BASELINE = "JSON benchmark results to compare to. The script exits with an error if a library converts more than the tolerance slower than in the baseline."
+_HELP__BENCHMARK_TOLERANCE = "Fraction by which a library may convert slower than in the baseline. If unset defaults to 0.1."
 
 
 FILE_HEADER_LINE_PREFIX = "##"
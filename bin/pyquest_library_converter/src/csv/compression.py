@@ -0,0 +1,195 @@
+import typing as t
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+import bz2
+import gzip
+import io
+import struct
+import zlib
+
+from src.enums import Compression
+from src.exceptions import ValidationError
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_GZIP_FLAG_FEXTRA = 0x04
+_BGZF_EXTRA_SUBFIELD_ID = b"BC"
+_BZIP2_MAGIC = b"BZh"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_MAGIC_PROBE_SIZE = 18
+
+# Compression formats that the output can be written as
+OUTPUT_COMPRESSIONS = (Compression.NONE, Compression.GZIP, Compression.BGZIP)
+
+# BGZF blocks, as written by bgzip: each block is a complete gzip member with a
+# 'BC' extra subfield holding the block size, so the output can be read by any
+# gzip reader, and indexed by htslib.
+_BGZF_MAX_BLOCK_DATA_SIZE = 0xFF00
+_BGZF_HEADER = struct.Struct("<4sIBBH2sHH")
+_BGZF_FOOTER = struct.Struct("<II")
+_BGZF_EOF_BLOCK = bytes.fromhex(
+    "1f8b08040000000000ff0600424302001b0003000000000000000000"
+)
+_BGZF_BLOCKS_IN_FLIGHT_PER_THREAD = 4
+_COMPRESSION_LEVEL = 6
+_OUTPUT_BUFFER_SIZE_1MB = 1024 * 1024
+
+# Openers of the compression formats that the input can be read as
+_INPUT_OPENERS: t.Dict[Compression, t.Callable[..., t.IO]] = {
+    Compression.NONE: open,
+    Compression.GZIP: gzip.open,
+    Compression.BGZIP: gzip.open,
+    Compression.BZIP2: bz2.open,
+}
+
+
+def detect_compression(file_path: t.Union[str, Path]) -> Compression:
+    """
+    Detect the compression of a file from its magic bytes.
+    """
+    with open(file_path, "rb") as file_handle:
+        head = file_handle.read(_MAGIC_PROBE_SIZE)
+    if head.startswith(_GZIP_MAGIC):
+        has_bgzf_extra = (
+            len(head) >= _MAGIC_PROBE_SIZE
+            and head[3] & _GZIP_FLAG_FEXTRA
+            and head[12:14] == _BGZF_EXTRA_SUBFIELD_ID
+        )
+        return Compression.BGZIP if has_bgzf_extra else Compression.GZIP
+    elif head.startswith(_BZIP2_MAGIC):
+        return Compression.BZIP2
+    elif head.startswith(_ZSTD_MAGIC):
+        return Compression.ZSTD
+    return Compression.NONE
+
+
+def open_input(
+    file_path: t.Union[str, Path], mode: str = "r", newline: t.Optional[str] = None
+) -> t.IO:
+    """
+    Open a plain, gzip (including bgzip) or bzip2 compressed input file, in text
+    ("r") or binary ("rb") mode.
+
+    Compression is detected from the magic bytes, not the file extension.
+    """
+    compression = detect_compression(file_path)
+    opener = _INPUT_OPENERS.get(compression)
+    if opener is None:
+        msg = (
+            f"Input file {str(file_path)!r} is {compression.value} compressed, which "
+            "is not supported as only the Python standard library is used. "
+            "Decompress it, or recompress it with gzip, bgzip or bzip2."
+        )
+        raise ValidationError(msg)
+    if mode == "r":
+        # Match the text mode used for plain files
+        mode = "rt"
+    else:
+        newline = None
+    return opener(file_path, mode, newline=newline)
+
+
+def open_compressed_output(
+    raw: t.BinaryIO, compression: Compression, threads: int = 1
+) -> t.BinaryIO:
+    """
+    Wrap a binary output stream in a buffered compressing stream.
+
+    Closing the returned stream finishes the compressed data, but does not
+    close the wrapped stream.
+    """
+    if compression == Compression.GZIP:
+        gzip_stream = gzip.GzipFile(
+            filename="",
+            mode="wb",
+            fileobj=raw,
+            compresslevel=_COMPRESSION_LEVEL,
+            mtime=0,
+        )
+        return io.BufferedWriter(gzip_stream, buffer_size=_OUTPUT_BUFFER_SIZE_1MB)
+    elif compression == Compression.BGZIP:
+        return io.BufferedWriter(
+            BGZFWriter(raw, threads=threads), buffer_size=_OUTPUT_BUFFER_SIZE_1MB
+        )
+    msg = f"Output compression {compression.value!r} is not supported."
+    raise ValueError(msg)
+
+
+class BGZFWriter(io.RawIOBase):
+    """
+    BGZFWriter compresses the data written to it into BGZF blocks, using a pool
+    of threads, and writes the blocks to the wrapped stream in order.
+
+    zlib releases the GIL while compressing, so the blocks are compressed in
+    parallel.
+    """
+
+    def __init__(
+        self, raw: t.BinaryIO, threads: int = 1, level: int = _COMPRESSION_LEVEL
+    ) -> None:
+        super().__init__()
+        self._raw = raw
+        self._level = level
+        self._pending = bytearray()
+        self._executor = ThreadPoolExecutor(max_workers=threads)
+        self._in_flight: "deque[Future[bytes]]" = deque()
+        self._max_in_flight = threads * _BGZF_BLOCKS_IN_FLIGHT_PER_THREAD
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._pending += data
+        while len(self._pending) >= _BGZF_MAX_BLOCK_DATA_SIZE:
+            block_data = bytes(self._pending[:_BGZF_MAX_BLOCK_DATA_SIZE])
+            del self._pending[:_BGZF_MAX_BLOCK_DATA_SIZE]
+            self._submit(block_data)
+        return len(data)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            self._finish()
+        finally:
+            self._executor.shutdown(wait=True)
+            super().close()
+
+    def _finish(self) -> None:
+        """
+        Write the final, partial block, the blocks in flight and the EOF marker.
+        """
+        if self._pending:
+            self._submit(bytes(self._pending))
+            self._pending.clear()
+        while self._in_flight:
+            self._raw.write(self._in_flight.popleft().result())
+        self._raw.write(_BGZF_EOF_BLOCK)
+
+    def _submit(self, block_data: bytes) -> None:
+        if len(self._in_flight) >= self._max_in_flight:
+            # Write the oldest block to bound memory use, keeping block order
+            self._raw.write(self._in_flight.popleft().result())
+        future = self._executor.submit(compress_bgzf_block, block_data, self._level)
+        self._in_flight.append(future)
+
+
+def compress_bgzf_block(data: bytes, level: int = _COMPRESSION_LEVEL) -> bytes:
+    """
+    Compress data into a single BGZF block.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    compressed = compressor.compress(data) + compressor.flush()
+    block_size = _BGZF_HEADER.size + len(compressed) + _BGZF_FOOTER.size
+    header = _BGZF_HEADER.pack(
+        b"\x1f\x8b\x08\x04",  # gzip magic, deflate, FEXTRA flag
+        0,  # mtime
+        0,  # extra flags
+        0xFF,  # unknown OS
+        6,  # extra field length
+        _BGZF_EXTRA_SUBFIELD_ID,
+        2,  # subfield length
+        block_size - 1,
+    )
+    footer = _BGZF_FOOTER.pack(zlib.crc32(data), len(data))
+    return header + compressed + footer
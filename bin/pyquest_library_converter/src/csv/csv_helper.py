@@ -2,16 +2,16 @@ import typing as t
 from pathlib import Path
 import csv
 from contextlib import contextmanager
-import functools
 
 from src.exceptions import ValidationError
 from src import constants as const
 from src.cli import display_warning
+from src.csv.compression import open_input
+from src.csv.probe import get_csv_file_probe
 
 if t.TYPE_CHECKING:
     import _csv
 
-_CHUNK_SIZE_1MB = 1024 * 1024
 _UNSET_TABULAR_ROW_INDEX = -1000
 
 
@@ -37,22 +37,7 @@ class CSVHelper:
         """
         Get the dialect of a CSV or TSV file, while being able to handle large files and files with comments.
         """
-        with open(self._file_path, newline="") as csvfile:
-            chunk_size = 1024 * 1024  # 1MB
-            sample = ""
-            while len(sample) < chunk_size:
-                line = csvfile.readline()
-                # Stop if EOF is reached
-                if not line:
-                    break
-                # Skip lines that start with '#'
-                if line.startswith("#"):
-                    continue
-                sample += line
-            dialect_t = csv.Sniffer().sniff(sample)
-            dialect = dialect_t()
-
-        return dialect
+        return get_csv_file_probe(self._file_path).dialect
 
     def _init_first_tabular_row_data(self):
         self._find_first_tabular_row_idx_and_offset(one_index=False)
@@ -114,7 +99,7 @@ class CSVHelper:
             ...         print(row)
         """
         offset = self._first_tabular_row_offset
-        with open(self._file_path, newline="") as csvfile:
+        with open_input(self._file_path, newline="") as csvfile:
             csvfile.seek(offset)
             reader = (
                 csv.reader(csvfile, delimiter=self._delimiter)
@@ -212,9 +197,15 @@ class CSVHelper:
         return self._columns_count
 
     def _get_columns_count(self) -> int:
-        with self._get_csv_reader() as reader:
-            for row in reader:
-                return len(row)
+        if self._dialect is not None:
+            # The dialect was sniffed, so the shared probe can count the columns
+            columns_count = get_csv_file_probe(self._file_path).columns_count
+            if columns_count is not None:
+                return columns_count
+        else:
+            with self._get_csv_reader() as reader:
+                for row in reader:
+                    return len(row)
         raise ValidationError("No rows found in CSV file as it is empty.")
 
     @property
@@ -227,9 +218,7 @@ class CSVHelper:
         return self._line_count
 
     def _get_line_count(self) -> int:
-        with open(self._file_path, "r") as csvfile:
-            line_count = sum(1 for line in csvfile)
-        return line_count
+        return get_csv_file_probe(self._file_path).line_count
 
 
 def find_file_headers(
@@ -245,7 +234,7 @@ def find_file_headers(
     """
     if prefix is None:
         prefix = const.FILE_HEADER_LINE_PREFIX
-    with open(csv_file_path, "r") as csv_file:
+    with open_input(csv_file_path) as csv_file:
         file_header_indices = _find_file_headers(
             csv_file, prefix=prefix, max_line=max_line
         )
@@ -341,7 +330,7 @@ def find_column_headers_by_name(
     read the entire file.
     case_sensitive: Whether to perform case sensitive matching of column names.
     """
-    with open(csv_file_path, "r") as csv_file:
+    with open_input(csv_file_path) as csv_file:
         idx = _find_column_headers_by_name(
             csv_file,
             column_names=column_names,
@@ -399,25 +388,13 @@ def find_column_headers_by_heuristic(
     value will be -1.
     """
     prefix = const.FILE_HEADER_LINE_PREFIX if prefix is None else prefix
-    first_line, offset = find_first_tabular_line_index_and_offset(
-        csv_file_path, prefix=prefix
-    )
-    with open(csv_file_path, newline="") as csv_file:
-        csv_file.seek(offset)
-        # Read the first 1MB of the file
-        chunk = csv_file.read(_CHUNK_SIZE_1MB)
-        # Count the number of lines in the chunk
-        try:
-            has_header = csv.Sniffer().has_header(chunk)
-        except csv.Error as e:
-            if not _suppress_csv_lib_errors:
-                raise e
-            else:
-                has_header = False
+    probe = get_csv_file_probe(csv_file_path, prefix=prefix)
+    first_line, _ = probe.first_tabular_row
+    # Checks the first 1MB of tabular data
+    has_header = probe.has_header(suppress_csv_lib_errors=_suppress_csv_lib_errors)
     return first_line if has_header else -1
 
 
-@functools.lru_cache(maxsize=32)
 def find_first_tabular_line_index_and_offset(
     csv_file_path: t.Union[str, Path], prefix: t.Optional[str] = None
 ) -> t.Tuple[int, int]:
@@ -430,31 +407,8 @@ def find_first_tabular_line_index_and_offset(
 
     csv_file_path: The path to the CSV file. prefix: The prefix of any file
     header line, typically '##'.
+
+    The result is shared, per file fingerprint, via get_csv_file_probe.
     """
-    prefix = const.FILE_HEADER_LINE_PREFIX if prefix is None else prefix
-    file_header_idxs = find_file_headers(csv_file_path, prefix=prefix)
-    stop_row_idx = max(file_header_idxs) + 1 if file_header_idxs else 0  # 0-indexed
-
-    offset = 0
-    result_offset = None
-
-    current_row_idx = 0  # 0-indexed
-    with open(csv_file_path, newline="") as csv_file:
-        while True:
-            line = csv_file.readline()
-            offset = csv_file.tell() - len(line)
-            if stop_row_idx == current_row_idx:
-                result_idx = current_row_idx
-                result_offset = offset
-                break
-            current_row_idx += 1
-
-    if result_offset is None:
-        # This should never happen
-        msg = (
-            f"File {csv_file_path!r} cannot calculate the offset, "
-            f"because more rows were skipped ({stop_row_idx}) "
-            f"than there are in the file ({current_row_idx})."
-        )
-        raise ValueError(msg)
-    return result_idx, result_offset
+    probe = get_csv_file_probe(csv_file_path, prefix=prefix)
+    return probe.first_tabular_row
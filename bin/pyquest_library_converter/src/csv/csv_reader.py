@@ -1,13 +1,43 @@
 import typing as t
 from pathlib import Path
+import collections
 import csv
+import itertools
 from contextlib import contextmanager
 
+from src.csv.compression import open_input
+from src.csv.probe import get_csv_file_probe
+
 
 if t.TYPE_CHECKING:
     import _csv
 
-_CHUNK_SIZE_1MB = 1024 * 1024
+
+class SeekedCSVReader:
+    """
+    SeekedCSVReader wraps a CSV reader that was started part way through a
+    file, so that line_num still counts the lines from the start of the file.
+
+    Iterating over it iterates over the wrapped reader directly.
+    """
+
+    def __init__(self, reader: "_csv._reader", skipped_line_count: int) -> None:
+        self._reader = reader
+        self._skipped_line_count = skipped_line_count
+
+    def __iter__(self) -> "_csv._reader":
+        return self._reader
+
+    def __next__(self) -> t.List[str]:
+        return next(self._reader)
+
+    @property
+    def line_num(self) -> int:
+        return self._skipped_line_count + self._reader.line_num
+
+    @property
+    def dialect(self) -> "_csv.Dialect":
+        return self._reader.dialect
 
 
 class CSVReaderFactory:
@@ -28,25 +58,24 @@ class CSVReaderFactory:
         """
         Get the dialect of a CSV or TSV file, while being able to handle large files and files with comments.
         """
-        with open(self._file_path, newline="") as csvfile:
-            chunk_size = 1024 * 1024  # 1MB
-            sample = ""
-            while len(sample) < chunk_size:
-                line = csvfile.readline()
-                # Stop if EOF is reached
-                if not line:
-                    break
-                # Skip lines that start with '#'
-                if line.startswith("#"):
-                    continue
-                sample += line
-            dialect_t = csv.Sniffer().sniff(sample)
-            dialect = dialect_t()
-
-        return dialect
+        return get_csv_file_probe(self._file_path).dialect
+
+    def _get_row_checkpoint(self) -> t.Tuple[int, int]:
+        """
+        The offset and line index of the last line start that is known to be
+        the start of a row at or before the first unskipped row.
+        """
+        if not self._skip_n_rows:
+            return 0, 0
+        # A reader given only a delimiter uses the default dialect
+        dialect = csv.excel if self._dialect is None else self._dialect
+        line_scan = get_csv_file_probe(self._file_path).line_scan
+        return line_scan.row_checkpoint(
+            self._skip_n_rows, (dialect.quotechar, dialect.escapechar)
+        )
 
     @contextmanager
-    def get_csv_reader(self) -> t.Generator["_csv._reader", None, None]:
+    def get_csv_reader(self) -> t.Generator[SeekedCSVReader, None, None]:
         """
         Get a CSV reader for the CSV file.
 
@@ -55,6 +84,10 @@ class CSVReaderFactory:
         constructor, else the dialect-delimiter and the rest of the dialect are
         used.
 
+        The reader starts at the last checkpoint before the first unskipped row,
+        found by the binary line scan of the shared file probe, so only the
+        skipped rows after it are parsed.
+
         When the context manager is exited, the CSV file is automatically
         closed.
 
@@ -66,16 +99,18 @@ class CSVReaderFactory:
             ...     for row in reader:
             ...         print(row)
         """
-        with open(self._file_path, newline="") as csvfile:
+        offset, skipped_line_count = self._get_row_checkpoint()
+        with open_input(self._file_path, newline="") as csvfile:
+            csvfile.seek(offset)
             reader = (
                 csv.reader(csvfile, delimiter=self._delimiter)
                 if self._dialect is None
                 else csv.reader(csvfile, dialect=self._dialect)
             )
-            # Wind the reader forward by the number of rows to skip
-            for _ in range(self._skip_n_rows):
-                next(reader, None)  # Avoid StopIteration here
+            # Skip the rows between the checkpoint and the first unskipped row
+            rows_to_skip = self._skip_n_rows - skipped_line_count
+            collections.deque(itertools.islice(reader, rows_to_skip), maxlen=0)
             try:
-                yield reader
+                yield SeekedCSVReader(reader, skipped_line_count)
             finally:
                 pass
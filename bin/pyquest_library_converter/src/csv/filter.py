@@ -1,5 +1,5 @@
 import typing as t
-import itertools
+from array import array
 
 from src import constants as const
 from src import cli
@@ -8,32 +8,50 @@ from src.exceptions import NullDataError
 
 NULLS = set(const.get_null_values__all_cases())
 
+# An (id, name, sequence) row, see const._ROW_INDEX__*
+Row = t.Tuple[int, str, str]
+
 
 class NullRowSplitter:
-    def __init__(self, iterable: t.Iterable[t.Dict[str, str]]):
-        iter1, iter2 = itertools.tee(iterable)
+    """
+    NullRowSplitter partitions rows into those without null values, which are
+    yielded lazily, and those with null values, of which only the row ids are
+    kept (in a compact array) so memory use is flat regardless of row count.
+    """
+
+    def __init__(self, iterable: t.Iterable[Row]):
         self.iterable = iterable
         self.predicate = is_null_row
-        self.true_queue = filter(self.predicate, iter2)
-        self.false_queue = itertools.filterfalse(self.predicate, iter1)
+        self._null_row_ids = array("Q")
         self.finished = False
 
-    def null_rows(self) -> t.Iterable[t.Dict[str, str]]:
-        for elem in self.true_queue:
-            yield elem
-
-    def not_null_rows(self) -> t.Iterable[t.Dict[str, str]]:
-        for elem in self.false_queue:
-            yield elem
+    def null_rows(self) -> t.Sequence[int]:
+        """
+        Get the row ids of the null rows.
+
+        Only available once not_null_rows() has been exhausted.
+        """
+        if not self.finished:
+            msg = "Must exhaust 'not_null_rows()' before calling this method"
+            raise RuntimeError(msg)
+        return self._null_row_ids
+
+    def not_null_rows(self) -> t.Iterable[Row]:
+        for elem in self.iterable:
+            if self.predicate(elem):
+                self._null_row_ids.append(elem[const._ROW_INDEX__ID])
+            else:
+                yield elem
+        self.finished = True
 
     def report_null_rows(
         self,
-        null_rows: t.Iterable[t.Dict[str, str]],
+        null_row_ids: t.Iterable[int],
         raise_error: bool = True,
         start_index: int = 1,
     ) -> str:
         return report_null_rows(
-            null_rows, raise_error=raise_error, start_index=start_index
+            null_row_ids, raise_error=raise_error, start_index=start_index
         )
 
 
@@ -42,26 +60,19 @@ def filter_rows(
     name_index: int,
     sequence_index: int,
     index_offset: int = 0,
-) -> t.Iterable[t.Dict[str, str]]:
+) -> t.Iterable[Row]:
     """
     Filter rows to only include the name and sequence columns, giving rows a new 1-based index.
 
     Name and sequence columns are specified by their 1-based index in the input file.
 
-    Yield dictionaries of index, name, sequence values from each row, where keys are the new headers.
+    Yield tuples of index, name, sequence values from each row, in the order of the new headers.
     """
     name_index_0 = name_index - 1
     sequence_index_0 = sequence_index - 1
     index_start_1 = 1 + index_offset
     for idx_1, row in enumerate(rows, start=index_start_1):
-        name = row[name_index_0]
-        sequence = row[sequence_index_0]
-        dict_row = {
-            const._OUTPUT_HEADER__ID: idx_1,
-            const._OUTPUT_HEADER__NAME: name,
-            const._OUTPUT_HEADER__SEQUENCE: sequence,
-        }
-        yield dict_row
+        yield idx_1, row[name_index_0], row[sequence_index_0]
 
 
 def is_null(value: str) -> bool:
@@ -71,28 +82,23 @@ def is_null(value: str) -> bool:
     return value in NULLS
 
 
-def is_null_row(row: t.Dict[str, str]) -> bool:
+def is_null_row(row: Row) -> bool:
     """
     Returns True if any value in the row is a null value, False otherwise.
     """
-    return any(
-        is_null(value)
-        for value in [
-            row[const._OUTPUT_HEADER__NAME],
-            row[const._OUTPUT_HEADER__SEQUENCE],
-        ]
+    return (
+        row[const._ROW_INDEX__NAME] in NULLS or row[const._ROW_INDEX__SEQUENCE] in NULLS
     )
 
 
 def report_null_rows(
-    rows: t.Iterable[t.Dict[str, str]], start_index: int, raise_error: bool
+    null_row_ids: t.Iterable[int], start_index: int, raise_error: bool
 ):
     """
     Returns a string of the null rows in the format:
     """
     null_original_indices = []
-    for row in rows:
-        new_index_1_idx = int(row[const._OUTPUT_HEADER__ID])
+    for new_index_1_idx in null_row_ids:
         orginal_index_1_idx = new_index_1_idx + start_index
         null_original_indices.append(orginal_index_1_idx)
 
@@ -0,0 +1,335 @@
+import typing as t
+from array import array
+from pathlib import Path
+import bisect
+import csv
+import functools
+import itertools
+import os
+
+from src import constants as const
+from src.csv.compression import open_input
+
+_CHUNK_SIZE_1MB = 1024 * 1024
+_LINE_COUNT_BLOCK_SIZE = 4 * _CHUNK_SIZE_1MB
+# The quote and escape characters that a sniffed or default dialect can use
+_ROW_CONTINUATION_CHARS = ('"', "'", "\\")
+
+
+class FileFingerprint(t.NamedTuple):
+    """
+    Identifies a version of a file by its resolved path, size and modification time.
+    """
+
+    path: str
+    size: int
+    mtime_ns: int
+
+    @classmethod
+    def from_path(cls, file_path: t.Union[str, Path]) -> "FileFingerprint":
+        stat = os.stat(file_path)
+        return cls(
+            path=os.path.realpath(file_path),
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+        )
+
+
+class CSVFileProbe:
+    """
+    CSVFileProbe lazily computes, and then remembers, the properties of a CSV
+    file that are otherwise re-read from the head of the file by every
+    consumer: the sniffed dialect, the first tabular row index and offset, the
+    heuristic column header row index and the column count.
+
+    Use get_csv_file_probe() to share one probe per file fingerprint.
+    """
+
+    def __init__(
+        self, fingerprint: FileFingerprint, prefix: t.Optional[str] = None
+    ) -> None:
+        self.fingerprint = fingerprint
+        self._file_path = Path(fingerprint.path)
+        self._prefix = const.FILE_HEADER_LINE_PREFIX if prefix is None else prefix
+        self._has_header: t.Optional[bool] = None
+        self._has_header_error: t.Optional[csv.Error] = None
+
+    @functools.cached_property
+    def dialect(self) -> csv.Dialect:
+        """
+        Get the dialect of a CSV or TSV file, while being able to handle large files and files with comments.
+        """
+        with open_input(self._file_path, newline="") as csvfile:
+            sample = ""
+            while len(sample) < _CHUNK_SIZE_1MB:
+                line = csvfile.readline()
+                # Stop if EOF is reached
+                if not line:
+                    break
+                # Skip lines that start with '#'
+                if line.startswith("#"):
+                    continue
+                sample += line
+            dialect_t = csv.Sniffer().sniff(sample)
+            dialect = dialect_t()
+
+        return dialect
+
+    @functools.cached_property
+    def file_header_indices(self) -> t.List[int]:
+        """
+        Line indices of the file headers in the first 20 lines.
+        """
+        with open_input(self._file_path) as csv_file:
+            return _find_file_header_indices(csv_file, self._prefix, max_line=20)
+
+    @functools.cached_property
+    def first_tabular_row(self) -> t.Tuple[int, int]:
+        """
+        The 0-indexed line index and byte offset of the first line that is not a
+        file header line.
+        """
+        file_header_idxs = self.file_header_indices
+        stop_row_idx = max(file_header_idxs) + 1 if file_header_idxs else 0
+
+        current_row_idx = 0  # 0-indexed
+        with open_input(self._file_path, newline="") as csv_file:
+            while True:
+                line = csv_file.readline()
+                offset = csv_file.tell() - len(line)
+                if stop_row_idx == current_row_idx:
+                    return current_row_idx, offset
+                current_row_idx += 1
+
+    def has_header(self, suppress_csv_lib_errors: bool = False) -> bool:
+        """
+        Whether csv.Sniffer considers the first tabular row to be a column header row.
+        """
+        if self._has_header is None and self._has_header_error is None:
+            self._sniff_has_header()
+        if self._has_header_error is None:
+            return bool(self._has_header)
+        if not suppress_csv_lib_errors:
+            raise self._has_header_error
+        return False
+
+    def _sniff_has_header(self) -> None:
+        _, offset = self.first_tabular_row
+        with open_input(self._file_path, newline="") as csv_file:
+            csv_file.seek(offset)
+            # Read the first 1MB of the file
+            chunk = csv_file.read(_CHUNK_SIZE_1MB)
+            try:
+                self._has_header = csv.Sniffer().has_header(chunk)
+            except csv.Error as e:
+                self._has_header_error = e
+        return
+
+    @functools.cached_property
+    def line_scan(self) -> "LineScan":
+        """
+        The line count and row checkpoints of the file, from one binary pass.
+        """
+        return scan_lines(self._file_path, block_size=_LINE_COUNT_BLOCK_SIZE)
+
+    @functools.cached_property
+    def line_count(self) -> int:
+        """
+        The number of lines in the file, as counted by iterating over it in text mode.
+        """
+        return self.line_scan.line_count
+
+    @functools.cached_property
+    def columns_count(self) -> t.Optional[int]:
+        """
+        The number of columns in the first tabular row, using the sniffed dialect.
+
+        None if there are no tabular rows.
+        """
+        _, offset = self.first_tabular_row
+        with open_input(self._file_path, newline="") as csvfile:
+            csvfile.seek(offset)
+            for row in csv.reader(csvfile, dialect=self.dialect):
+                return len(row)
+        return None
+
+
+class LineScan(t.NamedTuple):
+    """
+    What one binary pass over a file finds: the number of lines, checkpoints
+    where a line starts, and the first offset of each character that can join
+    lines into one CSV row.
+    """
+
+    line_count: int
+    size: int
+    # The byte offset and line index of the first line start in each block
+    checkpoint_offsets: array
+    checkpoint_line_idxs: array
+    # The offset of the first of each of _ROW_CONTINUATION_CHARS, else the size
+    continuation_char_offsets: t.Dict[str, int]
+
+    def row_checkpoint(
+        self, row_idx: int, continuation_chars: t.Iterable[t.Optional[str]]
+    ) -> t.Tuple[int, int]:
+        """
+        The offset and line index of the last checkpoint at or before a 0-indexed
+        CSV row, for a reader where only continuation_chars (its quote and escape
+        characters) can join lines into one row.
+
+        Before the first of those characters every line is one row, so the line
+        index of the checkpoint is also its row index.
+        """
+        row_offset_limit = min(
+            (
+                self.continuation_char_offsets.get(char, 0)
+                for char in continuation_chars
+                if char
+            ),
+            default=self.size,
+        )
+        checkpoint_idx = (
+            min(
+                bisect.bisect_right(self.checkpoint_offsets, row_offset_limit),
+                bisect.bisect_right(self.checkpoint_line_idxs, row_idx),
+            )
+            - 1
+        )
+        return (
+            self.checkpoint_offsets[checkpoint_idx],
+            self.checkpoint_line_idxs[checkpoint_idx],
+        )
+
+
+class _LineScanner:
+    """
+    _LineScanner builds the LineScan of a file from its binary blocks, in order.
+    """
+
+    def __init__(self) -> None:
+        self._line_terminator_count = 0
+        self._size = 0
+        self._last_byte = b""
+        self._checkpoint_offsets = array("Q", [0])
+        self._checkpoint_line_idxs = array("Q", [0])
+        self._continuation_char_offsets: t.Dict[str, int] = {}
+
+    def add_block(self, buffer: bytearray, size: int) -> None:
+        if self._last_byte == b"\r" and buffer[0:1] == b"\n":
+            # A CRLF split across two blocks is a single line terminator
+            self._line_terminator_count -= 1
+        self._add_checkpoint(buffer, size)
+        self._find_continuation_chars(buffer, size)
+        self._line_terminator_count += _count_block_line_terminators(buffer, size)
+        self._size += size
+        last_byte_idx = size - 1
+        self._last_byte = bytes(buffer[last_byte_idx:size])
+
+    def _add_checkpoint(self, buffer: bytearray, size: int) -> None:
+        # Whatever the line terminators, a line starts after each LF
+        lf_idx = buffer.find(b"\n", 0, size)
+        if lf_idx == -1:
+            return
+        line_start_idx = lf_idx + 1
+        self._checkpoint_offsets.append(self._size + line_start_idx)
+        self._checkpoint_line_idxs.append(
+            self._line_terminator_count
+            + _count_block_line_terminators(buffer, line_start_idx)
+        )
+
+    def _find_continuation_chars(self, buffer: bytearray, size: int) -> None:
+        for char in _ROW_CONTINUATION_CHARS:
+            if char in self._continuation_char_offsets:
+                continue
+            char_idx = buffer.find(char.encode(), 0, size)
+            if char_idx != -1:
+                self._continuation_char_offsets[char] = self._size + char_idx
+
+    def get_line_scan(self) -> LineScan:
+        line_count = self._line_terminator_count
+        if self._last_byte and self._last_byte not in (b"\n", b"\r"):
+            # The last line has no line terminator
+            line_count += 1
+        return LineScan(
+            line_count=line_count,
+            size=self._size,
+            checkpoint_offsets=self._checkpoint_offsets,
+            checkpoint_line_idxs=self._checkpoint_line_idxs,
+            continuation_char_offsets={
+                char: self._continuation_char_offsets.get(char, self._size)
+                for char in _ROW_CONTINUATION_CHARS
+            },
+        )
+
+
+def scan_lines(
+    file_path: t.Union[str, Path], block_size: int = _LINE_COUNT_BLOCK_SIZE
+) -> LineScan:
+    """
+    Scan a file in binary blocks, without decoding it, for its line count (see
+    count_lines()) and the checkpoints to seek to when skipping rows.
+    """
+    line_scanner = _LineScanner()
+    buffer = bytearray(block_size)
+    with open_input(file_path, "rb") as file_handle:
+        while True:
+            size = file_handle.readinto(buffer)
+            if not size:
+                break
+            line_scanner.add_block(buffer, size)
+    return line_scanner.get_line_scan()
+
+
+def count_lines(
+    file_path: t.Union[str, Path], block_size: int = _LINE_COUNT_BLOCK_SIZE
+) -> int:
+    """
+    Count the lines in a file by counting line terminators in binary blocks,
+    without decoding the file.
+
+    Lines are counted as text mode would split them, where LF, CRLF and CR all end a
+    line, and a final line without a terminator still counts.
+    """
+    return scan_lines(file_path, block_size=block_size).line_count
+
+
+def _count_block_line_terminators(buffer: bytearray, size: int) -> int:
+    """
+    Count the LF, CRLF and CR line terminators in the first size bytes of the buffer.
+    """
+    lf_count = buffer.count(b"\n", 0, size)
+    # Most files have no CRs, and find() is much cheaper than count()
+    if buffer.find(b"\r", 0, size) == -1:
+        return lf_count
+    cr_count = buffer.count(b"\r", 0, size)
+    crlf_count = buffer.count(b"\r\n", 0, size)
+    return lf_count + cr_count - crlf_count
+
+
+def _find_file_header_indices(
+    csv_file: t.TextIO, prefix: str, max_line: int
+) -> t.List[int]:
+    """
+    Line indices of the lines starting with the prefix in the first max_line lines.
+    """
+    file_header_indices = []
+    for line_idx, line in enumerate(itertools.islice(csv_file, max_line)):
+        if line.startswith(prefix):
+            file_header_indices.append(line_idx)
+    return file_header_indices
+
+
+def get_csv_file_probe(
+    file_path: t.Union[str, Path], prefix: t.Optional[str] = None
+) -> CSVFileProbe:
+    """
+    Get the shared probe for the current version of a CSV file.
+    """
+    fingerprint = FileFingerprint.from_path(file_path)
+    prefix = const.FILE_HEADER_LINE_PREFIX if prefix is None else prefix
+    return _get_csv_file_probe(fingerprint, prefix)
+
+
+@functools.lru_cache(maxsize=32)
+def _get_csv_file_probe(fingerprint: FileFingerprint, prefix: str) -> CSVFileProbe:
+    return CSVFileProbe(fingerprint, prefix=prefix)
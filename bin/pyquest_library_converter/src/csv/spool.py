@@ -0,0 +1,78 @@
+import typing as t
+import csv
+import tempfile
+
+if t.TYPE_CHECKING:
+    from src.csv.filter import Row
+
+# Rows are kept in memory until the spool grows beyond this size, after which
+# they are transparently spilled to a temporary file on disk.
+_SPOOL_MAX_SIZE_64MB = 64 * 1024 * 1024
+_SPOOL_DELIMITER = "\t"
+
+
+class RowSpool:
+    """
+    RowSpool is a compact, spill-to-disk buffer of the id, name and sequence of
+    each row, so that the input file only needs to be parsed once.
+
+    Rows are appended while the input file is being scanned and are replayed,
+    in the same order and with the same values, once the scan has finished.
+
+    Usage:
+        >>> with RowSpool() as row_spool:
+        ...     for row in row_spool.spool(rows):
+        ...         scan(row)
+        ...     for row in row_spool.rows():
+        ...         write(row)
+    """
+
+    def __init__(self, max_size: int = _SPOOL_MAX_SIZE_64MB) -> None:
+        self._handle = tempfile.SpooledTemporaryFile(
+            max_size=max_size, mode="w+", newline=""
+        )
+        self._writer = csv.writer(
+            self._handle, delimiter=_SPOOL_DELIMITER, lineterminator="\n"
+        )
+        self._row_count = 0
+
+    def __enter__(self) -> "RowSpool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._row_count
+
+    def close(self) -> None:
+        self._handle.close()
+
+    def append(self, row: "Row") -> None:
+        """
+        Append a row to the end of the spool.
+        """
+        self._writer.writerow(row)
+        self._row_count += 1
+
+    def spool(self, rows: t.Iterable["Row"]) -> t.Iterable["Row"]:
+        """
+        Append each row to the spool, passing the rows through unchanged.
+        """
+        writerow = self._writer.writerow
+        for row in rows:
+            writerow(row)
+            self._row_count += 1
+            yield row
+
+    def rows(self) -> t.Iterable["Row"]:
+        """
+        Replay the spooled rows from the beginning.
+
+        Yield tuples of index, name, sequence values from each row, in the order of the new headers.
+        """
+        self._handle.flush()
+        self._handle.seek(0)
+        reader = csv.reader(self._handle, delimiter=_SPOOL_DELIMITER)
+        for row_id, name, sequence in reader:
+            yield int(row_id), name, sequence
@@ -1,26 +1,123 @@
 import typing as t
+from contextlib import contextmanager
 from pathlib import Path
 import csv
+import io
+import os
+import stat
 import sys
+import tempfile
 
 from src import constants as const
+from src.csv.compression import open_compressed_output
+from src.enums import Compression
+
+_OUTPUT_BUFFER_SIZE_1MB = 1024 * 1024
+
+
+@contextmanager
+def atomic_binary_output_file(
+    output_file: t.Union[str, Path],
+    buffering: int = _OUTPUT_BUFFER_SIZE_1MB,
+) -> t.Generator[t.BinaryIO, None, None]:
+    """
+    Open a binary handle that writes to a temporary file next to the output
+    file, which replaces the output file only once it is completely written.
+
+    The temporary file is fsynced and then moved into place with os.replace, so
+    the output file is never left partially written and is written only once.
+    It keeps the permissions of the output file it replaces, or else gets the
+    permissions of a newly created file. If an error is raised, the output file
+    is left untouched.
+    """
+    output_file = Path(output_file)
+    fd, temp_name = tempfile.mkstemp(
+        dir=output_file.parent, prefix=f".{output_file.name}.", suffix=".tmp"
+    )
+    temp_file = Path(temp_name)
+    try:
+        with open(fd, "wb", buffering=buffering) as raw:
+            yield raw
+            raw.flush()
+            # mkstemp creates the file readable and writable only by its owner
+            os.fchmod(raw.fileno(), _get_output_file_mode(output_file))
+            os.fsync(raw.fileno())
+        os.replace(temp_file, output_file)
+    except BaseException:
+        temp_file.unlink(missing_ok=True)
+        raise
+
+
+def _get_output_file_mode(output_file: Path) -> int:
+    """
+    The permission bits of the existing output file, else those that open()
+    would create it with under the current umask.
+    """
+    try:
+        return stat.S_IMODE(output_file.stat().st_mode)
+    except FileNotFoundError:
+        # The umask can only be read by setting it
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+@contextmanager
+def atomic_output_file(
+    output_file: t.Union[str, Path],
+    buffering: int = _OUTPUT_BUFFER_SIZE_1MB,
+    compression: Compression = Compression.NONE,
+    threads: int = 1,
+) -> t.Generator[t.TextIO, None, None]:
+    """
+    Open a text handle that writes atomically to the output file, see
+    atomic_binary_output_file.
+
+    The output is optionally gzip or bgzip compressed, where bgzip blocks are
+    compressed with the given number of threads.
+    """
+    with atomic_binary_output_file(output_file, buffering=buffering) as raw:
+        stream = (
+            raw
+            if compression == Compression.NONE
+            else open_compressed_output(raw, compression, threads=threads)
+        )
+        try:
+            output = io.TextIOWrapper(stream)
+            yield output
+            output.flush()
+            output.detach()
+        finally:
+            if stream is not raw:
+                # Finishes the compressed data, leaving the file open
+                stream.close()
 
 
 def write_rows(
-    dict_rows: t.Iterator[t.Dict[str, str]], headers: t.List[str], output_file: Path
+    rows: t.Iterator[t.Sequence[t.Any]],
+    headers: t.Sequence[str],
+    output_file: Path,
+    compression: Compression = Compression.NONE,
+    threads: int = 1,
+    command: t.Optional[str] = None,
 ) -> None:
     """
     Write rows to output file.
+
+    Rows are sequences of values in the same order as the headers. The output
+    starts with a comment of the command, which defaults to the command used to
+    invoke the script.
     """
-    command = get_full_command()
+    if command is None:
+        command = get_full_command()
     command_comment = f"## {command}\n"
-    with open(output_file, "w") as output:
+    with atomic_output_file(
+        output_file, compression=compression, threads=threads
+    ) as output:
         output.write(command_comment)
-        csv_writer = csv.DictWriter(
-            output, fieldnames=headers, delimiter=const._OUTPUT_DELIMITER
-        )
-        csv_writer.writeheader()
-        csv_writer.writerows(dict_rows)
+        csv_writer = csv.writer(output, delimiter=const._OUTPUT_DELIMITER)
+        csv_writer.writerow(headers)
+        csv_writer.writerows(rows)
 
 
 def get_full_command() -> str:
@@ -0,0 +1,118 @@
+import typing as t
+from collections import deque
+
+_ROOT_STATE = 0
+
+
+class AhoCorasickAutomaton:
+    """
+    AhoCorasickAutomaton matches a set of patterns at once, in time linear in
+    the length of the text rather than in the number of patterns.
+
+    The trie of the patterns is completed into a deterministic automaton, so
+    each character of the text is a single transition. Only the patterns
+    anchored at either end of a text are needed to trim primers, so matching is
+    offered for the start of a text, by walking the trie, and for the end of a
+    text, where the outputs of the final state are the patterns that are
+    suffixes of the text.
+
+    Patterns are identified by their index in the given sequence. Empty
+    patterns never match.
+
+    Usage:
+        >>> automaton = AhoCorasickAutomaton(["ACG", "CGT", "GT"])
+        >>> automaton.prefix_matches("ACGTT")
+        [0]
+        >>> automaton.suffix_matches("AACGT")
+        [1, 2]
+    """
+
+    def __init__(self, patterns: t.Sequence[str]) -> None:
+        self.patterns = tuple(patterns)
+        self.max_pattern_length = max(map(len, self.patterns), default=0)
+        # Trie edges, then extended with the failure transitions
+        self._trie_edges: t.List[t.Dict[str, int]] = [{}]
+        # Patterns spelled by the path from the root to each state
+        self._terminal_patterns: t.List[t.Tuple[int, ...]] = [()]
+        # Patterns that are suffixes of the path to each state
+        self._outputs: t.List[t.Tuple[int, ...]] = []
+        self._transitions: t.List[t.Dict[str, int]] = []
+        for pattern_index, pattern in enumerate(self.patterns):
+            if pattern:
+                self._add_pattern(pattern, pattern_index)
+        self._build_transitions()
+
+    def _add_pattern(self, pattern: str, pattern_index: int) -> None:
+        state = _ROOT_STATE
+        for char in pattern:
+            next_state = self._trie_edges[state].get(char)
+            if next_state is None:
+                next_state = len(self._trie_edges)
+                self._trie_edges[state][char] = next_state
+                self._trie_edges.append({})
+                self._terminal_patterns.append(())
+            state = next_state
+        self._terminal_patterns[state] += (pattern_index,)
+        return
+
+    def _build_transitions(self) -> None:
+        """
+        Compute the failure links breadth first, and from them the outputs and
+        the complete transitions of every state.
+        """
+        state_count = len(self._trie_edges)
+        failure = [_ROOT_STATE] * state_count
+        self._outputs = [()] * state_count
+        self._transitions = [{} for _ in range(state_count)]
+        self._transitions[_ROOT_STATE] = dict(self._trie_edges[_ROOT_STATE])
+        queue = deque(self._trie_edges[_ROOT_STATE].values())
+        for state in queue:
+            self._outputs[state] = self._terminal_patterns[state]
+        while queue:
+            state = queue.popleft()
+            fallback = self._transitions[failure[state]]
+            # Characters without a trie edge follow the failure state. Missing
+            # characters return to the root, so the root is left implicit.
+            transitions = {
+                char: next_state
+                for char, next_state in fallback.items()
+                if next_state != _ROOT_STATE
+            }
+            for char, child in self._trie_edges[state].items():
+                failure[child] = fallback.get(char, _ROOT_STATE)
+                self._outputs[child] = (
+                    self._terminal_patterns[child] + self._outputs[failure[child]]
+                )
+                transitions[char] = child
+                queue.append(child)
+            self._transitions[state] = transitions
+        return
+
+    def prefix_matches(self, text: str) -> t.List[int]:
+        """
+        The patterns that are prefixes of the text, shortest first.
+        """
+        matches: t.List[int] = []
+        trie_edges = self._trie_edges
+        terminal_patterns = self._terminal_patterns
+        state = _ROOT_STATE
+        for char in text[: self.max_pattern_length]:
+            state = trie_edges[state].get(char)
+            if state is None:
+                break
+            matches.extend(terminal_patterns[state])
+        return matches
+
+    def suffix_matches(self, text: str) -> t.List[int]:
+        """
+        The patterns that are suffixes of the text, longest first.
+        """
+        if not self.max_pattern_length:
+            return []
+        transitions = self._transitions
+        state = _ROOT_STATE
+        # A suffix match cannot start before the longest pattern
+        tail_start = max(len(text) - self.max_pattern_length, 0)
+        for char in text[tail_start:]:
+            state = transitions[state].get(char, _ROOT_STATE)
+        return list(self._outputs[state])
@@ -0,0 +1,194 @@
+import typing as t
+import operator
+
+from src.enums import MismatchModel
+
+
+class PrimerMatch(t.NamedTuple):
+    """
+    A primer matched at an end of a sequence: the number of sequence
+    characters it covers, and the number of mismatches.
+    """
+
+    length: int
+    distance: int
+
+
+class PrimerMatcher:
+    """
+    PrimerMatcher finds a primer at the start or end of a sequence, allowing up
+    to max_mismatches mismatches.
+
+    With the Hamming model, mismatches are substitutions and the primer covers
+    exactly its own length. With the edit model, mismatches are substitutions,
+    insertions and deletions, and the primer may cover a few more or fewer
+    characters. Edit distances are computed with Myers' bit-parallel algorithm,
+    in the variant for an alignment anchored at the end of the sequence, so each
+    sequence character costs a handful of integer operations whatever the
+    primer length.
+
+    Exact matches are checked first, as they are the common case.
+
+    Usage:
+        >>> matcher = PrimerMatcher("ACGTACGT", max_mismatches=1)
+        >>> matcher.match_prefix("ACGTTCGTGGG")
+        PrimerMatch(length=8, distance=1)
+    """
+
+    def __init__(
+        self,
+        primer: str,
+        max_mismatches: int,
+        model: MismatchModel = MismatchModel.HAMMING,
+    ) -> None:
+        if not primer:
+            raise ValueError("Cannot match an empty primer")
+        if max_mismatches < 0:
+            raise ValueError("The maximum number of mismatches must be >= 0")
+        self.primer = primer
+        self.max_mismatches = max_mismatches
+        self.model = model
+        self._reversed_primer = primer[::-1]
+        # Bit masks of the positions of each character in the primer, reading
+        # the primer forwards for prefixes and backwards for suffixes
+        self._prefix_masks = _get_position_masks(primer)
+        self._suffix_masks = _get_position_masks(self._reversed_primer)
+        # A primer within k edits keeps at least one of k + 1 pieces intact
+        self._prefix_pieces = _split_pieces(primer, max_mismatches + 1)
+        self._suffix_pieces = _split_pieces(self._reversed_primer, max_mismatches + 1)
+
+    def match_prefix(self, sequence: str) -> t.Optional[PrimerMatch]:
+        """
+        Match the primer at the start of the sequence, returning None if it
+        differs by more than max_mismatches.
+        """
+        if sequence.startswith(self.primer):
+            return PrimerMatch(len(self.primer), 0)
+        if not self.max_mismatches:
+            return None
+        if self.model == MismatchModel.HAMMING:
+            return self._match_hamming(sequence[: len(self.primer)], self.primer)
+        window = sequence[: len(self.primer) + self.max_mismatches]
+        return self._match_edit(window, self._prefix_masks, self._prefix_pieces)
+
+    def match_suffix(self, sequence: str) -> t.Optional[PrimerMatch]:
+        """
+        Match the primer at the end of the sequence, returning None if it
+        differs by more than max_mismatches.
+        """
+        if sequence.endswith(self.primer):
+            return PrimerMatch(len(self.primer), 0)
+        if not self.max_mismatches:
+            return None
+        if self.model == MismatchModel.HAMMING:
+            start = max(len(sequence) - len(self.primer), 0)
+            return self._match_hamming(sequence[start:], self.primer)
+        # Reversed, the end of the sequence is matched as a prefix
+        window_length = len(self.primer) + self.max_mismatches
+        window = sequence[-window_length:][::-1]
+        return self._match_edit(window, self._suffix_masks, self._suffix_pieces)
+
+    def _match_hamming(self, window: str, primer: str) -> t.Optional[PrimerMatch]:
+        if len(window) < len(primer):
+            return None
+        distance = sum(map(operator.ne, window, primer))
+        if distance > self.max_mismatches:
+            return None
+        return PrimerMatch(len(primer), distance)
+
+    def _match_edit(
+        self,
+        window: str,
+        position_masks: t.Dict[str, int],
+        pieces: t.Sequence[str],
+    ) -> t.Optional[PrimerMatch]:
+        if not any(piece in window for piece in pieces):
+            return None
+        distance, length = anchored_edit_distance(
+            window, position_masks, len(self.primer)
+        )
+        if distance > self.max_mismatches:
+            return None
+        return PrimerMatch(length, distance)
+
+
+def anchored_edit_distance(
+    text: str, position_masks: t.Dict[str, int], pattern_length: int
+) -> t.Tuple[int, int]:
+    """
+    The edit distance between a pattern and the closest prefix of the text, and
+    the length of that prefix, using Myers' bit-vector algorithm.
+
+    position_masks maps each character to the bit mask of its positions in the
+    pattern. Column j of the dynamic programming matrix is encoded as vertical
+    positive and negative deltas, Pv and Mv. As the alignment is anchored at the
+    start of the text, the top row grows by one in every column, so a 1 is
+    shifted into the horizontal positive delta. Of prefixes at the same
+    distance, the one closest in length to the pattern is chosen.
+    """
+    all_ones = (1 << pattern_length) - 1
+    last_bit_shift = pattern_length - 1
+    positive_vertical = all_ones
+    negative_vertical = 0
+    # Aligning the pattern to an empty prefix deletes all of it
+    distance = best_distance = pattern_length
+    best_length = 0
+    for length, char in enumerate(text, 1):
+        equal = position_masks.get(char, 0)
+        crossing_vertical = equal | negative_vertical
+        crossing_horizontal = (
+            ((equal & positive_vertical) + positive_vertical) ^ positive_vertical
+        ) | equal
+        positive_horizontal = negative_vertical | (
+            ~(crossing_horizontal | positive_vertical) & all_ones
+        )
+        negative_horizontal = positive_vertical & crossing_horizontal
+        # The deltas fit in pattern_length bits and are never both set, so
+        # their last bits are the change in distance
+        distance += (positive_horizontal >> last_bit_shift) - (
+            negative_horizontal >> last_bit_shift
+        )
+        positive_horizontal = ((positive_horizontal << 1) | 1) & all_ones
+        negative_horizontal = (negative_horizontal << 1) & all_ones
+        positive_vertical = negative_horizontal | (
+            ~(crossing_vertical | positive_horizontal) & all_ones
+        )
+        negative_vertical = positive_horizontal & crossing_vertical
+        if distance < best_distance or (
+            distance == best_distance
+            and abs(length - pattern_length) < abs(best_length - pattern_length)
+        ):
+            best_distance = distance
+            best_length = length
+    return best_distance, best_length
+
+
+def _get_position_masks(pattern: str) -> t.Dict[str, int]:
+    position_masks: t.Dict[str, int] = {}
+    for index, char in enumerate(pattern):
+        position_masks[char] = position_masks.get(char, 0) | (1 << index)
+    return position_masks
+
+
+def _split_pieces(pattern: str, piece_count: int) -> t.List[str]:
+    """
+    Split a pattern into piece_count pieces of near equal length, or into
+    single characters if it is too short.
+    """
+    piece_count = min(piece_count, len(pattern))
+    bounds = [len(pattern) * i // piece_count for i in range(piece_count + 1)]
+    return [pattern[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+def format_mismatch_counts(mismatch_counts: t.Dict[int, int]) -> str:
+    """
+    Format the number of primers found with each number of mismatches.
+
+    Usage:
+        >>> format_mismatch_counts({1: 5, 0: 95})
+        '0 mismatches (95), 1 mismatch (5)'
+    """
+    return ", ".join(
+        f"{distance} {'mismatch' if distance == 1 else 'mismatches'} ({count})"
+        for distance, count in sorted(mismatch_counts.items())
+    )
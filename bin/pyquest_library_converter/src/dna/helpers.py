@@ -4,6 +4,19 @@ from src.exceptions import UndevelopedFeatureError
 
 if t.TYPE_CHECKING:
     from src.report import Report
+    from src.csv.filter import Row
+    from src.dna.approximate_match import PrimerMatcher
+
+# IUPAC nucleotide codes and their complements, in both cases. Characters
+# outside of this alphabet are left as they are.
+_IUPAC_BASES = "ACGTNRYKMSWBDHV"
+_IUPAC_COMPLEMENTS = "TGCANYRMKSWVHDB"
+_REVERSE_COMPLEMENT_TABLE = str.maketrans(
+    _IUPAC_BASES + _IUPAC_BASES.lower(),
+    _IUPAC_COMPLEMENTS + _IUPAC_COMPLEMENTS.lower(),
+)
+# Joins a batch of sequences, so the batch can be complemented in one call
+_BATCH_SEPARATOR = "\n"
 
 
 def find_invalid_chars_in_dna_sequence(
@@ -44,95 +57,88 @@ def find_invalid_chars_in_string(
     return sorted(invalid_chars)
 
 
-def reverse_complement_sequences(
-    dict_rows: t.Iterator[t.Dict[str, str]],
-    header: str,
-) -> t.Iterable[t.Dict[str, str]]:
+def reverse_complement_sequences(rows: t.Iterator["Row"]) -> t.Iterable["Row"]:
     """
     Update each row to have the reverse complement of the sequence.
 
-    Header corresponds to the CSV header for the sequence column.
+    Yield tuples of index, name, sequence values from each row.
     """
-    for dict_row in dict_rows:
-        sequence = dict_row[header]
-        reversed_sequence = reverse_complement(sequence)
-        dict_row[header] = reversed_sequence
-        yield dict_row
+    for row_id, name, sequence in rows:
+        yield row_id, name, reverse_complement(sequence)
 
 
 def reverse_complement(sequence: str) -> str:
     """
     Reverse complement the sequence (DNA only).
+
+    Upper and lower case bases, N and the IUPAC ambiguity codes are complemented
+    and keep their case.
     """
-    # Make the translation map
-    trans = str.maketrans("ACGT", "TGCA")
     # Translate the sequence and reverse it
-    return sequence.translate(trans)[::-1]
+    return sequence.translate(_REVERSE_COMPLEMENT_TABLE)[::-1]
 
 
-def upper_case_sequences(
-    dict_rows: t.Iterator[t.Dict[str, str]], sequence_header: str
-) -> t.Iterable[t.Dict[str, str]]:
+def reverse_complement_batch(sequences: t.Sequence[str]) -> t.List[str]:
     """
-    Upper case the sequences.
+    Reverse complement a batch of sequences, returning them in the same order.
+
+    The batch is joined and complemented with a single translation, which is
+    much cheaper than translating the sequences one by one.
+    """
+    if not sequences:
+        return []
+    joined = _BATCH_SEPARATOR.join(sequences)
+    if joined.count(_BATCH_SEPARATOR) != len(sequences) - 1:
+        # A sequence contains the separator, so it cannot be split back apart
+        return [reverse_complement(sequence) for sequence in sequences]
+    # Reversing the joined batch reverses each sequence and the batch order
+    reversed_batch = joined.translate(_REVERSE_COMPLEMENT_TABLE)[::-1]
+    revcomp_sequences = reversed_batch.split(_BATCH_SEPARATOR)
+    revcomp_sequences.reverse()
+    return revcomp_sequences
 
-    Yield dictionaries of index, name, sequence values from each row, where keys are the new headers.
 
-    Header corresponds to the CSV header for the sequence column.
+def upper_case_sequences(rows: t.Iterator["Row"]) -> t.Iterable["Row"]:
     """
-    for dict_row in dict_rows:
-        # Upper case the sequence and update the dictionary
-        sequence = dict_row[sequence_header]
-        dict_row[sequence_header] = sequence.upper()
-        yield dict_row
+    Upper case the sequences.
+
+    Yield tuples of index, name, sequence values from each row.
+    """
+    for row_id, name, sequence in rows:
+        yield row_id, name, sequence.upper()
 
 
-def lower_case_sequences(
-    dict_rows: t.Iterator[t.Dict[str, str]], sequence_header: str
-) -> t.Iterable[t.Dict[str, str]]:
+def lower_case_sequences(rows: t.Iterator["Row"]) -> t.Iterable["Row"]:
     """
     Lower case the sequences.
 
-    Yield dictionaries of index, name, sequence values from each row, where keys are the new headers.
-
-    Header corresponds to the CSV header for the sequence column.
+    Yield tuples of index, name, sequence values from each row.
     """
-    for dict_row in dict_rows:
-        # Lower case the sequence and update the dictionary
-        sequence = dict_row[sequence_header]
-        dict_row[sequence_header] = sequence.lower()
-        yield dict_row
+    for row_id, name, sequence in rows:
+        yield row_id, name, sequence.lower()
 
 
 def trim_sequences(
-    dict_rows: t.Iterator[t.Dict[str, str]],
+    rows: t.Iterator["Row"],
     forward_primer: str,
     reverse_primer: str,
     report: "Report",
-    sequence_header: str,
-    id_header: str,
-) -> t.Iterable[t.Dict[str, str]]:
+) -> t.Iterable["Row"]:
     """
     Trim the forward and reverse primer from the sequence.
 
-    Yield dictionaries of index, name, sequence values from each row, where keys are the new headers.
-
-    Header corresponds to the CSV header for the sequence column.
+    Yield tuples of index, name, sequence values from each row.
     """
-    for dict_row in dict_rows:
-        # Trim the sequence and update the dictionary
-        sequence = dict_row[sequence_header]
+    for row_id, name, sequence in rows:
         (
             trimmed_sequence,
             has_trimmed_forward_primer,
             has_trimmed_reverse_primer,
         ) = trim_sequence(sequence, forward_primer, reverse_primer)
-        dict_row[sequence_header] = trimmed_sequence
 
         # Update the report
-        row_id = dict_row[id_header]
         report.add_row(row_id, has_trimmed_forward_primer, has_trimmed_reverse_primer)
-        yield dict_row
+        yield row_id, name, trimmed_sequence
 
 
 def trim_sequence(
@@ -149,8 +155,6 @@ def trim_sequence(
     has_trimmed_forward_primer = False
     has_trimmed_reverse_primer = False
 
-    err_msg = f"The forward and reverse primer overlap in the sequence (no handling in code yet): {forward_primer=}, {reverse_primer=}, {sequence=}"
-
     forward_primer_exists = len(forward_primer) and sequence.startswith(forward_primer)
     reverse_primer_exists = len(reverse_primer) and sequence.endswith(reverse_primer)
 
@@ -179,6 +183,7 @@ def trim_sequence(
         has_trimmed_reverse_primer = True
 
     if is_overlapping:
+        err_msg = f"The forward and reverse primer overlap in the sequence (no handling in code yet): {forward_primer=}, {reverse_primer=}, {sequence=}"
         raise UndevelopedFeatureError(err_msg)
 
     trimmed_sequence = sequence[start_index:end_index]
@@ -186,11 +191,40 @@ def trim_sequence(
     return (trimmed_sequence, has_trimmed_forward_primer, has_trimmed_reverse_primer)
 
 
-def noop_sequences(
-    dict_rows: t.Iterator[t.Dict[str, str]]
-) -> t.Iterable[t.Dict[str, str]]:
+def trim_sequence_approximate(
+    sequence: str,
+    forward_matcher: "t.Optional[PrimerMatcher]",
+    reverse_matcher: "t.Optional[PrimerMatcher]",
+) -> t.Tuple[str, t.Optional[int], t.Optional[int]]:
+    """
+    Trim the forward and reverse primer from the sequence, allowing the
+    mismatches of each primer's matcher. A missing matcher trims nothing.
+
+    Return the trimmed sequence and the number of mismatches in the forward and
+    reverse primer trimmed, or None where a primer was not trimmed.
+    """
+    forward_match = forward_matcher.match_prefix(sequence) if forward_matcher else None
+    reverse_match = reverse_matcher.match_suffix(sequence) if reverse_matcher else None
+
+    start_index = forward_match.length if forward_match else 0
+    # None is the end of the string, and works for slicing
+    end_index = len(sequence) - reverse_match.length if reverse_match else None
+
+    if end_index is not None and start_index > end_index:
+        forward_primer = forward_matcher.primer if forward_matcher else ""
+        reverse_primer = reverse_matcher.primer if reverse_matcher else ""
+        err_msg = f"The forward and reverse primer overlap in the sequence (no handling in code yet): {forward_primer=}, {reverse_primer=}, {sequence=}"
+        raise UndevelopedFeatureError(err_msg)
+
+    trimmed_sequence = sequence[start_index:end_index]
+    forward_distance = forward_match.distance if forward_match else None
+    reverse_distance = reverse_match.distance if reverse_match else None
+    return (trimmed_sequence, forward_distance, reverse_distance)
+
+
+def noop_sequences(rows: t.Iterator["Row"]) -> t.Iterable["Row"]:
     """
     Pass through the rows without changing them.
     """
-    for dict_row in dict_rows:
-        yield dict_row
+    for row in rows:
+        yield row
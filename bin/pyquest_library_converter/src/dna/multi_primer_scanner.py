@@ -0,0 +1,406 @@
+import typing as t
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+import csv
+import itertools
+
+from src.dna.aho_corasick import AhoCorasickAutomaton
+from src.dna.helpers import reverse_complement, reverse_complement_batch
+from src.enums import OligoCasing, PrimerOrientation
+from src.exceptions import ValidationError
+
+if t.TYPE_CHECKING:
+    from src.report import Report
+    from src.csv.filter import Row
+
+_PANEL_HEADER__NAME = "name"
+_PANEL_HEADER__FORWARD = "forward"
+_PANEL_HEADER__REVERSE = "reverse"
+_PANEL_HEADERS = (_PANEL_HEADER__NAME, _PANEL_HEADER__FORWARD, _PANEL_HEADER__REVERSE)
+
+# Where a primer is trimmed from, for a pair in an orientation
+_END__START = 0
+_END__END = 1
+
+# Assignment codes, alongside the pair indices
+_ASSIGNMENT__NONE = -1
+_ASSIGNMENT__AMBIGUOUS = -2
+
+_ORIENTATION_CODES = {
+    PrimerOrientation.FORWARD: 0,
+    PrimerOrientation.REVERSE: 1,
+}
+_TRANSFORM_BATCH_SIZE = 10_000
+
+
+@dataclass(frozen=True)
+class PrimerPair:
+    name: str
+    forward: str
+    reverse: str
+
+
+class PrimerAssignment(t.NamedTuple):
+    """
+    The primer pair and orientation found in an oligo, and the lengths to trim
+    from its start and end.
+
+    pair_index is None if no primer pair was found, or if the best candidate
+    pairs are tied, in which case the orientation is ambiguous.
+    """
+
+    pair_index: t.Optional[int]
+    orientation: PrimerOrientation
+    start_trim: int
+    end_trim: int
+
+
+_NO_ASSIGNMENT = PrimerAssignment(None, PrimerOrientation.NONE, 0, 0)
+
+
+def read_primer_panel(panel_file: t.Union[str, Path]) -> t.List[PrimerPair]:
+    """
+    Read a panel of primer pairs from a CSV or TSV file, with the columns name,
+    forward and reverse. Either primer of a pair may be empty.
+    """
+    with open(panel_file, newline="") as panel_handle:
+        reader = csv.DictReader(
+            panel_handle, dialect=_sniff_panel_dialect(panel_handle)
+        )
+        headers = reader.fieldnames or []
+        missing_headers = [header for header in _PANEL_HEADERS if header not in headers]
+        if missing_headers:
+            msg = f"Primer panel {str(panel_file)!r} is missing the columns: {', '.join(missing_headers)}."
+            raise ValidationError(msg)
+        primer_pairs = [_parse_primer_pair(row) for row in reader]
+    _validate_primer_pairs(primer_pairs, panel_file)
+    return primer_pairs
+
+
+def _sniff_panel_dialect(panel_handle: t.TextIO) -> t.Type[csv.Dialect]:
+    sample = panel_handle.read(4096)
+    panel_handle.seek(0)
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=",\t")
+    except csv.Error:
+        return csv.excel_tab
+
+
+def _parse_primer_pair(row: t.Dict[str, t.Optional[str]]) -> PrimerPair:
+    return PrimerPair(
+        name=(row[_PANEL_HEADER__NAME] or "").strip(),
+        forward=(row[_PANEL_HEADER__FORWARD] or "").strip().upper(),
+        reverse=(row[_PANEL_HEADER__REVERSE] or "").strip().upper(),
+    )
+
+
+def _validate_primer_pairs(
+    primer_pairs: t.List[PrimerPair], panel_file: t.Union[str, Path]
+) -> None:
+    if not primer_pairs:
+        msg = f"Primer panel {str(panel_file)!r} has no primer pairs."
+        raise ValidationError(msg)
+    _validate_primer_pair_names(primer_pairs, panel_file)
+    for primer_pair in primer_pairs:
+        if not primer_pair.forward and not primer_pair.reverse:
+            msg = f"Primer pair {primer_pair.name!r} must have a forward or reverse primer."
+            raise ValidationError(msg)
+    return
+
+
+def _validate_primer_pair_names(
+    primer_pairs: t.List[PrimerPair], panel_file: t.Union[str, Path]
+) -> None:
+    names = [primer_pair.name for primer_pair in primer_pairs]
+    if not all(names) or len(set(names)) != len(names):
+        msg = f"Primer panel {str(panel_file)!r} must give every primer pair a unique name."
+        raise ValidationError(msg)
+    return
+
+
+class MultiPrimerScanner:
+    """
+    MultiPrimerScanner finds which of a panel of primer pairs, and in which
+    orientation, each oligo carries.
+
+    A single Aho-Corasick automaton is built over every primer of the panel and
+    its reverse complement. An oligo in the forward orientation starts with the
+    forward primer and ends with the reverse primer. An oligo in the reverse
+    orientation is the reverse complement, so it starts with the reverse
+    complement of the reverse primer and ends with the reverse complement of the
+    forward primer.
+
+    The pair and orientation matching the most ends of an oligo, then the most
+    bases, is assigned. If candidates are tied, the oligo is ambiguous and is
+    only trimmed if every tied candidate trims it the same way.
+    """
+
+    def __init__(self, primer_pairs: t.Sequence[PrimerPair]) -> None:
+        self.primer_pairs = tuple(primer_pairs)
+        # The (pair index, orientation, end) roles of each distinct primer
+        roles: t.Dict[str, t.List[t.Tuple[int, PrimerOrientation, int]]] = {}
+        for pair_index, primer_pair in enumerate(self.primer_pairs):
+            forward = primer_pair.forward.upper()
+            reverse = primer_pair.reverse.upper()
+            for primer, orientation, end in [
+                (forward, PrimerOrientation.FORWARD, _END__START),
+                (reverse, PrimerOrientation.FORWARD, _END__END),
+                (reverse_complement(reverse), PrimerOrientation.REVERSE, _END__START),
+                (reverse_complement(forward), PrimerOrientation.REVERSE, _END__END),
+            ]:
+                if primer:
+                    roles.setdefault(primer, []).append((pair_index, orientation, end))
+        patterns = list(roles)
+        self._automaton = AhoCorasickAutomaton(patterns)
+        self._pattern_lengths = [len(pattern) for pattern in patterns]
+        self._start_roles = [
+            [
+                (pair, orientation)
+                for pair, orientation, end in roles[pattern]
+                if end == _END__START
+            ]
+            for pattern in patterns
+        ]
+        self._end_roles = [
+            [
+                (pair, orientation)
+                for pair, orientation, end in roles[pattern]
+                if end == _END__END
+            ]
+            for pattern in patterns
+        ]
+
+    def assign(self, oligo: str) -> PrimerAssignment:
+        """
+        Assign a primer pair and orientation to an upper case oligo.
+        """
+        starts = self._automaton.prefix_matches(oligo)
+        ends = self._automaton.suffix_matches(oligo)
+        if not starts and not ends:
+            return _NO_ASSIGNMENT
+        # Candidate (pair, orientation) -> [start trim, end trim]
+        candidates: t.Dict[t.Tuple[int, PrimerOrientation], t.List[int]] = {}
+        self._add_candidate_trims(candidates, starts, self._start_roles, _END__START)
+        self._add_candidate_trims(candidates, ends, self._end_roles, _END__END)
+        return _break_tie(_get_best_candidates(candidates, len(oligo)))
+
+    def _add_candidate_trims(
+        self,
+        candidates: t.Dict[t.Tuple[int, PrimerOrientation], t.List[int]],
+        pattern_indices: t.List[int],
+        roles: t.List[t.List[t.Tuple[int, PrimerOrientation]]],
+        end: int,
+    ) -> None:
+        """
+        Record the length of each matched primer as the trim, at the end it is
+        matched at, of every candidate it is a primer of.
+        """
+        pattern_lengths = self._pattern_lengths
+        for pattern_index in pattern_indices:
+            for candidate in roles[pattern_index]:
+                candidates.setdefault(candidate, [0, 0])[end] = pattern_lengths[
+                    pattern_index
+                ]
+        return
+
+    def get_pair_name(self, pair_index: t.Optional[int]) -> str:
+        return "" if pair_index is None else self.primer_pairs[pair_index].name
+
+
+def _get_best_candidates(
+    candidates: t.Dict[t.Tuple[int, PrimerOrientation], t.List[int]],
+    oligo_length: int,
+) -> t.List[t.Tuple[t.Tuple[int, PrimerOrientation], t.List[int]]]:
+    """
+    The candidates matching the most ends of the oligo, then the most bases, in
+    the order they were found.
+
+    Candidates whose primers overlap are left out, as they cannot both be
+    trimmed.
+    """
+    valid_candidates = [
+        (candidate, trims)
+        for candidate, trims in candidates.items()
+        if sum(trims) <= oligo_length
+    ]
+    if len(valid_candidates) <= 1:
+        return valid_candidates
+    scores = [
+        ((start_trim > 0) + (end_trim > 0), start_trim + end_trim)
+        for _, (start_trim, end_trim) in valid_candidates
+    ]
+    best_score = max(scores)
+    return [
+        valid_candidate
+        for valid_candidate, score in zip(valid_candidates, scores)
+        if score == best_score
+    ]
+
+
+def _break_tie(
+    best_candidates: t.List[t.Tuple[t.Tuple[int, PrimerOrientation], t.List[int]]]
+) -> PrimerAssignment:
+    """
+    Assign the single best candidate. Tied candidates are ambiguous, and only
+    trimmed if they all trim the oligo the same way.
+    """
+    if not best_candidates:
+        return _NO_ASSIGNMENT
+    (pair_index, orientation), (start_trim, end_trim) = best_candidates[0]
+    if len(best_candidates) == 1:
+        return PrimerAssignment(pair_index, orientation, start_trim, end_trim)
+    is_same_trim = all(trims == [start_trim, end_trim] for _, trims in best_candidates)
+    if not is_same_trim:
+        start_trim = end_trim = 0
+    return PrimerAssignment(None, PrimerOrientation.AMBIGUOUS, start_trim, end_trim)
+
+
+class MultiPrimerTransformPlan:
+    """
+    MultiPrimerTransformPlan applies the sequence operations of
+    SequenceTransformPlan, trimming each oligo by the primer pair and
+    orientation the MultiPrimerScanner assigns to it:
+
+        upper case (lower case oligos only)
+        -> assign primer pair and trim
+        -> reverse complement (if requested)
+        -> lower case (lower case oligos only)
+
+    The assignment of every row is remembered, in row order, for the summary
+    and assignments().
+
+    Usage:
+        >>> plan = MultiPrimerTransformPlan(
+        ...     scanner, reverse_complement_flag, oligo_case
+        ... )
+        >>> rows = plan.transform_rows(rows, report=report)
+    """
+
+    def __init__(
+        self,
+        scanner: MultiPrimerScanner,
+        reverse_complement_flag: bool,
+        oligo_case: OligoCasing,
+    ) -> None:
+        self.scanner = scanner
+        self.reverse_complement_flag = reverse_complement_flag
+        self.oligo_case = oligo_case
+        self._restore_lower_case = oligo_case == OligoCasing.LOWER
+        # Per row: the pair index or an assignment code, and the orientation
+        self._pair_indices = array("i")
+        self._orientation_codes = array("b")
+
+    def transform_rows(
+        self,
+        rows: t.Iterable["Row"],
+        report: "Report",
+        batch_size: int = _TRANSFORM_BATCH_SIZE,
+    ) -> t.Iterable["Row"]:
+        """
+        Transform the sequence of each row, recording the trimming in the report.
+
+        Yield tuples of index, name, sequence values from each row.
+        """
+        rows = iter(rows)
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                break
+            yield from self.transform_batch(batch, report=report)
+
+    def transform_batch(
+        self, rows: t.Sequence["Row"], report: "Report"
+    ) -> t.List["Row"]:
+        row_ids = [row_id for row_id, _, _ in rows]
+        sequences = [sequence for _, _, sequence in rows]
+        if self._restore_lower_case:
+            sequences = [sequence.upper() for sequence in sequences]
+        sequences = self._trim_batch(row_ids, sequences, report)
+        if self.reverse_complement_flag:
+            sequences = reverse_complement_batch(sequences)
+        if self._restore_lower_case:
+            sequences = [sequence.lower() for sequence in sequences]
+        return [
+            (row_id, name, sequence)
+            for (row_id, name, _), sequence in zip(rows, sequences)
+        ]
+
+    def _trim_batch(
+        self, row_ids: t.List[int], sequences: t.List[str], report: "Report"
+    ) -> t.List[str]:
+        """
+        Trim each upper case sequence by the primer pair and orientation
+        assigned to it, recording the trimming in the report.
+        """
+        assign = self.scanner.assign
+        add_row = report.add_row
+        record = self._record
+        trimmed_sequences = []
+        for row_id, sequence in zip(row_ids, sequences):
+            assignment = assign(sequence)
+            # As with a single primer pair, the primer trimmed from the start of
+            # a sequence is reported as the forward primer
+            add_row(row_id, assignment.start_trim > 0, assignment.end_trim > 0)
+            record(assignment)
+            start_index = assignment.start_trim
+            end_index = len(sequence) - assignment.end_trim
+            trimmed_sequences.append(sequence[start_index:end_index])
+        return trimmed_sequences
+
+    def _record(self, assignment: PrimerAssignment) -> None:
+        if assignment.pair_index is not None:
+            self._pair_indices.append(assignment.pair_index)
+            self._orientation_codes.append(_ORIENTATION_CODES[assignment.orientation])
+        elif assignment.orientation == PrimerOrientation.AMBIGUOUS:
+            self._pair_indices.append(_ASSIGNMENT__AMBIGUOUS)
+            self._orientation_codes.append(_ASSIGNMENT__AMBIGUOUS)
+        else:
+            self._pair_indices.append(_ASSIGNMENT__NONE)
+            self._orientation_codes.append(_ASSIGNMENT__NONE)
+        return
+
+    def assignments(self) -> t.Iterator[t.Tuple[str, PrimerOrientation]]:
+        """
+        The primer pair name and orientation assigned to each transformed row, in
+        row order. The name is empty if no single pair was assigned.
+        """
+        orientations = {
+            code: orientation for orientation, code in _ORIENTATION_CODES.items()
+        }
+        orientations[_ASSIGNMENT__AMBIGUOUS] = PrimerOrientation.AMBIGUOUS
+        orientations[_ASSIGNMENT__NONE] = PrimerOrientation.NONE
+        for pair_index, orientation_code in zip(
+            self._pair_indices, self._orientation_codes
+        ):
+            pair_name = self.scanner.get_pair_name(
+                pair_index if pair_index >= 0 else None
+            )
+            yield pair_name, orientations[orientation_code]
+
+    def summary(self) -> t.List[str]:
+        """
+        Get a summary of the primer pairs and orientations assigned.
+        """
+        total = len(self._pair_indices)
+        counts: t.Dict[t.Tuple[int, int], int] = {}
+        for key in zip(self._pair_indices, self._orientation_codes):
+            counts[key] = counts.get(key, 0) + 1
+        lines = []
+        for pair_index, primer_pair in enumerate(self.scanner.primer_pairs):
+            for orientation, code in _ORIENTATION_CODES.items():
+                count = counts.get((pair_index, code), 0)
+                lines.append(
+                    f"Primer pair {primer_pair.name!r} found in the {orientation.value} orientation in {count} of {total} sequences."
+                )
+        ambiguous_count = counts.get(
+            (_ASSIGNMENT__AMBIGUOUS, _ASSIGNMENT__AMBIGUOUS), 0
+        )
+        unassigned_count = counts.get((_ASSIGNMENT__NONE, _ASSIGNMENT__NONE), 0)
+        lines.append(
+            f"Primer pair is ambiguous in {ambiguous_count} of {total} sequences."
+        )
+        lines.append(
+            f"No primer pair found in {unassigned_count} of {total} sequences."
+        )
+        return lines
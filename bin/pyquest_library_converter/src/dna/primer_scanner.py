@@ -1,32 +1,69 @@
 import typing as t
-
+import copy
+import itertools
+import math
+import multiprocessing
+import operator
+import statistics
+
+from src.dna.approximate_match import PrimerMatcher, format_mismatch_counts
 from src.dna.helpers import (
     reverse_complement,
     find_invalid_chars_in_dna_sequence,
     find_invalid_chars_in_string,
 )
-from src.enums import OligoCasing
+from src.enums import MismatchModel, OligoCasing
 from src.exceptions import ValidationError, UndevelopedFeatureError
 
+_SCAN_CHUNK_SIZE = 10_000
+_MIN_PRIMER_SAMPLE_SIZE = 10_000
+
 
 class PrimerScanner:
     """
     PrimmerScanner is a class that scans a CSV file, using the given forward and
     reverse primers and identifies whether to use the orginal or reverse
     complement of each primer for downstream usage, e.g. trimming.
+
+    If max_mismatches is greater than 0, oligos without an exact primer at
+    either end are also counted when a primer differs from an end by up to that
+    many mismatches, counted by the mismatch_model, and the number of
+    mismatches found is recorded.
     """
 
-    def __init__(self, forward_primer: str, reverse_primer: str) -> None:
+    def __init__(
+        self,
+        forward_primer: str,
+        reverse_primer: str,
+        max_mismatches: int = 0,
+        mismatch_model: MismatchModel = MismatchModel.HAMMING,
+    ) -> None:
         self._given_forward_primer = forward_primer.upper()
         self._given_reverse_primer = reverse_primer.upper()
         self._given_forward_primer_revcomp = reverse_complement(forward_primer)
         self._given_reverse_primer_revcomp = reverse_complement(reverse_primer)
+        self._max_mismatches = max_mismatches
+        self._primer_matchers: t.Dict[str, PrimerMatcher] = (
+            {
+                primer: PrimerMatcher(primer, max_mismatches, mismatch_model)
+                for primer in (
+                    self._given_forward_primer,
+                    self._given_forward_primer_revcomp,
+                    self._given_reverse_primer,
+                    self._given_reverse_primer_revcomp,
+                )
+                if primer
+            }
+            if max_mismatches
+            else {}
+        )
         self.__init_counters()
         self._has_scanned = False
         _, allowed_chars = find_invalid_chars_in_dna_sequence(
             "", allow_n=True, allow_lower_case=True
         )
         self._allowed_chars = allowed_chars
+        self._delete_allowed_chars_table = str.maketrans("", "", "".join(allowed_chars))
 
     def __init_counter_dict(self, original: str, revcomp: str) -> t.Dict[str, int]:
         return {original: 0, revcomp: 0}
@@ -38,17 +75,28 @@ class PrimerScanner:
         self._reverse_primer_counter: t.Dict[str, int] = self.__init_counter_dict(
             self._given_reverse_primer, self._given_reverse_primer_revcomp
         )
+        # Oligos counted for each primer only when allowing mismatches, by the
+        # number of mismatches
+        self._approximate_primer_counter: t.Dict[str, t.Dict[int, int]] = {
+            primer: {} for primer in self._primer_matchers
+        }
         self._total_oligos_scanned = 0
+        self._total_oligos_primer_scanned = 0
+        self._primer_scan_confidence: t.Optional[float] = None
         self._oligo_casing_set: t.Set[OligoCasing] = set()
         self._invalid_chars_set: t.Set[str] = set()
         self._invalid_chars_found_in_initial_rows = False
 
-    def summary(self) -> t.List[str]:
+    def summary(self, include_primers: bool = True) -> t.List[str]:
         """
         Get a summary of the scanning results.
+
+        If include_primers is False, the primer search and chosen primers are
+        left out, e.g. when primers are found by another scanner.
         """
         self._assert_has_scanned()
         total = self._total_oligos_scanned
+        primer_total = self._total_oligos_primer_scanned
         forward_cnt = self._forward_primer_counter[self._given_forward_primer]
         forward_revcomp_cnt = self._forward_primer_counter[
             self._given_forward_primer_revcomp
@@ -69,12 +117,12 @@ class PrimerScanner:
             and predicted_rev_primer == self._given_reverse_primer_revcomp
         )
         search_fwd_lines = [
-            f"Forward primer found {forward_cnt} times in {total} sequences scanned.",
-            f"Forward primer reverse complement found {forward_revcomp_cnt} times in {total} sequences scanned.",
+            f"Forward primer found {forward_cnt} times in {primer_total} sequences scanned.",
+            f"Forward primer reverse complement found {forward_revcomp_cnt} times in {primer_total} sequences scanned.",
         ]
         search_rev_lines = [
-            f"Reverse primer found {reverse_cnt} times in {total} sequences scanned",
-            f"Reverse primer reverse complement found {reverse_revcomp_cnt} times in {total} sequences scanned.",
+            f"Reverse primer found {reverse_cnt} times in {primer_total} sequences scanned",
+            f"Reverse primer reverse complement found {reverse_revcomp_cnt} times in {primer_total} sequences scanned.",
         ]
         search_fwd_lines = (
             ["Forward primer search was unnecessary because it is an empty string."]
@@ -124,16 +172,54 @@ class PrimerScanner:
             original_count=reverse_cnt,
             revcomp_count=reverse_revcomp_cnt,
         )
+        mismatch_lines = (
+            [
+                self._summary_primer_mismatches(
+                    predicted_fwd_primer, "forward", self._forward_primer_counter
+                ),
+                self._summary_primer_mismatches(
+                    predicted_rev_primer, "reverse", self._reverse_primer_counter
+                ),
+            ]
+            if self._max_mismatches
+            else []
+        )
+        search_stopped_lines = (
+            [
+                f"Primer search stopped early after {primer_total} of {total} sequences, "
+                f"at {self._primer_scan_confidence:.1%} confidence."
+            ]
+            if primer_total < total
+            else []
+        )
+        if not include_primers:
+            return (
+                [f"Total sequences processed: {total}"]
+                + oligo_caseing_lines
+                + oligo_invalid_char_lines
+            )
         lines = (
             [f"Total sequences processed: {total}"]
             + oligo_caseing_lines
             + oligo_invalid_char_lines
             + search_fwd_lines
             + search_rev_lines
+            + search_stopped_lines
             + [chosen_fwd_line, chosen_rev_line]
+            + [line for line in mismatch_lines if line]
         )
         return lines
 
+    def _summary_primer_mismatches(
+        self, predicted_primer: str, primer_name: str, counter: t.Dict[str, int]
+    ) -> str:
+        if not predicted_primer:
+            return ""
+        approximate_counts = self._approximate_primer_counter[predicted_primer]
+        exact_count = counter[predicted_primer] - sum(approximate_counts.values())
+        mismatch_counts = {0: exact_count, **approximate_counts}
+        return f"Chosen {primer_name} primer found with {format_mismatch_counts(mismatch_counts)}."
+
     def _summary_chosen_primer(
         self,
         predicted_primer: str,
@@ -155,19 +241,142 @@ class PrimerScanner:
             raise NotImplementedError("Unhandled case - please report this as a bug")
         return chosen_line + f": {predicted_primer!r}."
 
-    def scan_all(self, oligos: t.List[str]) -> None:
+    def scan_all(
+        self,
+        oligos: t.Iterable[str],
+        chunk_size: int = _SCAN_CHUNK_SIZE,
+        processes: int = 1,
+        confidence: t.Optional[float] = None,
+        min_sample_size: int = _MIN_PRIMER_SAMPLE_SIZE,
+    ) -> None:
         """
         Scan all oligos and count the number of times the given forward and reverse primers or their respective reverse complements are found.
+
+        Oligos are scanned in chunks of chunk_size, which gives the same result
+        as scanning each oligo in turn but is considerably faster. If processes
+        is greater than 1, chunks are scanned in a pool of that many processes
+        and the partial results merged in order.
+
+        If confidence is given (e.g. 0.999), primers are no longer counted once
+        at least min_sample_size oligos have been scanned and the Wilson score
+        interval, at that confidence, of the original vs reverse complement
+        ratio excludes 0.5 for both primers. The remaining oligos are still
+        checked for casing, invalid characters and unsupported primers.
         """
         self.__init_counters()
-        for idx_0, oligo in enumerate(oligos):
-            self._scan(oligo, idx_0)
-            self._total_oligos_scanned += 1
+        self._primer_scan_confidence = confidence
+        z_score = (
+            statistics.NormalDist().inv_cdf(1 - (1 - confidence) / 2)
+            if confidence is not None
+            else None
+        )
+        indexed_chunks = _iter_indexed_chunks(oligos, chunk_size)
+        if processes > 1:
+            self._scan_chunks_pooled(
+                indexed_chunks, processes, z_score, min_sample_size
+            )
+        else:
+            self._scan_chunks_serial(indexed_chunks, z_score, min_sample_size)
         if self._total_oligos_scanned == 0:
             raise ValueError("No oligos given to scan")
         self._has_scanned = self._total_oligos_scanned > 0
         return
 
+    def _scan_chunks_pooled(
+        self,
+        indexed_chunks: t.Iterable[t.Tuple[int, t.List[str]]],
+        processes: int,
+        z_score: t.Optional[float],
+        min_sample_size: int,
+    ) -> None:
+        with multiprocessing.Pool(processes) as pool:
+            for partial_scanner in pool.imap(self._scan_indexed_chunk, indexed_chunks):
+                include_primers = not self._is_primer_prediction_confident(
+                    z_score, min_sample_size
+                )
+                self._merge(partial_scanner, include_primers=include_primers)
+        return
+
+    def _scan_chunks_serial(
+        self,
+        indexed_chunks: t.Iterable[t.Tuple[int, t.List[str]]],
+        z_score: t.Optional[float],
+        min_sample_size: int,
+    ) -> None:
+        for start_index, chunk in indexed_chunks:
+            scan_primers = not self._is_primer_prediction_confident(
+                z_score, min_sample_size
+            )
+            self._scan_chunk(chunk, start_index, scan_primers=scan_primers)
+            self._total_oligos_scanned += len(chunk)
+        return
+
+    def _scan_indexed_chunk(
+        self, indexed_chunk: t.Tuple[int, t.List[str]]
+    ) -> "PrimerScanner":
+        """
+        Scan a chunk into a new scanner, so it can be merged with _merge().
+        """
+        start_index, chunk = indexed_chunk
+        partial_scanner = copy.copy(self)
+        partial_scanner.__init_counters()
+        partial_scanner._scan_chunk(chunk, start_index)
+        partial_scanner._total_oligos_scanned += len(chunk)
+        return partial_scanner
+
+    def _merge(self, other: "PrimerScanner", include_primers: bool = True) -> None:
+        if include_primers:
+            self._merge_primer_counts(other)
+        self._total_oligos_scanned += other._total_oligos_scanned
+        self._oligo_casing_set.update(other._oligo_casing_set)
+        self._invalid_chars_set.update(other._invalid_chars_set)
+        self._invalid_chars_found_in_initial_rows = (
+            self._invalid_chars_found_in_initial_rows
+            or other._invalid_chars_found_in_initial_rows
+        )
+        return
+
+    def _merge_primer_counts(self, other: "PrimerScanner") -> None:
+        for counter, other_counter in [
+            (self._forward_primer_counter, other._forward_primer_counter),
+            (self._reverse_primer_counter, other._reverse_primer_counter),
+        ]:
+            for primer, count in other_counter.items():
+                counter[primer] += count
+        self._merge_approximate_primer_counts(other)
+        self._total_oligos_primer_scanned += other._total_oligos_primer_scanned
+        return
+
+    def _merge_approximate_primer_counts(self, other: "PrimerScanner") -> None:
+        for primer, mismatch_counts in other._approximate_primer_counter.items():
+            approximate_counts = self._approximate_primer_counter[primer]
+            for mismatches, count in mismatch_counts.items():
+                approximate_counts[mismatches] = (
+                    approximate_counts.get(mismatches, 0) + count
+                )
+        return
+
+    def _is_primer_prediction_confident(
+        self, z_score: t.Optional[float], min_sample_size: int
+    ) -> bool:
+        if z_score is None or self._total_oligos_primer_scanned < min_sample_size:
+            return False
+        return all(
+            _is_ratio_confident(original, revcomp, counter, z_score)
+            for original, revcomp, counter in [
+                (
+                    self._given_forward_primer,
+                    self._given_forward_primer_revcomp,
+                    self._forward_primer_counter,
+                ),
+                (
+                    self._given_reverse_primer,
+                    self._given_reverse_primer_revcomp,
+                    self._reverse_primer_counter,
+                ),
+            ]
+        )
+
     def _forward_primer_ratio(self) -> float:
         self._assert_has_scanned()
         total = sum(self._forward_primer_counter.values())
@@ -274,27 +483,182 @@ class PrimerScanner:
             primer = original if ratio > 0.5 else revcomp
         return primer
 
-    def _scan(self, oligo: str, index: int) -> None:
-        self._count_oligo_casing(oligo)
-        self._count_invalid_chars(oligo, index)
+    def _scan_chunk(
+        self, oligos: t.List[str], start_index: int, scan_primers: bool = True
+    ) -> None:
+        """
+        Scan a chunk of oligos. If scan_primers is False, the primers are no
+        longer counted, though an oligo with a primer in a way that is not
+        supported still raises an error.
+        """
+        self._count_oligo_casing_chunk(oligos)
+        self._count_invalid_chars_chunk(oligos, start_index)
+
+        # Matching is only possible if the primers and the oligos are all upper cased.
+        clean_oligos = list(map(str.upper, oligos))
+        if not scan_primers:
+            self._check_primer_pairs_chunk(clean_oligos)
+            return
+        primer_counts = self._count_primer_pairs_chunk(clean_oligos)
+        self._total_oligos_primer_scanned += len(oligos)
+        for (original, revcomp, counter), (original_cnt, revcomp_cnt) in zip(
+            self._get_primer_pairs(), primer_counts
+        ):
+            counter[original] += original_cnt
+            counter[revcomp] += revcomp_cnt
+        self._count_approximate_primers_chunk(clean_oligos)
+        return
 
-        forward_primer_tup = (
-            self._given_forward_primer,
-            self._given_forward_primer_revcomp,
-            self._forward_primer_counter,
-        )
-        reverse_primer_tup = (
-            self._given_reverse_primer,
-            self._given_reverse_primer_revcomp,
-            self._reverse_primer_counter,
+    def _count_primer_pairs_chunk(
+        self, clean_oligos: t.List[str]
+    ) -> t.List[t.Tuple[int, int]]:
+        """
+        Count the oligos with the original or revcomp of each primer at either
+        end, raising an error for any oligo with a primer in a way that is not
+        supported.
+        """
+        # Primers never contain a newline, so they cannot match across oligos
+        joined_oligos = "\n".join(clean_oligos)
+        primer_counts = [
+            self._count_primers_chunk(clean_oligos, joined_oligos, original, revcomp)
+            for original, revcomp, _ in self._get_primer_pairs()
+        ]
+        if None in primer_counts:
+            # The chunk contains an unsupported oligo, so find the primers of each
+            # oligo in turn to raise the same error, for the same oligo, as a
+            # per-oligo scan.
+            self._find_primers_per_oligo(clean_oligos)
+            raise NotImplementedError("Unhandled case - please report this as a bug")
+        return primer_counts
+
+    def _check_primer_pairs_chunk(self, clean_oligos: t.List[str]) -> None:
+        """
+        Raise an error for any oligo with a primer in a way that is not
+        supported, as _count_primer_pairs_chunk() does, without counting the
+        primers. A cheap check clears most chunks, and the others are counted.
+        """
+        joined_oligos = "\n".join(clean_oligos)
+        is_supported = all(
+            _is_primer_pair_supported_chunk(
+                clean_oligos, joined_oligos, original, revcomp
+            )
+            for original, revcomp, _ in self._get_primer_pairs()
         )
-        for original, revcomp, counter in [
-            forward_primer_tup,
-            reverse_primer_tup,
-        ]:
-            self._count_primers(oligo, original, revcomp, counter)
+        if not is_supported:
+            self._count_primer_pairs_chunk(clean_oligos)
+        return
+
+    def _find_primers_per_oligo(self, clean_oligos: t.List[str]) -> None:
+        for clean_oligo in clean_oligos:
+            for original, revcomp, _ in self._get_primer_pairs():
+                if original or revcomp:
+                    self._find_primers(clean_oligo, original, revcomp)
         return
 
+    def _get_primer_pairs(self) -> t.List[t.Tuple[str, str, t.Dict[str, int]]]:
+        """
+        The original, revcomp and counter of the forward and reverse primers.
+        """
+        return [
+            (
+                self._given_forward_primer,
+                self._given_forward_primer_revcomp,
+                self._forward_primer_counter,
+            ),
+            (
+                self._given_reverse_primer,
+                self._given_reverse_primer_revcomp,
+                self._reverse_primer_counter,
+            ),
+        ]
+
+    def _count_approximate_primers_chunk(self, clean_oligos: t.List[str]) -> None:
+        """
+        Count the oligos without the original or revcomp primer at either end
+        that have either within the allowed mismatches, choosing the primer
+        with fewer mismatches (or both, if tied).
+        """
+        if not self._max_mismatches:
+            return
+        for original, revcomp, counter in self._get_primer_pairs():
+            if original == "" and revcomp == "":
+                continue
+            self._count_approximate_primer_pair_chunk(
+                clean_oligos, original, revcomp, counter
+            )
+        return
+
+    def _count_approximate_primer_pair_chunk(
+        self,
+        clean_oligos: t.List[str],
+        original: str,
+        revcomp: str,
+        counter: t.Dict[str, int],
+    ) -> None:
+        primer_matchers = {
+            original: self._primer_matchers[original],
+            revcomp: self._primer_matchers[revcomp],
+        }
+        primer_ends = (original, revcomp)
+        for oligo in clean_oligos:
+            if oligo.startswith(primer_ends) or oligo.endswith(primer_ends):
+                # Already counted as an exact match
+                continue
+            least_mismatches, primers = _find_least_mismatched_primers(
+                primer_matchers, oligo
+            )
+            for primer in primers:
+                counter[primer] += 1
+                approximate_counts = self._approximate_primer_counter[primer]
+                approximate_counts[least_mismatches] = (
+                    approximate_counts.get(least_mismatches, 0) + 1
+                )
+        return
+
+    def _count_oligo_casing_chunk(self, oligos: t.List[str]) -> None:
+        if all(map(str.isupper, oligos)):
+            self._oligo_casing_set.add(OligoCasing.UPPER)
+        elif all(map(str.islower, oligos)):
+            self._oligo_casing_set.add(OligoCasing.LOWER)
+        else:
+            for oligo in oligos:
+                self._count_oligo_casing(oligo)
+        return
+
+    def _count_invalid_chars_chunk(self, oligos: t.List[str], start_index: int) -> None:
+        # Deleting every allowed character leaves only the invalid characters
+        invalid_chars = "".join(oligos).translate(self._delete_allowed_chars_table)
+        if not invalid_chars:
+            return
+        self._invalid_chars_set.update(invalid_chars)
+        initial_oligos = oligos[: max(5 - start_index, 0)]
+        for idx_0, oligo in enumerate(initial_oligos, start_index):
+            self._count_invalid_chars(oligo, idx_0)
+        return
+
+    def _count_primers_chunk(
+        self, clean_oligos: t.List[str], joined_oligos: str, original: str, revcomp: str
+    ) -> t.Optional[t.Tuple[int, int]]:
+        """
+        Count the oligos with the original or revcomp primer at either end.
+
+        Returns None if any oligo contains a primer in a way that is not
+        supported, see _find_primers for the per-oligo equivalent.
+        """
+        if original == "" and revcomp == "":
+            return len(clean_oligos), len(clean_oligos)
+
+        original_counts = _count_primer_chunk(clean_oligos, joined_oligos, original)
+        revcomp_counts = _count_primer_chunk(clean_oligos, joined_oligos, revcomp)
+        if _has_unsupported_primers_chunk(
+            clean_oligos, original, revcomp, original_counts, revcomp_counts
+        ):
+            return None
+
+        original_cnt, _ = original_counts
+        revcomp_cnt, _ = revcomp_counts
+        return original_cnt, revcomp_cnt
+
     def _count_oligo_casing(self, oligo: str) -> None:
         is_upper_case = oligo.isupper()
         is_lower_case = oligo.islower()
@@ -314,17 +678,6 @@ class PrimerScanner:
         self._invalid_chars_set.update(invalid_chars)
         return
 
-    def _count_primers(
-        self, oligo: str, original: str, revcomp: str, counter: t.Dict[str, int]
-    ) -> None:
-        if original == "" and revcomp == "":
-            has_original = has_revcomp = True
-        else:
-            (has_original, has_revcomp) = self._find_primers(oligo, original, revcomp)
-        counter[original] += 1 if has_original else 0
-        counter[revcomp] += 1 if has_revcomp else 0
-        return
-
     def _find_primers(
         self, oligo: str, original: str, revcomp: str
     ) -> t.Tuple[bool, bool]:
@@ -363,3 +716,167 @@ class PrimerScanner:
         if not self._has_scanned:
             msg = "Must call 'scan_all()' before calling this method or property"
             raise RuntimeError(msg)
+
+
+def _find_least_mismatched_primers(
+    primer_matchers: t.Dict[str, PrimerMatcher], oligo: str
+) -> t.Tuple[int, t.List[str]]:
+    """
+    The fewest mismatches of any of the primers at either end of the oligo,
+    and the primers found with them, or no primers if none are found.
+    """
+    mismatches = {
+        primer: _get_least_mismatches(matcher, oligo)
+        for primer, matcher in primer_matchers.items()
+    }
+    found = [value for value in mismatches.values() if value is not None]
+    if not found:
+        return 0, []
+    least_mismatches = min(found)
+    primers = [
+        primer
+        for primer, primer_mismatches in mismatches.items()
+        if primer_mismatches == least_mismatches
+    ]
+    return least_mismatches, primers
+
+
+def _get_least_mismatches(matcher: PrimerMatcher, oligo: str) -> t.Optional[int]:
+    """
+    The fewest mismatches of the primer at either end of the oligo, or None if
+    it is at neither end.
+    """
+    mismatches = [
+        match.distance
+        for match in (matcher.match_prefix(oligo), matcher.match_suffix(oligo))
+        if match is not None
+    ]
+    return min(mismatches, default=None)
+
+
+def _count_primer_chunk(
+    clean_oligos: t.List[str], joined_oligos: str, primer: str
+) -> t.Tuple[int, int]:
+    """
+    Count the oligos with the primer at either end, and the oligos containing it.
+    """
+    if primer not in joined_oligos:
+        return 0, 0
+    primers = itertools.repeat(primer)
+    has_primer_at_either_end = map(
+        operator.or_,
+        map(str.startswith, clean_oligos, primers),
+        map(str.endswith, clean_oligos, primers),
+    )
+    at_either_end_cnt = sum(has_primer_at_either_end)
+    contains_cnt = sum(map(operator.contains, clean_oligos, primers))
+    return at_either_end_cnt, contains_cnt
+
+
+def _has_unsupported_primers_chunk(
+    clean_oligos: t.List[str],
+    original: str,
+    revcomp: str,
+    original_counts: t.Tuple[int, int],
+    revcomp_counts: t.Tuple[int, int],
+) -> bool:
+    """
+    Whether any oligo contains a primer in a way that is not supported, given
+    the counts of _count_primer_chunk for the original and revcomp primers.
+    """
+    original_at_either_end_cnt, contains_original_cnt = original_counts
+    revcomp_at_either_end_cnt, contains_revcomp_cnt = revcomp_counts
+
+    # Edge case 1: a primer is found but not at either end of an oligo
+    if (
+        contains_original_cnt != original_at_either_end_cnt
+        or contains_revcomp_cnt != revcomp_at_either_end_cnt
+    ):
+        return True
+
+    # Edge case 2: the original and revcomp are found in the same oligo
+    if not (contains_original_cnt and contains_revcomp_cnt):
+        return False
+    contains_original_and_revcomp = map(
+        operator.and_,
+        map(operator.contains, clean_oligos, itertools.repeat(original)),
+        map(operator.contains, clean_oligos, itertools.repeat(revcomp)),
+    )
+    return any(contains_original_and_revcomp)
+
+
+def _is_primer_pair_supported_chunk(
+    clean_oligos: t.List[str], joined_oligos: str, original: str, revcomp: str
+) -> bool:
+    """
+    A cheaper check than _has_unsupported_primers_chunk(), passing a chunk
+    where neither the original nor the revcomp primer is found, or where one
+    of them is at the same end of every oligo and the other is not found. It
+    can reject a supported chunk, but never accepts an unsupported one.
+    """
+    found_primers = [
+        primer for primer in (original, revcomp) if primer and primer in joined_oligos
+    ]
+    if not found_primers:
+        return True
+    if len(found_primers) > 1:
+        return False
+    primers = itertools.repeat(found_primers[0])
+    return all(map(str.startswith, clean_oligos, primers)) or all(
+        map(str.endswith, clean_oligos, primers)
+    )
+
+
+def _iter_indexed_chunks(
+    items: t.Iterable[str], chunk_size: int
+) -> t.Iterable[t.Tuple[int, t.List[str]]]:
+    """
+    Yield lists of up to chunk_size items, each with the 0-based index of its first item.
+    """
+    items_iter = iter(items)
+    start_index = 0
+    while True:
+        chunk = list(itertools.islice(items_iter, chunk_size))
+        if not chunk:
+            break
+        yield start_index, chunk
+        start_index += len(chunk)
+
+
+def _is_ratio_confident(
+    original: str, revcomp: str, counter: t.Dict[str, int], z_score: float
+) -> bool:
+    """
+    Whether the original vs revcomp ratio is confidently above or below 0.5.
+    """
+    if original == "" and revcomp == "":
+        # Nothing to predict for an empty primer
+        return True
+    if original == revcomp:
+        return False
+    original_cnt = counter[original]
+    total = original_cnt + counter[revcomp]
+    if total == 0:
+        return False
+    lower, upper = _wilson_score_interval(original_cnt, total, z_score)
+    return lower > 0.5 or upper < 0.5
+
+
+def _wilson_score_interval(
+    successes: int, total: int, z_score: float
+) -> t.Tuple[float, float]:
+    """
+    Wilson score interval for a binomial proportion.
+    """
+    proportion = successes / total
+    z_squared = z_score**2
+    denominator = 1 + z_squared / total
+    centre = (proportion + z_squared / (2 * total)) / denominator
+    margin = (
+        z_score
+        * math.sqrt(
+            proportion * (1 - proportion) / total + z_squared / (4 * total**2)
+        )
+        / denominator
+    )
+    return centre - margin, centre + margin
@@ -0,0 +1,166 @@
+import typing as t
+import itertools
+
+from src.dna.approximate_match import PrimerMatcher
+from src.dna.helpers import (
+    reverse_complement_batch,
+    trim_sequence,
+    trim_sequence_approximate,
+)
+from src.enums import MismatchModel, OligoCasing
+
+if t.TYPE_CHECKING:
+    from src.report import Report
+    from src.csv.filter import Row
+
+_TRANSFORM_BATCH_SIZE = 10_000
+
+
+class SequenceTransformPlan:
+    """
+    SequenceTransformPlan applies every sequence operation the converter needs,
+    in the same order as the individual helpers, in a single pass per sequence:
+
+        upper case (lower case oligos only)
+        -> trim primers
+        -> reverse complement (if requested)
+        -> lower case (lower case oligos only)
+
+    The plan is built once, from the predicted primers, the reverse complement
+    flag and the oligo casing, so no per-row decisions are made.
+
+    If max_mismatches is greater than 0, primers are trimmed when they differ
+    from the sequence by up to that many mismatches, counted by the
+    mismatch_model, and the mismatches of each trimmed primer are recorded in
+    the report.
+
+    Usage:
+        >>> plan = SequenceTransformPlan(
+        ...     forward_primer, reverse_primer, reverse_complement_flag, oligo_case
+        ... )
+        >>> rows = plan.transform_rows(rows, report=report)
+    """
+
+    def __init__(
+        self,
+        forward_primer: str,
+        reverse_primer: str,
+        reverse_complement_flag: bool,
+        oligo_case: OligoCasing,
+        max_mismatches: int = 0,
+        mismatch_model: MismatchModel = MismatchModel.HAMMING,
+    ) -> None:
+        self.forward_primer = forward_primer
+        self.reverse_primer = reverse_primer
+        self.reverse_complement_flag = reverse_complement_flag
+        self.oligo_case = oligo_case
+        self.max_mismatches = max_mismatches
+        self._restore_lower_case = oligo_case == OligoCasing.LOWER
+        self._forward_matcher = self._get_matcher(
+            forward_primer, max_mismatches, mismatch_model
+        )
+        self._reverse_matcher = self._get_matcher(
+            reverse_primer, max_mismatches, mismatch_model
+        )
+
+    @staticmethod
+    def _get_matcher(
+        primer: str, max_mismatches: int, mismatch_model: MismatchModel
+    ) -> t.Optional[PrimerMatcher]:
+        if not primer or not max_mismatches:
+            return None
+        return PrimerMatcher(primer, max_mismatches, mismatch_model)
+
+    def _trim(self, sequence: str, row_id: int, report: "Report") -> str:
+        """
+        Trim the primers allowing mismatches, recording the trimming in the report.
+        """
+        (
+            sequence,
+            forward_mismatches,
+            reverse_mismatches,
+        ) = trim_sequence_approximate(
+            sequence, self._forward_matcher, self._reverse_matcher
+        )
+        report.add_row(
+            row_id, forward_mismatches is not None, reverse_mismatches is not None
+        )
+        report.add_primer_mismatches(forward_mismatches, reverse_mismatches)
+        return sequence
+
+    def _trim_batch(
+        self, row_ids: t.List[int], sequences: t.List[str], report: "Report"
+    ) -> t.List[str]:
+        """
+        Trim the primers of a batch of sequences allowing mismatches, recording
+        the trimming in the report.
+        """
+        trim = self._trim
+        return [
+            trim(sequence, row_id, report)
+            for row_id, sequence in zip(row_ids, sequences)
+        ]
+
+    def _trim_exact_batch(
+        self, row_ids: t.List[int], sequences: t.List[str], report: "Report"
+    ) -> t.List[str]:
+        """
+        Trim the exact primers of a batch of sequences, recording the trimming in
+        the report.
+        """
+        forward_primer = self.forward_primer
+        reverse_primer = self.reverse_primer
+        add_row = report.add_row
+        trimmed_sequences = []
+        for row_id, sequence in zip(row_ids, sequences):
+            (
+                sequence,
+                has_trimmed_forward_primer,
+                has_trimmed_reverse_primer,
+            ) = trim_sequence(sequence, forward_primer, reverse_primer)
+            add_row(row_id, has_trimmed_forward_primer, has_trimmed_reverse_primer)
+            trimmed_sequences.append(sequence)
+        return trimmed_sequences
+
+    def transform_rows(
+        self,
+        rows: t.Iterable["Row"],
+        report: "Report",
+        batch_size: int = _TRANSFORM_BATCH_SIZE,
+    ) -> t.Iterable["Row"]:
+        """
+        Transform the sequence of each row, recording the trimming in the report.
+
+        Rows are transformed in batches of batch_size.
+
+        Yield tuples of index, name, sequence values from each row.
+        """
+        rows = iter(rows)
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                break
+            yield from self.transform_batch(batch, report=report)
+
+    def transform_batch(
+        self, rows: t.Sequence["Row"], report: "Report"
+    ) -> t.List["Row"]:
+        """
+        Transform the sequences of a batch of rows, recording the trimming in the report.
+
+        Return tuples of index, name, sequence values, in the same order as the batch.
+        """
+        row_ids = [row_id for row_id, _, _ in rows]
+        sequences = [sequence for _, _, sequence in rows]
+        if self._restore_lower_case:
+            sequences = [sequence.upper() for sequence in sequences]
+        trim_batch = self._trim_batch if self.max_mismatches else self._trim_exact_batch
+        sequences = trim_batch(row_ids, sequences, report)
+        if self.reverse_complement_flag:
+            sequences = reverse_complement_batch(sequences)
+        if self._restore_lower_case:
+            sequences = [sequence.lower() for sequence in sequences]
+        return [
+            (row_id, name, sequence)
+            for (row_id, name, _), sequence in zip(rows, sequences)
+        ]
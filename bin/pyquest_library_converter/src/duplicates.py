@@ -0,0 +1,319 @@
+import typing as t
+from array import array
+import math
+import operator
+import struct
+import tempfile
+
+from src.enums import DuplicateKind
+from src.oligo_index import hash_sequence
+
+if t.TYPE_CHECKING:
+    from src.csv.filter import Row
+
+# Sequences are spilled to partitions by hash, and each partition is resolved
+# on its own, so memory is bounded by the size of a partition rather than of
+# the library. Partitions are kept in memory while they all fit in the spool
+# budget, and are spilled to temporary files beyond it.
+_ROWS_PER_PARTITION = 100_000
+_PARTITIONS_SPOOL_BUDGET_32MB = 32 * 1024 * 1024
+_PARTITION_BUFFER_SIZE = 64 * 1024
+# Seeds shared by more sequences than this are not compared pairwise
+MAX_SEED_GROUP_SIZE = 1_000
+# Seed hash, row id, segment index and sequence length, then the sequence
+_SEED_RECORD_HEADER = struct.Struct("<QQII")
+# Row id, segment index and sequence
+_SeedRecord = t.Tuple[int, int, bytes]
+
+
+class Duplicate(t.NamedTuple):
+    """
+    Rows with the same sequence (exact), or a pair of rows with sequences of
+    the same length within the allowed mismatches (near).
+    """
+
+    kind: DuplicateKind
+    mismatches: int
+    row_ids: t.Tuple[int, ...]
+
+
+class _PartitionWriter:
+    """
+    Buffered writes to a set of spill-to-disk partitions.
+    """
+
+    def __init__(self, partition_count: int) -> None:
+        max_size = _PARTITIONS_SPOOL_BUDGET_32MB // partition_count
+        self._partitions = [
+            tempfile.SpooledTemporaryFile(max_size=max_size)
+            for _ in range(partition_count)
+        ]
+        self._buffers = [bytearray() for _ in range(partition_count)]
+
+    def write(self, partition: int, data: bytes) -> None:
+        buffer = self._buffers[partition]
+        buffer += data
+        if len(buffer) >= _PARTITION_BUFFER_SIZE:
+            self._partitions[partition].write(buffer)
+            buffer.clear()
+        return
+
+    def read_partitions(self) -> t.Iterator[bytes]:
+        """
+        Yield the contents of each partition, closing it once read.
+        """
+        for partition, buffer in zip(self._partitions, self._buffers):
+            partition.write(buffer)
+            buffer.clear()
+            partition.seek(0)
+            data = partition.read()
+            partition.close()
+            yield data
+
+    def close(self) -> None:
+        for partition in self._partitions:
+            partition.close()
+
+
+class DuplicateDetector:
+    """
+    DuplicateDetector finds rows whose sequences collide, in the same pass as
+    the rows are written, with memory bounded for large libraries.
+
+    Exact duplicates are found by the 8 byte BLAKE2b digest of each sequence.
+    If max_mismatches is greater than 0, pairs of sequences of the same length
+    within that many mismatches (Hamming distance) are also found, with a seed
+    index: each sequence is split into max_mismatches + 1 segments, of which at
+    least one is shared exactly by any sequence within max_mismatches, so only
+    sequences sharing a segment are compared. A pair is only reported by the
+    first segment it shares. Seeds shared by more than MAX_SEED_GROUP_SIZE
+    sequences are not compared, and are counted in the summary.
+
+    The digests and seeds are spilled to partitions, by hash, sized from the
+    expected row count, and each partition is resolved on its own.
+
+    Usage:
+        >>> duplicate_detector = DuplicateDetector(max_mismatches=1)
+        >>> rows = duplicate_detector.add_rows(rows)
+        >>> write_rows(rows, ...)
+        >>> for duplicate in duplicate_detector.iter_duplicates():
+        ...     print(duplicate)
+    """
+
+    def __init__(self, max_mismatches: int = 0, expected_row_count: int = 0) -> None:
+        if max_mismatches < 0:
+            raise ValueError("The maximum number of mismatches must be >= 0")
+        self.max_mismatches = max_mismatches
+        self._partition_count = max(
+            1, math.ceil(expected_row_count / _ROWS_PER_PARTITION)
+        )
+        self._hash_partitions = _PartitionWriter(self._partition_count)
+        self._seed_partitions = (
+            _PartitionWriter(self._partition_count) if max_mismatches else None
+        )
+        self.row_count = 0
+        self.exact_group_count = 0
+        self.exact_row_count = 0
+        self.near_pair_count = 0
+        self.skipped_seed_group_count = 0
+
+    def __enter__(self) -> "DuplicateDetector":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._hash_partitions.close()
+        if self._seed_partitions is not None:
+            self._seed_partitions.close()
+
+    def add(self, row_id: int, sequence: str) -> None:
+        encoded_sequence = sequence.encode("ascii")
+        sequence_hash = hash_sequence(encoded_sequence)
+        self._hash_partitions.write(
+            sequence_hash % self._partition_count,
+            array("Q", (sequence_hash, row_id)).tobytes(),
+        )
+        if self._seed_partitions is not None:
+            self._add_seeds(row_id, encoded_sequence)
+        self.row_count += 1
+        return
+
+    def _add_seeds(self, row_id: int, encoded_sequence: bytes) -> None:
+        length = len(encoded_sequence)
+        for segment_index, (start, end) in enumerate(
+            _get_segment_bounds(length, self.max_mismatches)
+        ):
+            seed_hash = hash_sequence(
+                b"%d:%d:%s" % (length, segment_index, encoded_sequence[start:end])
+            )
+            self._seed_partitions.write(
+                seed_hash % self._partition_count,
+                _SEED_RECORD_HEADER.pack(seed_hash, row_id, segment_index, length)
+                + encoded_sequence,
+            )
+        return
+
+    def add_rows(self, rows: t.Iterable["Row"]) -> t.Iterable["Row"]:
+        """
+        Add the sequence of each row.
+
+        Yield the rows unchanged.
+        """
+        add = self.add
+        for row in rows:
+            add(row[0], row[2])
+            yield row
+
+    def iter_duplicates(self) -> t.Iterator[Duplicate]:
+        """
+        Yield the exact duplicate groups, then the near duplicate pairs, each
+        with their row ids in row order, counting them as they are yielded.
+
+        Can only be called once, as the partitions are closed once read.
+        """
+        yield from self._iter_exact_duplicates()
+        if self._seed_partitions is None:
+            return
+        yield from self._iter_near_duplicates()
+
+    def _iter_exact_duplicates(self) -> t.Iterator[Duplicate]:
+        for data in self._hash_partitions.read_partitions():
+            for row_ids in _find_exact_duplicates(data):
+                self.exact_group_count += 1
+                self.exact_row_count += len(row_ids)
+                yield Duplicate(DuplicateKind.EXACT, 0, row_ids)
+
+    def _iter_near_duplicates(self) -> t.Iterator[Duplicate]:
+        for data in self._seed_partitions.read_partitions():
+            for duplicate in self._find_near_duplicates(data):
+                self.near_pair_count += 1
+                yield duplicate
+
+    def _find_near_duplicates(self, data: bytes) -> t.Iterator[Duplicate]:
+        for seed_group in _read_seed_groups(data).values():
+            if len(seed_group) < 2:
+                continue
+            if len(seed_group) > MAX_SEED_GROUP_SIZE:
+                self.skipped_seed_group_count += 1
+                continue
+            yield from _find_seed_group_duplicates(seed_group, self.max_mismatches)
+
+    def summary(self) -> t.List[str]:
+        """
+        Get a summary of the duplicates, once iter_duplicates() is exhausted.
+        """
+        lines = [
+            f"Exact duplicate sequences found in {self.exact_group_count} groups "
+            f"of {self.exact_row_count} of {self.row_count} sequences."
+        ]
+        if self.max_mismatches:
+            lines.append(
+                f"Near duplicate sequences within {self.max_mismatches} mismatches "
+                f"found in {self.near_pair_count} pairs."
+            )
+        if self.skipped_seed_group_count:
+            lines.append(
+                f"WARNING: {self.skipped_seed_group_count} groups of more than "
+                f"{MAX_SEED_GROUP_SIZE} sequences sharing a seed were not checked "
+                "for near duplicates."
+            )
+        return lines
+
+
+def _get_segment_bounds(length: int, max_mismatches: int) -> t.List[t.Tuple[int, int]]:
+    """
+    The bounds of the max_mismatches + 1 segments of a sequence. A sequence no
+    longer than max_mismatches is a single, empty, segment, as it is within
+    max_mismatches of every sequence of the same length.
+    """
+    if length <= max_mismatches:
+        return [(0, 0)]
+    segment_count = max_mismatches + 1
+    bounds = [length * i // segment_count for i in range(segment_count + 1)]
+    return list(zip(bounds, bounds[1:]))
+
+
+def _read_seed_groups(data: bytes) -> t.Dict[int, t.List[_SeedRecord]]:
+    """
+    The row id, segment index and sequence of each seed record, grouped by
+    seed hash.
+    """
+    seed_groups: t.Dict[int, t.List[_SeedRecord]] = {}
+    offset = 0
+    while offset < len(data):
+        (
+            seed_hash,
+            row_id,
+            segment_index,
+            length,
+        ) = _SEED_RECORD_HEADER.unpack_from(data, offset)
+        sequence_start = offset + _SEED_RECORD_HEADER.size
+        offset = sequence_start + length
+        seed_groups.setdefault(seed_hash, []).append(
+            (row_id, segment_index, data[sequence_start:offset])
+        )
+    return seed_groups
+
+
+def _find_seed_group_duplicates(
+    seed_group: t.List[_SeedRecord], max_mismatches: int
+) -> t.Iterator[Duplicate]:
+    """
+    Yield the near duplicate pairs of the sequences sharing a seed hash.
+    """
+    for index, seed_record in enumerate(seed_group):
+        other_start = index + 1
+        yield from _find_seed_record_duplicates(
+            seed_record, seed_group[other_start:], max_mismatches
+        )
+
+
+def _find_seed_record_duplicates(
+    seed_record: _SeedRecord,
+    other_seed_records: t.List[_SeedRecord],
+    max_mismatches: int,
+) -> t.Iterator[Duplicate]:
+    row_id, segment_index, sequence = seed_record
+    segment_bounds = _get_segment_bounds(len(sequence), max_mismatches)
+    earlier_segment_bounds = segment_bounds[:segment_index]
+    for other_row_id, other_segment_index, other_sequence in other_seed_records:
+        mismatches = sum(map(operator.ne, sequence, other_sequence))
+        if (
+            other_segment_index != segment_index
+            or len(other_sequence) != len(sequence)
+            or not 0 < mismatches <= max_mismatches
+        ):
+            # Not a near duplicate, or a different seed with the same hash
+            continue
+        if _shares_segment(sequence, other_sequence, earlier_segment_bounds):
+            # Reported by the first segment the pair shares
+            continue
+        yield Duplicate(DuplicateKind.NEAR, mismatches, (row_id, other_row_id))
+
+
+def _shares_segment(
+    sequence: bytes,
+    other_sequence: bytes,
+    segment_bounds: t.List[t.Tuple[int, int]],
+) -> bool:
+    return any(
+        sequence[start:end] == other_sequence[start:end]
+        for start, end in segment_bounds
+    )
+
+
+def _find_exact_duplicates(data: bytes) -> t.List[t.Tuple[int, ...]]:
+    """
+    The groups of row ids with the same hash, ordered by their first row id.
+    """
+    records = array("Q")
+    records.frombytes(data)
+    first_row_ids: t.Dict[int, int] = {}
+    duplicate_groups: t.Dict[int, t.List[int]] = {}
+    for sequence_hash, row_id in zip(records[0::2], records[1::2]):
+        first_row_id = first_row_ids.setdefault(sequence_hash, row_id)
+        if first_row_id != row_id:
+            duplicate_groups.setdefault(sequence_hash, [first_row_id]).append(row_id)
+    return sorted(map(tuple, duplicate_groups.values()))
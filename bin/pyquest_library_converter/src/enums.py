@@ -12,3 +12,28 @@ class NameAndSequenceArgs(enum.Enum):
     INDEX = "index"
     MIXED = "mixed"
     NONE = "none"
+
+
+class PrimerOrientation(enum.Enum):
+    FORWARD = "forward"
+    REVERSE = "reverse"
+    AMBIGUOUS = "ambiguous"
+    NONE = "none"
+
+
+class DuplicateKind(enum.Enum):
+    EXACT = "exact"
+    NEAR = "near"
+
+
+class MismatchModel(enum.Enum):
+    HAMMING = "hamming"
+    EDIT = "edit"
+
+
+class Compression(enum.Enum):
+    NONE = "none"
+    GZIP = "gzip"
+    BGZIP = "bgzip"
+    BZIP2 = "bzip2"
+    ZSTD = "zstd"
@@ -0,0 +1,365 @@
+import typing as t
+from array import array
+from pathlib import Path
+import hashlib
+import mmap
+import struct
+import sys
+
+from src.csv.write import atomic_binary_output_file
+
+if t.TYPE_CHECKING:
+    from src.csv.filter import Row
+
+# The oligo index is a binary sidecar of the converted library, mapping each
+# output sequence to the ids of the rows with that sequence, so it can be
+# memory-mapped rather than rebuilt from the TSV. All integers are little
+# endian, and every section starts at a multiple of 8 bytes:
+#
+#   header            magic, version, header size, row count, group count,
+#                     slot count, length count, min/mean/max sequence length
+#                     and the offset of each of the following sections
+#   slot hashes       uint64[slot_count], hash of the group in each slot
+#   slot groups       uint32[slot_count], group in each slot, or _EMPTY_SLOT
+#   sequence offsets  uint64[group_count + 1], group sequences in the blob
+#   id offsets        uint64[group_count + 1], group ids in the ids section
+#   ids               uint64[row_count], row ids grouped by sequence
+#   lengths           uint64[length_count], distinct sequence lengths
+#   length counts     uint64[length_count], rows with each sequence length
+#   sequences         ASCII blob of the distinct sequences
+#
+# A group is a distinct sequence, and its ids are in row order, so duplicate
+# sequences are resolved to a single group with several ids. Groups are found
+# by the 8 byte BLAKE2b digest of the sequence, in a power of two sized hash
+# table with linear probing.
+INDEX_MAGIC = b"PQOIDX\x00\x00"
+INDEX_VERSION = 1
+_INDEX_HEADER = struct.Struct("<8sIIQQQQQdQ8Q")
+_EMPTY_SLOT = 0xFFFFFFFF
+_HASH_SIZE = 8
+_SECTION_ALIGNMENT = 8
+
+
+def hash_sequence(sequence: bytes) -> int:
+    """
+    The index hash of a sequence.
+    """
+    digest = hashlib.blake2b(sequence, digest_size=_HASH_SIZE).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _get_slot_count(group_count: int) -> int:
+    # At most half full, so probes stay short
+    slot_count = 2
+    while slot_count < group_count * 2:
+        slot_count *= 2
+    return slot_count
+
+
+def _get_padding(size: int) -> bytes:
+    return b"\x00" * (-size % _SECTION_ALIGNMENT)
+
+
+class OligoIndexBuilder:
+    """
+    OligoIndexBuilder collects the sequences of the converted rows, as they are
+    written, and writes them as an oligo index.
+
+    Usage:
+        >>> index_builder = OligoIndexBuilder()
+        >>> rows = index_builder.add_rows(rows)
+        >>> write_rows(rows, ...)
+        >>> index_builder.write(index_file)
+    """
+
+    def __init__(self) -> None:
+        self._group_indices: t.Dict[str, int] = {}
+        # The first id of each group, and the further ids of duplicated groups
+        self._first_ids: "array[int]" = array("Q")
+        self._duplicate_ids: t.Dict[int, t.List[int]] = {}
+        self._length_counts: t.Dict[int, int] = {}
+        self.row_count = 0
+
+    def add(self, row_id: int, sequence: str) -> None:
+        group_count = len(self._group_indices)
+        group_index = self._group_indices.setdefault(sequence, group_count)
+        if group_index == group_count:
+            self._first_ids.append(row_id)
+        else:
+            self._duplicate_ids.setdefault(group_index, []).append(row_id)
+        length = len(sequence)
+        self._length_counts[length] = self._length_counts.get(length, 0) + 1
+        self.row_count += 1
+        return
+
+    def add_rows(self, rows: t.Iterable["Row"]) -> t.Iterable["Row"]:
+        """
+        Add the sequence of each row to the index.
+
+        Yield the rows unchanged.
+        """
+        add = self.add
+        for row in rows:
+            add(row[0], row[2])
+            yield row
+
+    @property
+    def group_count(self) -> int:
+        return len(self._group_indices)
+
+    def summary(self) -> t.List[str]:
+        duplicated_rows = sum(map(len, self._duplicate_ids.values())) + len(
+            self._duplicate_ids
+        )
+        lines = [
+            f"Oligo index has {self.group_count} distinct sequences for "
+            f"{self.row_count} sequences, with {len(self._duplicate_ids)} "
+            f"duplicated sequences shared by {duplicated_rows} sequences."
+        ]
+        if self.row_count:
+            total_length = sum(
+                length * count for length, count in self._length_counts.items()
+            )
+            lines.append(
+                f"Oligo sequence lengths: min {min(self._length_counts)}, "
+                f"mean {total_length / self.row_count:.1f}, "
+                f"max {max(self._length_counts)}."
+            )
+        return lines
+
+    def write(self, index_file: t.Union[str, Path]) -> None:
+        """
+        Write the index atomically to the index file.
+        """
+        encoded_sequences = [
+            sequence.encode("ascii") for sequence in self._group_indices
+        ]
+        slot_hashes, slot_groups = _get_slot_table(encoded_sequences)
+        ids, id_offsets = self._get_ids()
+        lengths = sorted(self._length_counts)
+        length_counts = array("Q", [self._length_counts[n] for n in lengths])
+        section_offsets, sections = _serialise_sections(
+            [
+                slot_hashes,
+                slot_groups,
+                _get_sequence_offsets(encoded_sequences),
+                id_offsets,
+                ids,
+                array("Q", lengths),
+                length_counts,
+            ],
+            b"".join(encoded_sequences),
+        )
+        header = self._pack_header(len(slot_hashes), lengths, section_offsets)
+        with atomic_binary_output_file(index_file) as index:
+            index.write(header)
+            index.write(_get_padding(len(header)))
+            for section_bytes in sections:
+                index.write(section_bytes)
+        return
+
+    def _get_ids(self) -> t.Tuple["array[int]", "array[int]"]:
+        """
+        The ids of each group in row order, and the offset of each group's ids.
+        """
+        if not self._duplicate_ids:
+            return self._first_ids, array("Q", range(self.group_count + 1))
+        ids = array("Q")
+        id_offsets = array("Q", [0])
+        for group_index, first_id in enumerate(self._first_ids):
+            ids.append(first_id)
+            ids.extend(self._duplicate_ids.get(group_index, ()))
+            id_offsets.append(len(ids))
+        return ids, id_offsets
+
+    def _pack_header(
+        self, slot_count: int, lengths: t.List[int], section_offsets: t.List[int]
+    ) -> bytes:
+        mean_length = (
+            sum(n * count for n, count in self._length_counts.items()) / self.row_count
+            if self.row_count
+            else 0.0
+        )
+        return _INDEX_HEADER.pack(
+            INDEX_MAGIC,
+            INDEX_VERSION,
+            _INDEX_HEADER.size,
+            self.row_count,
+            self.group_count,
+            slot_count,
+            len(lengths),
+            min(lengths, default=0),
+            mean_length,
+            max(lengths, default=0),
+            *section_offsets,
+        )
+
+
+def _get_slot_table(
+    encoded_sequences: t.List[bytes],
+) -> t.Tuple["array[int]", "array[int]"]:
+    """
+    The hash and the group in each slot of the hash table.
+    """
+    slot_count = _get_slot_count(len(encoded_sequences))
+    slot_hashes = array("Q", [0]) * slot_count
+    slot_groups = array("I", [_EMPTY_SLOT]) * slot_count
+    slot_mask = slot_count - 1
+    for group_index, sequence in enumerate(encoded_sequences):
+        sequence_hash = hash_sequence(sequence)
+        slot = sequence_hash & slot_mask
+        while slot_groups[slot] != _EMPTY_SLOT:
+            slot = (slot + 1) & slot_mask
+        slot_hashes[slot] = sequence_hash
+        slot_groups[slot] = group_index
+    return slot_hashes, slot_groups
+
+
+def _get_sequence_offsets(encoded_sequences: t.List[bytes]) -> "array[int]":
+    sequence_offsets = array("Q", [0])
+    for sequence in encoded_sequences:
+        sequence_offsets.append(sequence_offsets[-1] + len(sequence))
+    return sequence_offsets
+
+
+def _serialise_sections(
+    sections: t.List["array[int]"], sequences: bytes
+) -> t.Tuple[t.List[int], t.List[bytes]]:
+    """
+    The offset and the padded bytes of each section, after the padded header,
+    followed by the sequences.
+    """
+    offset = _INDEX_HEADER.size + len(_get_padding(_INDEX_HEADER.size))
+    section_offsets = []
+    sections_bytes = []
+    for section in sections:
+        section_bytes = _to_little_endian_bytes(section)
+        section_bytes += _get_padding(len(section_bytes))
+        section_offsets.append(offset)
+        sections_bytes.append(section_bytes)
+        offset += len(section_bytes)
+    section_offsets.append(offset)
+    sections_bytes.append(sequences)
+    return section_offsets, sections_bytes
+
+
+def _to_little_endian_bytes(values: "array[int]") -> bytes:
+    if sys.byteorder == "little":
+        return values.tobytes()
+    swapped = array(values.typecode, values)
+    swapped.byteswap()
+    return swapped.tobytes()
+
+
+class OligoIndex:
+    """
+    OligoIndex reads an oligo index written by OligoIndexBuilder, by memory
+    mapping it, so only the parts looked up are read.
+
+    Usage:
+        >>> with OligoIndex(index_file) as oligo_index:
+        ...     row_ids = oligo_index.lookup("ACGT")
+    """
+
+    def __init__(self, index_file: t.Union[str, Path]) -> None:
+        with open(index_file, "rb") as index:
+            self._buffer = mmap.mmap(index.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._buffer) < _INDEX_HEADER.size:
+            self.close()
+            raise ValueError(f"Not an oligo index: {str(index_file)!r}")
+        (
+            magic,
+            version,
+            _,
+            self.row_count,
+            self.group_count,
+            self._slot_count,
+            self._length_count,
+            self.min_length,
+            self.mean_length,
+            self.max_length,
+            self._slot_hashes_offset,
+            self._slot_groups_offset,
+            self._sequence_offsets_offset,
+            self._id_offsets_offset,
+            self._ids_offset,
+            self._lengths_offset,
+            self._length_counts_offset,
+            self._sequences_offset,
+        ) = _INDEX_HEADER.unpack_from(self._buffer)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            self.close()
+            raise ValueError(
+                f"Not a version {INDEX_VERSION} oligo index: {str(index_file)!r}"
+            )
+
+    def __enter__(self) -> "OligoIndex":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._buffer.close()
+
+    def _uint64(self, section_offset: int, index: int) -> int:
+        return struct.unpack_from("<Q", self._buffer, section_offset + 8 * index)[0]
+
+    def _uint32(self, section_offset: int, index: int) -> int:
+        return struct.unpack_from("<I", self._buffer, section_offset + 4 * index)[0]
+
+    def _get_sequence_bytes(self, group_index: int) -> bytes:
+        start = self._uint64(self._sequence_offsets_offset, group_index)
+        end = self._uint64(self._sequence_offsets_offset, group_index + 1)
+        offset = self._sequences_offset
+        sequence_start = offset + start
+        sequence_end = offset + end
+        return self._buffer[sequence_start:sequence_end]
+
+    def get_sequence(self, group_index: int) -> str:
+        return self._get_sequence_bytes(group_index).decode("ascii")
+
+    def get_ids(self, group_index: int) -> t.Tuple[int, ...]:
+        start = self._uint64(self._id_offsets_offset, group_index)
+        end = self._uint64(self._id_offsets_offset, group_index + 1)
+        offset = self._ids_offset + 8 * start
+        return struct.unpack_from(f"<{end - start}Q", self._buffer, offset)
+
+    def lookup(self, sequence: str) -> t.Tuple[int, ...]:
+        """
+        The ids of the rows with the sequence, in row order, or an empty tuple
+        if no row has it.
+        """
+        encoded_sequence = sequence.encode("ascii")
+        sequence_hash = hash_sequence(encoded_sequence)
+        slot_mask = self._slot_count - 1
+        slot = sequence_hash & slot_mask
+        while True:
+            group_index = self._uint32(self._slot_groups_offset, slot)
+            if group_index == _EMPTY_SLOT:
+                return ()
+            slot_hash = self._uint64(self._slot_hashes_offset, slot)
+            if slot_hash == sequence_hash and (
+                self._get_sequence_bytes(group_index) == encoded_sequence
+            ):
+                return self.get_ids(group_index)
+            slot = (slot + 1) & slot_mask
+
+    def iter_groups(self) -> t.Iterator[t.Tuple[str, t.Tuple[int, ...]]]:
+        """
+        Yield each distinct sequence with the ids of its rows, in order of
+        first appearance.
+        """
+        for group_index in range(self.group_count):
+            yield self.get_sequence(group_index), self.get_ids(group_index)
+
+    def length_counts(self) -> t.Dict[int, int]:
+        """
+        The number of rows with each sequence length.
+        """
+        return {
+            self._uint64(self._lengths_offset, i): self._uint64(
+                self._length_counts_offset, i
+            )
+            for i in range(self._length_count)
+        }
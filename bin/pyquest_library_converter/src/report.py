@@ -1,27 +1,47 @@
 import typing as t
+from array import array
 from dataclasses import dataclass, field
 
+from src.dna.approximate_match import format_mismatch_counts
+
+
+def _new_row_id_array() -> "array[int]":
+    # Unsigned 64-bit row ids, 8 bytes per trimmed row instead of a Python int
+    return array("Q")
+
 
 @dataclass
 class Report:
     row_count: int = 0
-    forward_primers_trimmed: t.List[int] = field(
-        default_factory=list, repr=False, hash=False
+    forward_primers_trimmed: "array[int]" = field(
+        default_factory=_new_row_id_array, repr=False, hash=False
     )
-    reverse_primers_trimmed: t.List[int] = field(
-        default_factory=list, repr=False, hash=False
+    reverse_primers_trimmed: "array[int]" = field(
+        default_factory=_new_row_id_array, repr=False, hash=False
+    )
+    both_primers_trimmed: "array[int]" = field(
+        default_factory=_new_row_id_array, repr=False, hash=False
     )
     scanning_summary: t.List[str] = field(
         default_factory=list, repr=False, hash=False, init=True
     )
+    # Number of primers trimmed with each number of mismatches, only recorded
+    # when primers are matched with mismatches allowed
+    forward_primer_mismatches: t.Dict[int, int] = field(
+        default_factory=dict, repr=False, hash=False
+    )
+    reverse_primer_mismatches: t.Dict[int, int] = field(
+        default_factory=dict, repr=False, hash=False
+    )
+    # Only recorded when duplicates are detected
+    exact_duplicate_groups: int = 0
+    exact_duplicate_rows: int = 0
+    near_duplicate_pairs: int = 0
+    duplicate_summary: t.List[str] = field(default_factory=list, repr=False, hash=False)
 
     @property
     def both_trimmed(self) -> t.List[int]:
-        both = list(
-            set(self.forward_primers_trimmed) & set(self.reverse_primers_trimmed)
-        )
-        both.sort()
-        return both
+        return self.both_primers_trimmed.tolist()
 
     def add_row(
         self,
@@ -34,6 +54,27 @@ class Report:
             self.forward_primers_trimmed.append(row_id)
         if has_trimmed_reverse_primer:
             self.reverse_primers_trimmed.append(row_id)
+            # Row ids are unique, so rows trimmed at both ends can be recorded
+            # here rather than by intersecting the forward and reverse ids
+            if has_trimmed_forward_primer:
+                self.both_primers_trimmed.append(row_id)
+        return
+
+    def add_primer_mismatches(
+        self,
+        forward_primer_mismatches: t.Optional[int],
+        reverse_primer_mismatches: t.Optional[int],
+    ):
+        """
+        Record the mismatches of the primers trimmed from a row, None where a
+        primer was not trimmed.
+        """
+        for mismatch_counts, mismatches in (
+            (self.forward_primer_mismatches, forward_primer_mismatches),
+            (self.reverse_primer_mismatches, reverse_primer_mismatches),
+        ):
+            if mismatches is not None:
+                mismatch_counts[mismatches] = mismatch_counts.get(mismatches, 0) + 1
         return
 
     def add_scanning_summary(self, scanning_summary: t.List[str]):
@@ -44,11 +85,53 @@ class Report:
         self.scanning_summary.append(null_data_summary)
         return
 
+    def add_primer_assignment_summary(self, primer_assignment_summary: t.List[str]):
+        self.scanning_summary.extend(primer_assignment_summary)
+        return
+
+    def add_oligo_index_summary(self, oligo_index_summary: t.List[str]):
+        self.scanning_summary.extend(oligo_index_summary)
+        return
+
+    def add_duplicates(
+        self,
+        exact_duplicate_groups: int,
+        exact_duplicate_rows: int,
+        near_duplicate_pairs: int,
+        duplicate_summary: t.List[str],
+    ):
+        self.exact_duplicate_groups = exact_duplicate_groups
+        self.exact_duplicate_rows = exact_duplicate_rows
+        self.near_duplicate_pairs = near_duplicate_pairs
+        self.duplicate_summary = duplicate_summary
+        return
+
+    def to_dict(self) -> t.Dict[str, t.Any]:
+        """
+        The report counts and summary, in a JSON serialisable form.
+        """
+        return {
+            "rows": self.row_count,
+            "forward_primers_trimmed": len(self.forward_primers_trimmed),
+            "reverse_primers_trimmed": len(self.reverse_primers_trimmed),
+            "both_primers_trimmed": len(self.both_primers_trimmed),
+            "forward_primer_mismatches": {
+                str(mismatches): count
+                for mismatches, count in sorted(self.forward_primer_mismatches.items())
+            },
+            "reverse_primer_mismatches": {
+                str(mismatches): count
+                for mismatches, count in sorted(self.reverse_primer_mismatches.items())
+            },
+            "exact_duplicate_groups": self.exact_duplicate_groups,
+            "exact_duplicate_rows": self.exact_duplicate_rows,
+            "near_duplicate_pairs": self.near_duplicate_pairs,
+            "summary": self.summary().split("\n"),
+        }
+
     def summary(self) -> str:
         summary = self.scanning_summary.copy()
         total = self.row_count
-        self.forward_primers_trimmed.sort()
-        self.reverse_primers_trimmed.sort()
         summary.append(
             f"Forward primer trimmed in {len(self.forward_primers_trimmed)} of {total} sequences."
         )
@@ -56,6 +139,15 @@ class Report:
             f"Reverse primer trimmed in {len(self.reverse_primers_trimmed)} of {total} sequences."
         )
         summary.append(
-            f"Forward + reverse primer trimmed in {len(self.both_trimmed)} out of {total} sequences."
+            f"Forward + reverse primer trimmed in {len(self.both_primers_trimmed)} out of {total} sequences."
         )
+        if self.forward_primer_mismatches:
+            summary.append(
+                f"Forward primer trimmed with {format_mismatch_counts(self.forward_primer_mismatches)}."
+            )
+        if self.reverse_primer_mismatches:
+            summary.append(
+                f"Reverse primer trimmed with {format_mismatch_counts(self.reverse_primer_mismatches)}."
+            )
+        summary.extend(self.duplicate_summary)
         return "\n".join(summary)
@@ -0,0 +1,106 @@
+import typing as t
+from contextlib import contextmanager
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+STAGE__SNIFF = "sniff"
+STAGE__HEADER_SCAN = "header_scan"
+STAGE__READ = "read"
+STAGE__SCAN = "scan"
+STAGE__TRIM = "trim"
+STAGE__WRITE = "write"
+STAGE__INDEX = "index"
+STAGE__DUPLICATES = "duplicates"
+
+_T = t.TypeVar("_T")
+
+
+def get_peak_rss_bytes() -> t.Optional[int]:
+    """
+    The peak resident set size of this process so far, or None if it cannot be
+    measured on this platform.
+    """
+    if resource is None:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS, and in kilobytes elsewhere
+    return peak_rss if sys.platform == "darwin" else peak_rss * 1024
+
+
+class StageTimer:
+    """
+    StageTimer accumulates the time spent in each stage of a library
+    conversion, and the peak RSS at the end of each stage.
+
+    Stages can be nested, and the time of a stage excludes the time of the
+    stages nested in it. As trimming and writing happen in a single pass over
+    the rows, the production of each row can be timed as a stage of its own, so
+    the time spent trimming is not counted as writing.
+
+    Usage:
+        >>> stage_timer = StageTimer()
+        >>> with stage_timer.stage(STAGE__WRITE):
+        ...     write_rows(stage_timer.time_rows(STAGE__TRIM, rows), ...)
+        >>> stage_timer.seconds
+        {'trim': 1.2, 'write': 0.8}
+    """
+
+    def __init__(self) -> None:
+        self.seconds: t.Dict[str, float] = {}
+        self.peak_rss_bytes: t.Dict[str, t.Optional[int]] = {}
+        # The time spent in the stages nested in each active stage
+        self._nested_seconds: t.List[float] = [0.0]
+
+    def _start(self) -> float:
+        self._nested_seconds.append(0.0)
+        return time.perf_counter()
+
+    def _stop(self, name: str, start: float) -> None:
+        elapsed = time.perf_counter() - start
+        nested = self._nested_seconds.pop()
+        self.seconds[name] = self.seconds.get(name, 0.0) + elapsed - nested
+        self._nested_seconds[-1] += elapsed
+
+    @contextmanager
+    def stage(self, name: str) -> t.Iterator[None]:
+        start = self._start()
+        try:
+            yield
+        finally:
+            self._stop(name, start)
+            self.peak_rss_bytes[name] = get_peak_rss_bytes()
+
+    def time_rows(self, name: str, rows: t.Iterable[_T]) -> t.Iterator[_T]:
+        """
+        Yield the rows, timing the production of each of them as the stage.
+        """
+        iterator = iter(rows)
+        while True:
+            start = self._start()
+            try:
+                row = next(iterator)
+            except StopIteration:
+                break
+            finally:
+                self._stop(name, start)
+            yield row
+        self.peak_rss_bytes[name] = get_peak_rss_bytes()
+
+
+class NullStageTimer:
+    """
+    NullStageTimer has the interface of StageTimer without timing anything, so
+    a conversion that is not being benchmarked pays nothing for it.
+    """
+
+    @contextmanager
+    def stage(self, name: str) -> t.Iterator[None]:
+        yield
+
+    def time_rows(self, name: str, rows: t.Iterable[_T]) -> t.Iterable[_T]:
+        return rows
@@ -0,0 +1,127 @@
+import random
+
+import pytest
+
+from src.dna.approximate_match import PrimerMatch, PrimerMatcher, format_mismatch_counts
+from src.dna.helpers import trim_sequence_approximate
+from src.enums import MismatchModel
+from src.exceptions import UndevelopedFeatureError
+
+
+def _prefix_edit_distance(text: str, pattern: str) -> int:
+    """
+    The edit distance between the pattern and the closest prefix of the text,
+    by dynamic programming.
+    """
+    previous_row = list(range(len(pattern) + 1))
+    best_distance = previous_row[-1]
+    for text_index, char in enumerate(text, 1):
+        row = [text_index]
+        for pattern_index, pattern_char in enumerate(pattern, 1):
+            row.append(
+                min(
+                    previous_row[pattern_index] + 1,
+                    row[pattern_index - 1] + 1,
+                    previous_row[pattern_index - 1] + (pattern_char != char),
+                )
+            )
+        previous_row = row
+        best_distance = min(best_distance, row[-1])
+    return best_distance
+
+
+@pytest.mark.parametrize("max_mismatches", [0, 1, 2])
+def test_primer_matcher__edit_matches_dynamic_programming(max_mismatches):
+    # Given
+    random.seed(max_mismatches)
+    for _ in range(1000):
+        primer = "".join(random.choices("ACGT", k=random.randint(3, 10)))
+        sequence = "".join(random.choices("ACGT", k=random.randint(0, 14)))
+        matcher = PrimerMatcher(primer, max_mismatches, MismatchModel.EDIT)
+        window_length = len(primer) + max_mismatches
+        expected_prefix = _prefix_edit_distance(sequence[:window_length], primer)
+        expected_suffix = _prefix_edit_distance(
+            sequence[::-1][:window_length], primer[::-1]
+        )
+
+        # When
+        prefix_match = matcher.match_prefix(sequence)
+        suffix_match = matcher.match_suffix(sequence)
+
+        # Then
+        for match, expected_distance in [
+            (prefix_match, expected_prefix),
+            (suffix_match, expected_suffix),
+        ]:
+            if expected_distance > max_mismatches:
+                assert match is None
+            else:
+                assert match is not None
+                assert match.distance == expected_distance
+
+
+@pytest.mark.parametrize(
+    "sequence, model, expected_prefix, expected_suffix",
+    [
+        pytest.param("ACGTACGTGGGG", MismatchModel.HAMMING, (8, 0), None, id="exact"),
+        pytest.param(
+            "ACGTTCGTGGGACGTACCT", MismatchModel.HAMMING, (8, 1), (8, 1), id="sub"
+        ),
+        pytest.param("ACGACGTGGGG", MismatchModel.HAMMING, None, None, id="del_ham"),
+        pytest.param("ACGACGTGGGG", MismatchModel.EDIT, (7, 1), None, id="del_edit"),
+        pytest.param(
+            "GGGACGTAACGT", MismatchModel.EDIT, None, (9, 1), id="ins_suffix_edit"
+        ),
+        pytest.param("ACGT", MismatchModel.HAMMING, None, None, id="too_short"),
+    ],
+)
+def test_primer_matcher(sequence, model, expected_prefix, expected_suffix):
+    # Given
+    matcher = PrimerMatcher("ACGTACGT", max_mismatches=1, model=model)
+
+    # When
+    prefix_match = matcher.match_prefix(sequence)
+    suffix_match = matcher.match_suffix(sequence)
+
+    # Then
+    assert prefix_match == (PrimerMatch(*expected_prefix) if expected_prefix else None)
+    assert suffix_match == (PrimerMatch(*expected_suffix) if expected_suffix else None)
+
+
+@pytest.mark.parametrize("model", list(MismatchModel))
+def test_trim_sequence_approximate(model):
+    # Given
+    forward_matcher = PrimerMatcher("AAACCC", 1, model)
+    reverse_matcher = PrimerMatcher("GGGTTT", 1, model)
+
+    # When / Then
+    assert trim_sequence_approximate(
+        "AAACCCxyzGGGTTT", forward_matcher, reverse_matcher
+    ) == ("xyz", 0, 0)
+    assert trim_sequence_approximate(
+        "AAAGCCxyzGGATTT", forward_matcher, reverse_matcher
+    ) == ("xyz", 1, 1)
+    assert trim_sequence_approximate(
+        "AGAGCCxyzGGGTTT", forward_matcher, reverse_matcher
+    ) == ("AGAGCCxyz", None, 0)
+    assert trim_sequence_approximate("AAACCCxyz", forward_matcher, None) == (
+        "xyz",
+        0,
+        None,
+    )
+
+
+def test_trim_sequence_approximate__overlapping_primers_raise():
+    # Given
+    forward_matcher = PrimerMatcher("AAACCC", 1)
+    reverse_matcher = PrimerMatcher("CCGTTT", 1)
+
+    # When / Then
+    with pytest.raises(UndevelopedFeatureError):
+        trim_sequence_approximate("AAACCGTTT", forward_matcher, reverse_matcher)
+
+
+def test_format_mismatch_counts():
+    assert format_mismatch_counts({2: 1, 0: 95, 1: 4}) == (
+        "0 mismatches (95), 1 mismatch (4), 2 mismatches (1)"
+    )
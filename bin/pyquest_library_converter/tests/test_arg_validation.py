@@ -8,6 +8,7 @@ import pytest
 from src.args.args_cleaner import ArgsCleaner
 from src.args.args_parsing import get_argparser
 from src.exceptions import ValidationError
+from src.enums import Compression, MismatchModel
 from src import constants as const
 from enum import IntEnum
 
@@ -74,6 +75,16 @@ def config(request):
             verbose=False,
             force_header_index=None,
             warn_null_data=False,
+            cpus=1,
+            primer_scan_confidence=None,
+            output_compression="none",
+            primer_panel=None,
+            primer_assignments_file=None,
+            primer_max_mismatches=0,
+            primer_mismatch_model="hamming",
+            index_file=None,
+            duplicate_max_mismatches=None,
+            duplicates_file=None,
         )
         valid_namespace_with_headers = argparse.Namespace(
             input_file=csv_path,
@@ -89,6 +100,16 @@ def config(request):
             verbose=False,
             force_header_index=None,
             warn_null_data=False,
+            cpus=1,
+            primer_scan_confidence=None,
+            output_compression="none",
+            primer_panel=None,
+            primer_assignments_file=None,
+            primer_max_mismatches=0,
+            primer_mismatch_model="hamming",
+            index_file=None,
+            duplicate_max_mismatches=None,
+            duplicates_file=None,
         )
     elif request.param == CSV_SYMBOL_2:
         # Setup from _ExampleData2_Mixin
@@ -114,6 +135,16 @@ def config(request):
             verbose=False,
             force_header_index=None,
             warn_null_data=False,
+            cpus=1,
+            primer_scan_confidence=None,
+            output_compression="none",
+            primer_panel=None,
+            primer_assignments_file=None,
+            primer_max_mismatches=0,
+            primer_mismatch_model="hamming",
+            index_file=None,
+            duplicate_max_mismatches=None,
+            duplicates_file=None,
         )
         valid_namespace_with_headers = argparse.Namespace(
             input_file=csv_path,
@@ -129,6 +160,16 @@ def config(request):
             verbose=False,
             force_header_index=None,
             warn_null_data=False,
+            cpus=1,
+            primer_scan_confidence=None,
+            output_compression="none",
+            primer_panel=None,
+            primer_assignments_file=None,
+            primer_max_mismatches=0,
+            primer_mismatch_model="hamming",
+            index_file=None,
+            duplicate_max_mismatches=None,
+            duplicates_file=None,
         )
     else:
         raise ValueError(f"Invalid request.param: {request.param}")
@@ -309,6 +350,132 @@ def test_validate_reverse_complement_flag(config):
     args_cleaner._validate_reverse_complement_flag()
 
 
+@pytest.mark.parametrize(
+    "cpus, should_throw",
+    [(1, False), (4, False), (0, True), (-1, True)],
+)
+def test_validate_cpus(config, cpus, should_throw):
+    namespace = config.valid_namespace
+    namespace.cpus = cpus
+    args_cleaner = ArgsCleaner(namespace)
+    if should_throw:
+        with pytest.raises(ValidationError):
+            args_cleaner.validate()
+    else:
+        args_cleaner.validate()
+        assert args_cleaner.get_clean_cpus() == cpus
+
+
+@pytest.mark.parametrize(
+    "confidence, should_throw",
+    [(None, False), (0.999, False), (0.0, True), (1.0, True), (95.0, True)],
+)
+def test_validate_primer_scan_confidence(config, confidence, should_throw):
+    namespace = config.valid_namespace
+    namespace.primer_scan_confidence = confidence
+    args_cleaner = ArgsCleaner(namespace)
+    if should_throw:
+        with pytest.raises(ValidationError):
+            args_cleaner.validate()
+    else:
+        args_cleaner.validate()
+        assert args_cleaner.get_clean_primer_scan_confidence() == confidence
+
+
+@pytest.mark.parametrize(
+    "compression, should_throw",
+    [("none", False), ("gzip", False), ("bgzip", False), ("zstd", True), ("", True)],
+)
+def test_validate_output_compression(config, compression, should_throw):
+    namespace = config.valid_namespace
+    namespace.output_compression = compression
+    args_cleaner = ArgsCleaner(namespace)
+    if should_throw:
+        with pytest.raises(ValidationError):
+            args_cleaner.validate()
+    else:
+        args_cleaner.validate()
+        assert args_cleaner.get_clean_output_compression() == Compression(compression)
+
+
+@pytest.mark.parametrize(
+    "forward_primer, use_assignments, should_throw",
+    [("", False, False), ("", True, False), ("ACGT", False, True)],
+)
+def test_validate_primer_panel(
+    config, tmp_path, forward_primer, use_assignments, should_throw
+):
+    panel_file = tmp_path / "panel.tsv"
+    panel_file.write_text("name\tforward\treverse\nA\tACGT\tTTGC\n")
+    namespace = config.valid_namespace
+    namespace.forward_primer = forward_primer
+    namespace.reverse_primer = ""
+    namespace.primer_panel = panel_file
+    if use_assignments:
+        namespace.primer_assignments_file = tmp_path / "assignments.tsv"
+    args_cleaner = ArgsCleaner(namespace)
+    if should_throw:
+        with pytest.raises(ValidationError):
+            args_cleaner.validate()
+    else:
+        args_cleaner.validate()
+        primer_panel = args_cleaner.get_clean_primer_panel()
+        assert [primer_pair.name for primer_pair in primer_panel] == ["A"]
+
+
+def test_validate_primer_assignments__without_panel_raises(config, tmp_path):
+    namespace = config.valid_namespace
+    namespace.primer_assignments_file = tmp_path / "assignments.tsv"
+    args_cleaner = ArgsCleaner(namespace)
+    with pytest.raises(ValidationError):
+        args_cleaner.validate()
+
+
+@pytest.mark.parametrize(
+    "forward_primer, max_mismatches, mismatch_model, should_throw",
+    [
+        ("ACGT", 0, "hamming", False),
+        ("ACGT", 1, "hamming", False),
+        ("ACGT", 3, "edit", False),
+        ("", 2, "edit", False),
+        ("ACGT", 4, "hamming", True),
+        ("ACGT", -1, "hamming", True),
+        ("ACGT", 1, "levenshtein", True),
+    ],
+)
+def test_validate_primer_max_mismatches(
+    config, forward_primer, max_mismatches, mismatch_model, should_throw
+):
+    namespace = config.valid_namespace
+    namespace.forward_primer = forward_primer
+    namespace.reverse_primer = ""
+    namespace.primer_max_mismatches = max_mismatches
+    namespace.primer_mismatch_model = mismatch_model
+    args_cleaner = ArgsCleaner(namespace)
+    if should_throw:
+        with pytest.raises(ValidationError):
+            args_cleaner.validate()
+    else:
+        args_cleaner.validate()
+        assert args_cleaner.get_clean_primer_max_mismatches() == max_mismatches
+        assert args_cleaner.get_clean_primer_mismatch_model() == MismatchModel(
+            mismatch_model
+        )
+
+
+def test_validate_primer_max_mismatches__with_panel_raises(config, tmp_path):
+    panel_file = tmp_path / "panel.tsv"
+    panel_file.write_text("name\tforward\treverse\nA\tACGT\tTTGC\n")
+    namespace = config.valid_namespace
+    namespace.forward_primer = ""
+    namespace.reverse_primer = ""
+    namespace.primer_panel = panel_file
+    namespace.primer_max_mismatches = 1
+    args_cleaner = ArgsCleaner(namespace)
+    with pytest.raises(ValidationError):
+        args_cleaner.validate()
+
+
 def test_validate_name_index(config):
     namespace = config.valid_namespace
     args_cleaner = ArgsCleaner(namespace)
@@ -598,6 +765,12 @@ def test_to_clean_dict(config):
     expected_dict.pop(const._ARG_SEQ_HEADER)
     expected_dict.pop(const._ARG_SKIP_N_ROWS)
     expected_dict[const.KEY_ADJUSTED_SKIP_N_ROWS] = adjusted_skip_rows
+    expected_dict[const._ARG_OUTPUT_COMPRESSION] = Compression(
+        namespace.output_compression
+    )
+    expected_dict[const._ARG_PRIMER_MISMATCH_MODEL] = MismatchModel(
+        namespace.primer_mismatch_model
+    )
 
     # When
     args_cleaner.validate()
@@ -638,6 +811,12 @@ def test_to_clean_dict__with_header(config):
     expected_dict[const._ARG_SEQ_INDEX] = sequence_index_1
     expected_dict.pop(const._ARG_SKIP_N_ROWS)
     expected_dict[const.KEY_ADJUSTED_SKIP_N_ROWS] = adjusted_skip_rows
+    expected_dict[const._ARG_OUTPUT_COMPRESSION] = Compression(
+        namespace.output_compression
+    )
+    expected_dict[const._ARG_PRIMER_MISMATCH_MODEL] = MismatchModel(
+        namespace.primer_mismatch_model
+    )
 
     # When
     args_cleaner.validate()
@@ -645,3 +824,41 @@ def test_to_clean_dict__with_header(config):
 
     # Then
     assert expected_dict == actual_dict
+
+
+@pytest.mark.parametrize("same_as_output", [False, True])
+def test_validate_index(config, tmp_path, same_as_output):
+    namespace = config.valid_namespace
+    namespace.output_file = tmp_path / "output.tsv"
+    namespace.index_file = (
+        namespace.output_file if same_as_output else tmp_path / "output.index"
+    )
+    args_cleaner = ArgsCleaner(namespace)
+    if same_as_output:
+        with pytest.raises(ValidationError):
+            args_cleaner.validate()
+    else:
+        args_cleaner.validate()
+        assert args_cleaner.get_clean_index() == tmp_path / "output.index"
+
+
+@pytest.mark.parametrize("detect_duplicates", [False, True])
+def test_validate_duplicates(config, tmp_path, detect_duplicates):
+    namespace = config.valid_namespace
+    namespace.duplicate_max_mismatches = 1 if detect_duplicates else None
+    namespace.duplicates_file = tmp_path / "output.duplicates.tsv"
+    args_cleaner = ArgsCleaner(namespace)
+    if not detect_duplicates:
+        with pytest.raises(ValidationError):
+            args_cleaner.validate()
+    else:
+        args_cleaner.validate()
+        assert args_cleaner.get_clean_duplicate_max_mismatches() == 1
+        assert args_cleaner.get_clean_duplicates() == namespace.duplicates_file
+
+
+def test_validate_duplicate_max_mismatches__negative_raises(config):
+    namespace = config.valid_namespace
+    namespace.duplicate_max_mismatches = -1
+    with pytest.raises(ValidationError):
+        ArgsCleaner(namespace).validate()
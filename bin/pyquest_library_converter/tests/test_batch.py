@@ -0,0 +1,206 @@
+from pathlib import Path
+import json
+
+import pytest
+
+from tests import test_data
+from src.args.args_parsing import get_argparser
+from src.batch import BatchJob, read_batch_manifest
+from src.exceptions import ValidationError
+from pyquest_library_batch_converter import batch_main
+from pyquest_library_converter import main
+from src import constants as const
+
+
+def _write_manifest(tmp_path: Path, manifest) -> Path:
+    manifest_file = tmp_path / "manifest.json"
+    manifest_file.write_text(json.dumps(manifest))
+    return manifest_file
+
+
+def test_read_batch_manifest__merges_defaults(tmp_path: Path):
+    # Given
+    manifest_file = _write_manifest(
+        tmp_path,
+        {
+            "defaults": {"name-header": "oligo_name", "sequence_header": "mseq"},
+            "jobs": [
+                {"input": "in_1.csv", "output": "out_1.tsv", "revcomp": True},
+                {
+                    "input": "in_2.csv",
+                    "output": "out_2.tsv",
+                    "revcomp": False,
+                    "skip": 2,
+                    "sequence_header": "oligo_seq",
+                },
+            ],
+        },
+    )
+
+    # When
+    jobs = read_batch_manifest(manifest_file, get_argparser())
+
+    # Then
+    assert jobs == [
+        BatchJob(
+            index=1,
+            argv=(
+                "in_1.csv",
+                "out_1.tsv",
+                "--name-header",
+                "oligo_name",
+                "--sequence-header",
+                "mseq",
+                "--revcomp",
+            ),
+        ),
+        BatchJob(
+            index=2,
+            argv=(
+                "in_2.csv",
+                "out_2.tsv",
+                "--name-header",
+                "oligo_name",
+                "--sequence-header",
+                "oligo_seq",
+                "--skip",
+                "2",
+            ),
+        ),
+    ]
+    assert jobs[0].get_command() == (
+        "pyquest_library_converter.py in_1.csv out_1.tsv "
+        "--name-header oligo_name --sequence-header mseq --revcomp"
+    )
+
+
+@pytest.mark.parametrize(
+    "manifest",
+    [
+        pytest.param([], id="not_an_object"),
+        pytest.param({"jobs": []}, id="no_jobs"),
+        pytest.param({"jobs": [{"output": "out.tsv", "N": 1}]}, id="no_input"),
+        pytest.param(
+            {"jobs": [{"input": "in.csv", "output": "out.tsv", "unknown": 1}]},
+            id="unknown_option",
+        ),
+        pytest.param(
+            {"jobs": [{"input": "in.csv", "output": "out.tsv", "name-index": 1}]},
+            id="missing_required_option",
+        ),
+    ],
+)
+def test_read_batch_manifest__invalid_raises(tmp_path: Path, manifest):
+    # Given
+    manifest_file = _write_manifest(tmp_path, manifest)
+
+    # When / Then
+    with pytest.raises(ValidationError):
+        read_batch_manifest(manifest_file, get_argparser())
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_batch_main__matches_single_library_runs(tmp_path: Path, workers: int):
+    # Given
+    input_file = test_data.get.example_data_1_csv()
+    manifest_file = _write_manifest(
+        tmp_path,
+        {
+            "defaults": {"name-header": "oligo_name", "sequence-header": "mseq"},
+            "jobs": [
+                {
+                    "input": str(input_file),
+                    "output": str(tmp_path / "library_1.tsv"),
+                    "revcomp": True,
+                },
+                {
+                    "input": str(input_file),
+                    "output": str(tmp_path / "library_2.tsv"),
+                    "forward": "AATGATACGGCGACCACCGATCCTGCGCCTTCTCTCC",
+                },
+            ],
+        },
+    )
+    summary_file = tmp_path / "summary.json"
+    main_kwargs = {
+        const.KEY_ADJUSTED_SKIP_N_ROWS: 1,
+        const._ARG_VERBOSE: False,
+        const._ARG_REVERSE_PRIMER: "",
+        const._ARG_NAME_INDEX: 1,
+        const._ARG_SEQ_INDEX: 24,
+        const._ARG_WARN_NULL_DATA: False,
+    }
+    expected_report_1 = main(
+        input_file=input_file,
+        output_file=tmp_path / "expected_1.tsv",
+        forward_primer="",
+        reverse_complement_flag=True,
+        **main_kwargs,
+    )
+    expected_report_2 = main(
+        input_file=input_file,
+        output_file=tmp_path / "expected_2.tsv",
+        forward_primer="AATGATACGGCGACCACCGATCCTGCGCCTTCTCTCC",
+        reverse_complement_flag=False,
+        **main_kwargs,
+    )
+
+    # When
+    summary = batch_main(manifest_file, summary_file, workers=workers)
+
+    # Then
+    assert json.loads(summary_file.read_text()) == summary
+    assert summary["jobs"] == 2
+    assert summary["succeeded"] == 2
+    assert summary["failed"] == 0
+    assert summary["rows"] == expected_report_1.row_count * 2
+    assert [result["report"] for result in summary["results"]] == [
+        expected_report_1.to_dict(),
+        expected_report_2.to_dict(),
+    ]
+    for job_index in (1, 2):
+        output = (tmp_path / f"library_{job_index}.tsv").read_text().splitlines()
+        expected = (tmp_path / f"expected_{job_index}.tsv").read_text().splitlines()
+        assert output[0].startswith(
+            f"## pyquest_library_converter.py {input_file} {tmp_path / f'library_{job_index}.tsv'}"
+        )
+        # Skip the command comment
+        assert output[1:] == expected[1:]
+
+
+def test_batch_main__failed_job_does_not_stop_others(tmp_path: Path):
+    # Given
+    input_file = test_data.get.example_data_1_csv()
+    manifest_file = _write_manifest(
+        tmp_path,
+        {
+            "defaults": {"name-header": "oligo_name"},
+            "jobs": [
+                {
+                    "input": str(input_file),
+                    "output": str(tmp_path / "library_1.tsv"),
+                    "sequence-header": "not_a_column",
+                },
+                {
+                    "input": str(input_file),
+                    "output": str(tmp_path / "library_2.tsv"),
+                    "sequence-header": "mseq",
+                },
+            ],
+        },
+    )
+    summary_file = tmp_path / "summary.json"
+
+    # When
+    summary = batch_main(manifest_file, summary_file, workers=2)
+
+    # Then
+    assert summary["succeeded"] == 1
+    assert summary["failed"] == 1
+    failed_result, succeeded_result = summary["results"]
+    assert failed_result["status"] == "failed"
+    assert failed_result["error"].startswith("ValidationError:")
+    assert failed_result["report"] is None
+    assert succeeded_result["status"] == "succeeded"
+    assert not (tmp_path / "library_1.tsv").exists()
+    assert (tmp_path / "library_2.tsv").exists()
@@ -0,0 +1,145 @@
+from pathlib import Path
+import json
+
+import pytest
+
+from src.benchmark import SyntheticLibrary, compare_to_baseline
+from src.dna.helpers import reverse_complement
+from src.enums import OligoCasing
+from src.exceptions import ValidationError
+from src.stage_timer import StageTimer
+from pyquest_library_benchmark import benchmark_main
+
+
+def test_synthetic_library__is_reproducible():
+    # Given
+    library = SyntheticLibrary(
+        row_count=1000,
+        oligo_length=80,
+        reverse_fraction=0.25,
+        casing=OligoCasing.LOWER,
+        null_fraction=0.1,
+        seed=1,
+    )
+    forward_primer = library.forward_primer.lower()
+    reverse_complement_primer = reverse_complement(library.reverse_primer).lower()
+
+    # When
+    oligos = list(library.iter_oligos())
+
+    # Then
+    assert oligos == list(library.iter_oligos())
+    assert len(oligos) == 1000
+    not_null_oligos = [oligo for oligo in oligos if oligo]
+    assert 50 < 1000 - len(not_null_oligos) < 150
+    assert all(len(oligo) == 80 for oligo in not_null_oligos)
+    assert all(oligo == oligo.lower() for oligo in not_null_oligos)
+    reverse_oligos = [
+        oligo
+        for oligo in not_null_oligos
+        if oligo.startswith(reverse_complement_primer)
+    ]
+    assert 150 < len(reverse_oligos) < 300
+    assert all(
+        oligo.startswith(forward_primer)
+        for oligo in not_null_oligos
+        if oligo not in reverse_oligos
+    )
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        pytest.param({"row_count": 0}, id="no_rows"),
+        pytest.param({"oligo_length": 40}, id="shorter_than_primers"),
+        pytest.param({"reverse_fraction": 1.5}, id="reverse_fraction"),
+        pytest.param({"null_fraction": -0.1}, id="null_fraction"),
+        pytest.param({"casing": OligoCasing.NONE}, id="casing"),
+    ],
+)
+def test_synthetic_library__invalid_raises(kwargs):
+    with pytest.raises(ValidationError):
+        SyntheticLibrary(**{"row_count": 10, "oligo_length": 100, **kwargs})
+
+
+def test_stage_timer__excludes_nested_stages():
+    # Given
+    stage_timer = StageTimer()
+
+    # When
+    with stage_timer.stage("outer"):
+        with stage_timer.stage("inner"):
+            pass
+        rows = list(stage_timer.time_rows("rows", iter(range(3))))
+
+    # Then
+    assert rows == [0, 1, 2]
+    assert set(stage_timer.seconds) == {"outer", "inner", "rows"}
+    assert all(seconds >= 0 for seconds in stage_timer.seconds.values())
+    assert set(stage_timer.peak_rss_bytes) == {"outer", "inner", "rows"}
+
+
+def test_compare_to_baseline():
+    # Given
+    def _results(seconds):
+        return {
+            "cases": [
+                {
+                    "case": "case_1",
+                    "median_seconds": seconds,
+                    "median_stage_seconds": {"scan": seconds / 2},
+                }
+            ]
+        }
+
+    # When
+    lines, regressions = compare_to_baseline(_results(1.25), _results(1.0), 0.2)
+    _, no_regressions = compare_to_baseline(_results(1.1), _results(1.0), 0.2)
+
+    # Then
+    assert lines == [
+        "case_1: 1.250s vs 1.000s (1.25x)",
+        "  scan: 0.625s vs 0.500s (1.25x)",
+    ]
+    assert regressions == ["case_1"]
+    assert no_regressions == []
+
+
+def test_benchmark_main(tmp_path: Path):
+    # Given
+    results_file = tmp_path / "benchmark.json"
+
+    # When
+    results, regressions = benchmark_main(
+        results_file,
+        row_counts=[200, 400],
+        oligo_lengths=[100],
+        reverse_fraction=0.5,
+        null_fraction=0.05,
+        repeat=2,
+        converter_args=["--index", str(tmp_path / "library.index")],
+        work_dir=tmp_path,
+        baseline_file=None,
+    )
+
+    # Then
+    assert json.loads(results_file.read_text()) == results
+    assert regressions == []
+    assert [len(case["runs"]) for case in results["cases"]] == [2, 2]
+    case = results["cases"][0]
+    assert set(case["median_stage_seconds"]) == {
+        "sniff",
+        "header_scan",
+        "read",
+        "scan",
+        "trim",
+        "write",
+        "index",
+    }
+    assert 180 < case["runs"][0]["rows"] < 200
+    assert case["rows_per_second"] > 0
+    # The synthetic libraries and outputs are not kept
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "benchmark.json",
+        "library.index",
+    ]
@@ -0,0 +1,176 @@
+from pathlib import Path
+import bz2
+import gzip
+
+import pytest
+
+from tests import test_data
+from src.csv.compression import (
+    BGZFWriter,
+    compress_bgzf_block,
+    detect_compression,
+    open_input,
+)
+from src.csv.csv_reader import CSVReaderFactory
+from src.csv.write import atomic_output_file
+from src.enums import Compression
+from src.exceptions import ValidationError
+from pyquest_library_converter import main
+from src import constants as const
+
+
+def _bgzip(data: bytes) -> bytes:
+    blocks = [
+        compress_bgzf_block(data[i : i + 0xFF00], level=6)
+        for i in range(0, len(data), 0xFF00)
+    ]
+    return b"".join(blocks) + compress_bgzf_block(b"", level=6)
+
+
+COMPRESSORS = {
+    Compression.NONE: lambda data: data,
+    Compression.GZIP: gzip.compress,
+    Compression.BGZIP: _bgzip,
+    Compression.BZIP2: bz2.compress,
+}
+
+
+def _write_compressed(source: Path, target_dir: Path, compression: Compression) -> Path:
+    target = target_dir / f"{source.name}.{compression.value}"
+    target.write_bytes(COMPRESSORS[compression](source.read_bytes()))
+    return target
+
+
+def test_compress_bgzf_block__empty_block_is_eof_marker():
+    # Given
+    bgzf_eof_marker = bytes.fromhex(
+        "1f8b08040000000000ff0600424302001b0003000000000000000000"
+    )
+
+    # When
+    block = compress_bgzf_block(b"", level=6)
+
+    # Then
+    assert block == bgzf_eof_marker
+
+
+@pytest.mark.parametrize("compression", list(COMPRESSORS))
+def test_detect_compression(tmp_path: Path, compression: Compression):
+    # Given
+    source = test_data.get.example_data_1_csv()
+    input_file = _write_compressed(source, tmp_path, compression)
+
+    # When
+    detected = detect_compression(input_file)
+
+    # Then
+    assert detected == compression
+
+
+def test_open_input__zstd_raises(tmp_path: Path):
+    # Given
+    input_file = tmp_path / "example.csv.zst"
+    input_file.write_bytes(b"\x28\xb5\x2f\xfd" + b"\x00" * 16)
+
+    # When / Then
+    assert detect_compression(input_file) == Compression.ZSTD
+    with pytest.raises(ValidationError, match="zstd"):
+        open_input(input_file)
+
+
+@pytest.mark.parametrize("compression", list(COMPRESSORS))
+@pytest.mark.parametrize("skip_n_rows", [0, 3])
+def test_csv_reader__compressed_input_reads_same_rows(
+    tmp_path: Path, compression: Compression, skip_n_rows: int
+):
+    # Given
+    source = test_data.get.example_data_3_csv_w_file_and_column_headers()
+    input_file = _write_compressed(source, tmp_path, compression)
+
+    # When
+    with CSVReaderFactory(source, skip_n_rows).get_csv_reader() as csv_reader:
+        expected_rows = list(csv_reader)
+    with CSVReaderFactory(input_file, skip_n_rows).get_csv_reader() as csv_reader:
+        rows = list(csv_reader)
+
+    # Then
+    assert rows == expected_rows
+
+
+@pytest.mark.parametrize("threads", [1, 4])
+@pytest.mark.parametrize("compression", [Compression.GZIP, Compression.BGZIP])
+def test_atomic_output_file__compressed_output(
+    tmp_path: Path, compression: Compression, threads: int
+):
+    # Given
+    output_file = tmp_path / "output.tsv.gz"
+    # Spans several BGZF blocks
+    lines = [f"oligo_{i}\tACGT\n" for i in range(50_000)]
+
+    # When
+    with atomic_output_file(
+        output_file, compression=compression, threads=threads
+    ) as output:
+        output.writelines(lines)
+
+    # Then
+    assert detect_compression(output_file) == compression
+    assert gzip.decompress(output_file.read_bytes()).decode() == "".join(lines)
+    assert list(tmp_path.iterdir()) == [output_file]
+
+
+def test_bgzf_writer__ends_with_eof_marker(tmp_path: Path):
+    # Given
+    output_file = tmp_path / "output.gz"
+
+    # When
+    with open(output_file, "wb") as raw:
+        with BGZFWriter(raw, threads=2) as writer:
+            writer.write(b"ACGT\n" * 100_000)
+
+    # Then
+    data = output_file.read_bytes()
+    assert data.endswith(compress_bgzf_block(b"", level=6))
+    assert gzip.decompress(data) == b"ACGT\n" * 100_000
+
+
+@pytest.mark.parametrize("output_compression", [Compression.NONE, Compression.BGZIP])
+@pytest.mark.parametrize(
+    "input_compression", [Compression.NONE, Compression.GZIP, Compression.BZIP2]
+)
+def test_main__compressed_input_and_output(
+    tmp_path: Path,
+    input_compression: Compression,
+    output_compression: Compression,
+):
+    # Given
+    source = test_data.get.example_data_3_csv_w_file_and_column_headers()
+    input_file = _write_compressed(source, tmp_path, input_compression)
+    expected_output_file = tmp_path / "expected.tsv"
+    output_file = tmp_path / "output.tsv"
+    kwargs = {
+        # Skip the file header rows and the column header row
+        const.KEY_ADJUSTED_SKIP_N_ROWS: 3,
+        const._ARG_VERBOSE: False,
+        const._ARG_FORWARD_PRIMER: "",
+        const._ARG_REVERSE_PRIMER: "",
+        const._ARG_NAME_INDEX: 1,
+        const._ARG_SEQ_INDEX: 24,
+        const._ARG_REVERSE_COMPLEMENT_FLAG: False,
+        const._ARG_WARN_NULL_DATA: False,
+        const._ARG_CPUS: 2,
+    }
+
+    # When
+    main(input_file=source, output_file=expected_output_file, **kwargs)
+    main(
+        input_file=input_file,
+        output_file=output_file,
+        output_compression=output_compression,
+        **kwargs,
+    )
+
+    # Then
+    assert detect_compression(output_file) == output_compression
+    with open_input(output_file) as output:
+        assert output.read() == expected_output_file.read_text()
@@ -0,0 +1,151 @@
+from pathlib import Path
+import itertools
+import operator
+import random
+
+import pytest
+
+from src.duplicates import Duplicate, DuplicateDetector, _get_segment_bounds
+from src.enums import DuplicateKind
+from pyquest_library_converter import main
+from src import constants as const
+
+
+def _find_duplicates_brute_force(sequences, max_mismatches):
+    exact_groups = {}
+    for row_id, sequence in enumerate(sequences, 1):
+        exact_groups.setdefault(sequence, []).append(row_id)
+    near_pairs = set()
+    for (row_id, sequence), (other_row_id, other_sequence) in itertools.combinations(
+        enumerate(sequences, 1), 2
+    ):
+        if len(sequence) != len(other_sequence):
+            continue
+        mismatches = sum(map(operator.ne, sequence, other_sequence))
+        if 0 < mismatches <= max_mismatches:
+            near_pairs.add((mismatches, (row_id, other_row_id)))
+    return (
+        sorted(tuple(row_ids) for row_ids in exact_groups.values() if len(row_ids) > 1),
+        near_pairs,
+    )
+
+
+@pytest.mark.parametrize("max_mismatches", [0, 1, 2])
+@pytest.mark.parametrize("expected_row_count", [0, 250_000, 1_000_000])
+def test_duplicate_detector__matches_brute_force(max_mismatches, expected_row_count):
+    # Given
+    random.seed(max_mismatches)
+    sequences = []
+    for _ in range(300):
+        if sequences and random.random() < 0.3:
+            sequence = list(random.choice(sequences))
+            for _ in range(random.randint(0, 3)):
+                if sequence:
+                    sequence[random.randrange(len(sequence))] = random.choice("ACGT")
+            sequences.append("".join(sequence))
+        else:
+            sequences.append("".join(random.choices("ACGT", k=random.randint(0, 8))))
+    expected_exact, expected_near = _find_duplicates_brute_force(
+        sequences, max_mismatches
+    )
+
+    # When
+    with DuplicateDetector(max_mismatches, expected_row_count) as detector:
+        for row_id, sequence in enumerate(sequences, 1):
+            detector.add(row_id, sequence)
+        duplicates = list(detector.iter_duplicates())
+
+    # Then
+    exact = [d.row_ids for d in duplicates if d.kind == DuplicateKind.EXACT]
+    near = [
+        (d.mismatches, d.row_ids) for d in duplicates if d.kind == DuplicateKind.NEAR
+    ]
+    assert sorted(exact) == expected_exact
+    assert len(near) == len(set(near))
+    assert set(near) == expected_near
+    assert detector.exact_group_count == len(expected_exact)
+    assert detector.exact_row_count == sum(map(len, expected_exact))
+    assert detector.near_pair_count == len(expected_near)
+
+
+def test_get_segment_bounds():
+    assert _get_segment_bounds(10, 0) == [(0, 10)]
+    assert _get_segment_bounds(10, 2) == [(0, 3), (3, 6), (6, 10)]
+    assert _get_segment_bounds(2, 2) == [(0, 0)]
+
+
+def test_duplicate_detector__add_rows_and_summary():
+    # Given
+    rows = [
+        (1, "oligo_1", "AAAACCCC"),
+        (2, "oligo_2", "AAAACCCC"),
+        (3, "oligo_3", "AAAACCCG"),
+        (4, "oligo_4", "GGGGTTTT"),
+    ]
+    detector = DuplicateDetector(max_mismatches=1)
+
+    # When
+    passed_rows = list(detector.add_rows(rows))
+    duplicates = list(detector.iter_duplicates())
+    detector.close()
+
+    # Then
+    assert passed_rows == rows
+    assert duplicates == [
+        Duplicate(DuplicateKind.EXACT, 0, (1, 2)),
+        Duplicate(DuplicateKind.NEAR, 1, (1, 3)),
+        Duplicate(DuplicateKind.NEAR, 1, (2, 3)),
+    ]
+    assert detector.summary() == [
+        "Exact duplicate sequences found in 1 groups of 2 of 4 sequences.",
+        "Near duplicate sequences within 1 mismatches found in 2 pairs.",
+    ]
+
+
+def test_duplicate_detector__negative_mismatches_raise():
+    with pytest.raises(ValueError):
+        DuplicateDetector(max_mismatches=-1)
+
+
+def test_main__with_duplicates(tmp_path: Path):
+    # Given
+    sequences = ["AAAACCCCGGGG", "AAAACCCCGGGG", "AAAACCCCGGGT", "TTTTGGGGCCCC"]
+    input_file = tmp_path / "library.csv"
+    input_file.write_text(
+        "oligo_name,mseq\n"
+        + "".join(f"oligo_{i},{sequence}\n" for i, sequence in enumerate(sequences, 1))
+    )
+    output_file = tmp_path / "library.pyquest.tsv"
+    duplicates_file = tmp_path / "library.duplicates.tsv"
+
+    # When
+    report = main(
+        input_file=input_file,
+        output_file=output_file,
+        adjusted_skip_n_rows=1,
+        verbose=False,
+        forward_primer="",
+        reverse_primer="",
+        name_index=1,
+        sequence_index=2,
+        reverse_complement_flag=False,
+        warn_null_data=False,
+        duplicate_max_mismatches=1,
+        duplicates_file=duplicates_file,
+    )
+
+    # Then
+    duplicate_lines = duplicates_file.read_text().splitlines()
+    assert duplicate_lines[1] == "\t".join(const._DUPLICATE_HEADERS)
+    assert duplicate_lines[2:] == [
+        "exact\t0\t1,2",
+        "near\t1\t1,3",
+        "near\t1\t2,3",
+    ]
+    assert report.exact_duplicate_groups == 1
+    assert report.exact_duplicate_rows == 2
+    assert report.near_duplicate_pairs == 2
+    assert (
+        "Near duplicate sequences within 1 mismatches found in 2 pairs."
+        in report.summary()
+    )
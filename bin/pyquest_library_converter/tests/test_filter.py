@@ -0,0 +1,69 @@
+import pytest
+
+from src.csv.filter import NullRowSplitter, filter_rows, report_null_rows
+from src.exceptions import NullDataError
+
+
+EXAMPLE_ROWS = [
+    ["oligo_1", "ACGT"],
+    ["NA", "ACGT"],
+    ["oligo_3", "ACGT"],
+    ["oligo_4", ""],
+    ["oligo_5", "NULL"],
+    ["oligo_6", "ACGT"],
+]
+
+
+def test_null_row_splitter__partitions_rows():
+    # Given
+    rows = filter_rows(iter(EXAMPLE_ROWS), name_index=1, sequence_index=2)
+    null_row_splitter = NullRowSplitter(rows)
+
+    # When
+    not_null_rows = list(null_row_splitter.not_null_rows())
+    null_row_ids = list(null_row_splitter.null_rows())
+
+    # Then
+    assert not_null_rows == [
+        (1, "oligo_1", "ACGT"),
+        (3, "oligo_3", "ACGT"),
+        (6, "oligo_6", "ACGT"),
+    ]
+    assert null_row_ids == [2, 4, 5]
+
+
+def test_null_row_splitter__null_rows_before_exhausted_raises():
+    # Given
+    rows = filter_rows(iter(EXAMPLE_ROWS), name_index=1, sequence_index=2)
+    null_row_splitter = NullRowSplitter(rows)
+    not_null_rows = null_row_splitter.not_null_rows()
+    next(not_null_rows)
+
+    # When / Then
+    with pytest.raises(RuntimeError):
+        null_row_splitter.null_rows()
+
+
+@pytest.mark.parametrize("raise_error", [True, False])
+def test_report_null_rows(raise_error):
+    # Given
+    expected_msg = (
+        "Null values in data rows detected for either the name or sequnce column: 3, 5."
+    )
+
+    # When / Then
+    if raise_error:
+        with pytest.raises(NullDataError, match=expected_msg):
+            report_null_rows([2, 4], start_index=1, raise_error=raise_error)
+    else:
+        with pytest.warns(UserWarning):
+            msg = report_null_rows([2, 4], start_index=1, raise_error=raise_error)
+        assert msg == expected_msg
+
+
+def test_report_null_rows__no_nulls():
+    # When
+    msg = report_null_rows([], start_index=1, raise_error=True)
+
+    # Then
+    assert msg == "No null values detected in data rows."
@@ -16,6 +16,7 @@ from pyquest_library_converter import main
 from src.args.args_parsing import get_argparser
 from src.args.args_cleaner import ArgsCleaner
 from src import constants as const
+from src.enums import Compression, MismatchModel
 from src.exceptions import ValidationError, NullDataError
 
 
@@ -124,6 +125,16 @@ def get_main_kwargs():
             const._ARG_REVERSE_COMPLEMENT_FLAG: False,
             const._ARG_FORCE_HEADER_INDEX: None,
             const._ARG_WARN_NULL_DATA: False,
+            const._ARG_CPUS: 1,
+            const._ARG_PRIMER_SCAN_CONFIDENCE: None,
+            const._ARG_OUTPUT_COMPRESSION: Compression.NONE,
+            const._ARG_PRIMER_PANEL: None,
+            const._ARG_PRIMER_ASSIGNMENTS: None,
+            const._ARG_PRIMER_MAX_MISMATCHES: 0,
+            const._ARG_PRIMER_MISMATCH_MODEL: MismatchModel.HAMMING,
+            const._ARG_INDEX: None,
+            const._ARG_DUPLICATE_MAX_MISMATCHES: None,
+            const._ARG_DUPLICATES: None,
         }
         kwargs = default_kwargs.copy()
         if update_kwargs is not None:
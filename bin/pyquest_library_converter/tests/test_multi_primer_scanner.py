@@ -0,0 +1,266 @@
+from pathlib import Path
+import itertools
+import random
+
+import pytest
+
+from src.dna.aho_corasick import AhoCorasickAutomaton
+from src.dna.helpers import reverse_complement
+from src.dna.multi_primer_scanner import (
+    MultiPrimerScanner,
+    MultiPrimerTransformPlan,
+    PrimerPair,
+    read_primer_panel,
+)
+from src.enums import OligoCasing, PrimerOrientation
+from src.exceptions import ValidationError
+from src.report import Report
+from pyquest_library_converter import main
+from src import constants as const
+
+
+PAIR_A = PrimerPair("A", "AATGATACGGCG", "TCTTCTGCTTG")
+PAIR_B = PrimerPair("B", "CAAGCAGAAGACG", "GTGTAGATCTCG")
+MIDDLE = "CGCCTTCTCTCCTCCTCCTCCACACTCCAGG"
+
+
+def test_aho_corasick_automaton__matches_ends_as_brute_force():
+    # Given
+    random.seed(0)
+    for _ in range(500):
+        patterns = [
+            "".join(random.choices("ACG", k=random.randint(0, 4)))
+            for _ in range(random.randint(1, 6))
+        ]
+        text = "".join(random.choices("ACGT", k=random.randint(0, 8)))
+        automaton = AhoCorasickAutomaton(patterns)
+
+        # When
+        prefix_matches = automaton.prefix_matches(text)
+        suffix_matches = automaton.suffix_matches(text)
+
+        # Then
+        assert sorted(prefix_matches) == [
+            index
+            for index, pattern in enumerate(patterns)
+            if pattern and text.startswith(pattern)
+        ]
+        assert sorted(suffix_matches) == [
+            index
+            for index, pattern in enumerate(patterns)
+            if pattern and text.endswith(pattern)
+        ]
+
+
+@pytest.mark.parametrize(
+    "oligo, expected_pair_index, expected_orientation, expected_trims",
+    [
+        pytest.param(
+            PAIR_A.forward + MIDDLE + PAIR_A.reverse,
+            0,
+            PrimerOrientation.FORWARD,
+            (len(PAIR_A.forward), len(PAIR_A.reverse)),
+            id="pair_a_forward",
+        ),
+        pytest.param(
+            reverse_complement(PAIR_A.forward + MIDDLE + PAIR_A.reverse),
+            0,
+            PrimerOrientation.REVERSE,
+            (len(PAIR_A.reverse), len(PAIR_A.forward)),
+            id="pair_a_reverse",
+        ),
+        pytest.param(
+            PAIR_B.forward + MIDDLE,
+            1,
+            PrimerOrientation.FORWARD,
+            (len(PAIR_B.forward), 0),
+            id="pair_b_forward_primer_only",
+        ),
+        pytest.param(
+            MIDDLE + reverse_complement(PAIR_B.forward),
+            1,
+            PrimerOrientation.REVERSE,
+            (0, len(PAIR_B.forward)),
+            id="pair_b_reverse_end_only",
+        ),
+        pytest.param(
+            PAIR_A.forward + MIDDLE + PAIR_B.reverse,
+            None,
+            PrimerOrientation.AMBIGUOUS,
+            (0, 0),
+            id="mixed_pairs_ambiguous",
+        ),
+        pytest.param(
+            MIDDLE,
+            None,
+            PrimerOrientation.NONE,
+            (0, 0),
+            id="no_primers",
+        ),
+        pytest.param(
+            PAIR_A.forward + MIDDLE + PAIR_A.forward,
+            0,
+            PrimerOrientation.FORWARD,
+            (len(PAIR_A.forward), 0),
+            id="forward_primer_at_wrong_end",
+        ),
+    ],
+)
+def test_multi_primer_scanner__assign(
+    oligo, expected_pair_index, expected_orientation, expected_trims
+):
+    # Given
+    scanner = MultiPrimerScanner([PAIR_A, PAIR_B])
+
+    # When
+    assignment = scanner.assign(oligo)
+
+    # Then
+    assert assignment.pair_index == expected_pair_index
+    assert assignment.orientation == expected_orientation
+    assert (assignment.start_trim, assignment.end_trim) == expected_trims
+
+
+@pytest.mark.parametrize("oligo_case", [OligoCasing.UPPER, OligoCasing.LOWER])
+@pytest.mark.parametrize("reverse_complement_flag", [True, False])
+def test_multi_primer_transform_plan__trims_each_pair(
+    oligo_case, reverse_complement_flag
+):
+    # Given
+    oligos = [
+        PAIR_A.forward + MIDDLE + PAIR_A.reverse,
+        reverse_complement(PAIR_B.forward + MIDDLE + PAIR_B.reverse),
+        MIDDLE,
+    ]
+    expected_sequences = [
+        MIDDLE,
+        reverse_complement(MIDDLE),
+        MIDDLE,
+    ]
+    if reverse_complement_flag:
+        expected_sequences = list(map(reverse_complement, expected_sequences))
+    if oligo_case == OligoCasing.LOWER:
+        oligos = [oligo.lower() for oligo in oligos]
+        expected_sequences = [sequence.lower() for sequence in expected_sequences]
+    rows = [(i, f"oligo_{i}", oligo) for i, oligo in enumerate(oligos, 1)]
+    plan = MultiPrimerTransformPlan(
+        MultiPrimerScanner([PAIR_A, PAIR_B]), reverse_complement_flag, oligo_case
+    )
+    report = Report()
+
+    # When
+    transformed_rows = list(plan.transform_rows(rows, report=report, batch_size=2))
+
+    # Then
+    assert [sequence for _, _, sequence in transformed_rows] == expected_sequences
+    assert list(plan.assignments()) == [
+        ("A", PrimerOrientation.FORWARD),
+        ("B", PrimerOrientation.REVERSE),
+        ("", PrimerOrientation.NONE),
+    ]
+    assert list(report.forward_primers_trimmed) == [1, 2]
+    assert list(report.reverse_primers_trimmed) == [1, 2]
+    assert (
+        "Primer pair 'B' found in the reverse orientation in 1 of 3 sequences."
+        in plan.summary()
+    )
+    assert "No primer pair found in 1 of 3 sequences." in plan.summary()
+
+
+def test_read_primer_panel(tmp_path: Path):
+    # Given
+    panel_file = tmp_path / "panel.tsv"
+    panel_file.write_text(
+        "name\tforward\treverse\n"
+        f"A\t{PAIR_A.forward.lower()}\t{PAIR_A.reverse}\n"
+        f"B\t{PAIR_B.forward}\t\n"
+    )
+
+    # When
+    primer_pairs = read_primer_panel(panel_file)
+
+    # Then
+    assert primer_pairs == [PAIR_A, PrimerPair("B", PAIR_B.forward, "")]
+
+
+@pytest.mark.parametrize(
+    "panel",
+    [
+        pytest.param("name,forward\nA,ACGT\n", id="missing_column"),
+        pytest.param("name,forward,reverse\n", id="no_pairs"),
+        pytest.param("name,forward,reverse\nA,ACGT,\nA,TTTT,\n", id="duplicate_name"),
+        pytest.param("name,forward,reverse\nA,,\n", id="no_primers"),
+    ],
+)
+def test_read_primer_panel__invalid_raises(tmp_path: Path, panel: str):
+    # Given
+    panel_file = tmp_path / "panel.csv"
+    panel_file.write_text(panel)
+
+    # When / Then
+    with pytest.raises(ValidationError):
+        read_primer_panel(panel_file)
+
+
+def test_main__with_primer_panel(tmp_path: Path):
+    # Given
+    oligos = list(
+        itertools.islice(
+            itertools.cycle(
+                [
+                    PAIR_A.forward + MIDDLE + PAIR_A.reverse,
+                    reverse_complement(PAIR_A.forward + MIDDLE + PAIR_A.reverse),
+                    PAIR_B.forward + MIDDLE + PAIR_B.reverse,
+                ]
+            ),
+            30,
+        )
+    )
+    input_file = tmp_path / "library.csv"
+    input_file.write_text(
+        "oligo_name,mseq\n"
+        + "".join(f"oligo_{i},{oligo}\n" for i, oligo in enumerate(oligos, 1))
+    )
+    output_file = tmp_path / "library.pyquest.tsv"
+    assignments_file = tmp_path / "library.primers.tsv"
+
+    # When
+    report = main(
+        input_file=input_file,
+        output_file=output_file,
+        adjusted_skip_n_rows=1,
+        verbose=False,
+        forward_primer="",
+        reverse_primer="",
+        name_index=1,
+        sequence_index=2,
+        reverse_complement_flag=False,
+        warn_null_data=False,
+        primer_panel=[PAIR_A, PAIR_B],
+        primer_assignments_file=assignments_file,
+    )
+
+    # Then
+    output_rows = [
+        line.split("\t") for line in output_file.read_text().splitlines()[2:]
+    ]
+    assert [sequence for _, _, sequence in output_rows] == [
+        MIDDLE,
+        reverse_complement(MIDDLE),
+        MIDDLE,
+    ] * 10
+    assignment_lines = assignments_file.read_text().splitlines()
+    assert assignment_lines[1] == "\t".join(const._PRIMER_ASSIGNMENT_HEADERS)
+    assert assignment_lines[2:5] == [
+        "1\toligo_1\tA\tforward",
+        "2\toligo_2\tA\treverse",
+        "3\toligo_3\tB\tforward",
+    ]
+    assert report.row_count == 30
+    assert len(report.both_primers_trimmed) == 30
+    summary = report.summary()
+    assert (
+        "Primer pair 'A' found in the reverse orientation in 10 of 30 sequences."
+        in summary
+    )
+    assert "Chosen forward primer" not in summary
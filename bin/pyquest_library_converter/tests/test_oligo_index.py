@@ -0,0 +1,111 @@
+from collections import defaultdict
+from pathlib import Path
+import random
+
+import pytest
+
+from tests import test_data
+from src.oligo_index import OligoIndex, OligoIndexBuilder
+from pyquest_library_converter import main
+
+
+def _build_index(tmp_path: Path, rows) -> Path:
+    index_file = tmp_path / "library.index"
+    index_builder = OligoIndexBuilder()
+    assert list(index_builder.add_rows(rows)) == rows
+    index_builder.write(index_file)
+    return index_file
+
+
+@pytest.mark.parametrize("with_duplicates", [True, False])
+def test_oligo_index__lookup_matches_rows(tmp_path: Path, with_duplicates: bool):
+    # Given
+    random.seed(0)
+    sequence_length = 6 if with_duplicates else 30
+    rows = [
+        (row_id, f"oligo_{row_id}", "".join(random.choices("ACGT", k=sequence_length)))
+        for row_id in range(1, 2001)
+    ]
+    expected_ids = defaultdict(list)
+    for row_id, _, sequence in rows:
+        expected_ids[sequence].append(row_id)
+    assert (len(expected_ids) < len(rows)) == with_duplicates
+
+    # When
+    index_file = _build_index(tmp_path, rows)
+
+    # Then
+    with OligoIndex(index_file) as oligo_index:
+        assert oligo_index.row_count == len(rows)
+        assert oligo_index.group_count == len(expected_ids)
+        for sequence, row_ids in expected_ids.items():
+            assert oligo_index.lookup(sequence) == tuple(row_ids)
+        assert oligo_index.lookup("A" * 40) == ()
+        assert list(oligo_index.iter_groups()) == [
+            (sequence, tuple(row_ids)) for sequence, row_ids in expected_ids.items()
+        ]
+        assert oligo_index.length_counts() == {sequence_length: len(rows)}
+
+
+def test_oligo_index__length_statistics(tmp_path: Path):
+    # Given
+    rows = [(1, "a", "ACGT"), (2, "b", "AC"), (3, "c", "ACGT"), (4, "d", "")]
+    index_builder = OligoIndexBuilder()
+    list(index_builder.add_rows(rows))
+
+    # When
+    index_file = tmp_path / "library.index"
+    index_builder.write(index_file)
+
+    # Then
+    assert index_builder.summary() == [
+        "Oligo index has 3 distinct sequences for 4 sequences, with 1 duplicated sequences shared by 2 sequences.",
+        "Oligo sequence lengths: min 0, mean 2.5, max 4.",
+    ]
+    with OligoIndex(index_file) as oligo_index:
+        assert (oligo_index.min_length, oligo_index.max_length) == (0, 4)
+        assert oligo_index.mean_length == 2.5
+        assert oligo_index.length_counts() == {0: 1, 2: 1, 4: 2}
+        assert oligo_index.lookup("") == (4,)
+
+
+def test_oligo_index__not_an_index_raises(tmp_path: Path):
+    # Given
+    not_index_file = tmp_path / "library.tsv"
+    not_index_file.write_text("#id\tname\tsequence\n" * 20)
+
+    # When / Then
+    with pytest.raises(ValueError):
+        OligoIndex(not_index_file)
+
+
+def test_main__with_index(tmp_path: Path):
+    # Given
+    input_file = test_data.get.example_data_1_csv()
+    output_file = tmp_path / "library.tsv"
+    index_file = tmp_path / "library.index"
+
+    # When
+    report = main(
+        input_file=input_file,
+        output_file=output_file,
+        adjusted_skip_n_rows=1,
+        verbose=False,
+        forward_primer="",
+        reverse_primer="",
+        name_index=1,
+        sequence_index=24,
+        reverse_complement_flag=False,
+        warn_null_data=False,
+        index_file=index_file,
+    )
+
+    # Then
+    output_rows = [
+        line.split("\t") for line in output_file.read_text().splitlines()[2:]
+    ]
+    with OligoIndex(index_file) as oligo_index:
+        assert oligo_index.row_count == report.row_count == len(output_rows)
+        for row_id, _, sequence in output_rows:
+            assert int(row_id) in oligo_index.lookup(sequence)
+    assert any(line.startswith("Oligo index has") for line in report.scanning_summary)
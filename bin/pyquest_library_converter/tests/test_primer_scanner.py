@@ -4,7 +4,9 @@ import string
 import pytest
 
 from src.dna.primer_scanner import PrimerScanner
+from src.enums import MismatchModel
 from src.dna.helpers import find_invalid_chars_in_dna_sequence, reverse_complement
+from src.exceptions import ValidationError, UndevelopedFeatureError
 
 EXAMPLE_CSV_HEADER = "sequence"
 
@@ -591,3 +593,295 @@ def test_find_invalid_chars_in_dna_sequence(
     assert actual_allow_n == expected_allow_n
     assert actual_allow_lower == expected_allow_lower
     assert actual_allow_both == expected_allow_both
+
+
+ALL_CASES = (
+    TYPICAL_CASES + NON_MATCHING_PRIMERS_CASES + MIXTURE_ORGINAL_AND_REVCOMP_CASES
+)
+
+
+@pytest.mark.parametrize(
+    "test_case", [pytest.param(case, id=case["name"]) for case in ALL_CASES]
+)
+@pytest.mark.parametrize("chunk_size", [1, 2, 10_000])
+def test_primer_scanner__scan_all__chunk_size_invariant(test_case, chunk_size):
+    # Given
+    oligos = test_case["oligos"] + [oligo.lower() for oligo in test_case["oligos"]]
+    reference_scanner = PrimerScanner(
+        forward_primer=test_case["forward_primer"],
+        reverse_primer=test_case["reverse_primer"],
+    )
+    reference_scanner.scan_all(oligos, chunk_size=len(oligos))
+    scanner = PrimerScanner(
+        forward_primer=test_case["forward_primer"],
+        reverse_primer=test_case["reverse_primer"],
+    )
+
+    # When
+    scanner.scan_all(iter(oligos), chunk_size=chunk_size)
+
+    # Then
+    assert scanner.summary() == reference_scanner.summary()
+    assert scanner.predict_forward_primer() == test_case["expected_forward_primer"]
+    assert scanner.predict_reverse_primer() == test_case["expected_reverse_primer"]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 10_000])
+@pytest.mark.parametrize(
+    "invalid_oligo_index, expect_initial_rows_detail",
+    [(0, True), (4, True), (5, False), (9, False)],
+)
+def test_primer_scanner__invalid_chars_in_initial_rows(
+    chunk_size, invalid_oligo_index, expect_initial_rows_detail
+):
+    # Given
+    oligos = ["ACGT"] * 10
+    oligos[invalid_oligo_index] = "ACZT"
+    scanner = PrimerScanner(forward_primer="", reverse_primer="")
+    scanner.scan_all(oligos, chunk_size=chunk_size)
+
+    # When
+    with pytest.raises(ValidationError) as excinfo:
+        scanner.raise_errors()
+
+    # Then
+    assert ("first 5 rows" in str(excinfo.value)) == expect_initial_rows_detail
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 10_000])
+def test_primer_scanner__primer_not_at_ends_raises(chunk_size):
+    # Given
+    middle_oligo = TEMPLATE_OLIGO.format(
+        fwd=EXAMPLE_MIDDLE_OLIGO_3,
+        middle=EXAMPLE_FWD_PRIMER,
+        rev=EXAMPLE_MIDDLE_OLIGO_3,
+    )
+    oligos = [EXAMPLE_FWD_PRIMER + EXAMPLE_MIDDLE_OLIGO_1] * 3 + [middle_oligo]
+    scanner = PrimerScanner(forward_primer=EXAMPLE_FWD_PRIMER, reverse_primer="")
+
+    # When / Then
+    with pytest.raises(UndevelopedFeatureError, match="not found at either end"):
+        scanner.scan_all(oligos, chunk_size=chunk_size)
+
+
+@pytest.mark.parametrize(
+    "test_case", [pytest.param(case, id=case["name"]) for case in ALL_CASES]
+)
+def test_primer_scanner__scan_all__processes_invariant(test_case):
+    # Given
+    oligos = test_case["oligos"] * 3
+    reference_scanner = PrimerScanner(
+        forward_primer=test_case["forward_primer"],
+        reverse_primer=test_case["reverse_primer"],
+    )
+    reference_scanner.scan_all(oligos)
+    scanner = PrimerScanner(
+        forward_primer=test_case["forward_primer"],
+        reverse_primer=test_case["reverse_primer"],
+    )
+
+    # When
+    scanner.scan_all(iter(oligos), chunk_size=2, processes=2)
+
+    # Then
+    assert scanner.summary() == reference_scanner.summary()
+    assert scanner.predict_forward_primer() == test_case["expected_forward_primer"]
+    assert scanner.predict_reverse_primer() == test_case["expected_reverse_primer"]
+
+
+@pytest.mark.parametrize("invalid_oligo_index", [3, 7])
+def test_primer_scanner__scan_all__processes_invalid_chars_in_initial_rows(
+    invalid_oligo_index,
+):
+    # Given
+    oligos = ["ACGT"] * 10
+    oligos[invalid_oligo_index] = "ACZT"
+    reference_scanner = PrimerScanner(forward_primer="", reverse_primer="")
+    reference_scanner.scan_all(oligos)
+    scanner = PrimerScanner(forward_primer="", reverse_primer="")
+    scanner.scan_all(oligos, chunk_size=2, processes=2)
+
+    # When
+    with pytest.raises(ValidationError) as reference_excinfo:
+        reference_scanner.raise_errors()
+    with pytest.raises(ValidationError) as excinfo:
+        scanner.raise_errors()
+
+    # Then
+    assert str(excinfo.value) == str(reference_excinfo.value)
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_primer_scanner__scan_all__confidence_stops_primer_search_early(processes):
+    # Given
+    oligo = TEMPLATE_OLIGO.format(
+        fwd=EXAMPLE_FWD_PRIMER, middle=EXAMPLE_MIDDLE_OLIGO_1, rev=EXAMPLE_REV_PRIMER
+    )
+    oligos = [oligo] * 30
+    oligos[25] = oligo.replace("A", "Z", 1)
+    scanner = PrimerScanner(
+        forward_primer=EXAMPLE_FWD_PRIMER, reverse_primer=EXAMPLE_REV_PRIMER_REVCOMP
+    )
+
+    # When
+    scanner.scan_all(
+        oligos,
+        chunk_size=5,
+        processes=processes,
+        confidence=0.99,
+        min_sample_size=10,
+    )
+
+    # Then
+    summary = scanner.summary()
+    assert scanner.predict_forward_primer() == EXAMPLE_FWD_PRIMER
+    assert scanner.predict_reverse_primer() == EXAMPLE_REV_PRIMER
+    assert "Total sequences processed: 30" in summary
+    assert "Forward primer found 10 times in 10 sequences scanned." in summary
+    assert (
+        "Primer search stopped early after 10 of 30 sequences, at 99.0% confidence."
+        in summary
+    )
+    with pytest.raises(ValidationError, match="invalid characters"):
+        scanner.raise_errors()
+
+
+def test_primer_scanner__scan_all__confidence_stops_counting_primers(monkeypatch):
+    # Given
+    oligo = TEMPLATE_OLIGO.format(
+        fwd=EXAMPLE_FWD_PRIMER, middle=EXAMPLE_MIDDLE_OLIGO_1, rev=EXAMPLE_REV_PRIMER
+    )
+    scanner = PrimerScanner(
+        forward_primer=EXAMPLE_FWD_PRIMER, reverse_primer=EXAMPLE_REV_PRIMER_REVCOMP
+    )
+    counted_chunk_sizes = []
+    count_primer_pairs_chunk = PrimerScanner._count_primer_pairs_chunk
+
+    def _count_primer_pairs_chunk(self, clean_oligos):
+        counted_chunk_sizes.append(len(clean_oligos))
+        return count_primer_pairs_chunk(self, clean_oligos)
+
+    monkeypatch.setattr(
+        PrimerScanner, "_count_primer_pairs_chunk", _count_primer_pairs_chunk
+    )
+
+    # When
+    scanner.scan_all([oligo] * 30, chunk_size=5, confidence=0.99, min_sample_size=10)
+
+    # Then only the chunks before stopping have their primers counted
+    assert counted_chunk_sizes == [5, 5]
+    assert scanner.predict_forward_primer() == EXAMPLE_FWD_PRIMER
+    assert scanner.predict_reverse_primer() == EXAMPLE_REV_PRIMER
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+@pytest.mark.parametrize(
+    "unsupported_oligo, match",
+    [
+        pytest.param(
+            TEMPLATE_OLIGO.format(
+                fwd=EXAMPLE_MIDDLE_OLIGO_3,
+                middle=EXAMPLE_FWD_PRIMER,
+                rev=EXAMPLE_MIDDLE_OLIGO_3,
+            ),
+            "not found at either end",
+            id="primer_not_at_ends",
+        ),
+        pytest.param(
+            TEMPLATE_OLIGO.format(
+                fwd=EXAMPLE_FWD_PRIMER,
+                middle=EXAMPLE_MIDDLE_OLIGO_1,
+                rev=EXAMPLE_FWD_PRIMER_REVCOMP,
+            ),
+            "both the original primer and a reverse",
+            id="original_and_revcomp",
+        ),
+    ],
+)
+def test_primer_scanner__scan_all__confidence_still_raises_after_stopping(
+    processes, unsupported_oligo, match
+):
+    # Given an unsupported oligo after the primer search has stopped
+    oligo = TEMPLATE_OLIGO.format(
+        fwd=EXAMPLE_FWD_PRIMER, middle=EXAMPLE_MIDDLE_OLIGO_1, rev=EXAMPLE_REV_PRIMER
+    )
+    oligos = [oligo] * 30
+    oligos[25] = unsupported_oligo
+    scanner = PrimerScanner(
+        forward_primer=EXAMPLE_FWD_PRIMER, reverse_primer=EXAMPLE_REV_PRIMER_REVCOMP
+    )
+
+    # When / Then
+    with pytest.raises(UndevelopedFeatureError, match=match):
+        scanner.scan_all(
+            oligos,
+            chunk_size=5,
+            processes=processes,
+            confidence=0.99,
+            min_sample_size=10,
+        )
+
+
+def test_primer_scanner__scan_all__confidence_scans_all_when_undecided():
+    # Given
+    oligos = [
+        TEMPLATE_OLIGO.format(fwd=fwd, middle=EXAMPLE_MIDDLE_OLIGO_1, rev="")
+        for fwd in [EXAMPLE_FWD_PRIMER, EXAMPLE_FWD_PRIMER_REVCOMP] * 15
+    ]
+    reference_scanner = PrimerScanner(
+        forward_primer=EXAMPLE_FWD_PRIMER, reverse_primer=""
+    )
+    reference_scanner.scan_all(oligos)
+    scanner = PrimerScanner(forward_primer=EXAMPLE_FWD_PRIMER, reverse_primer="")
+
+    # When
+    scanner.scan_all(oligos, chunk_size=5, confidence=0.99, min_sample_size=10)
+
+    # Then
+    assert scanner.summary() == reference_scanner.summary()
+
+
+def _substitute(sequence: str, index: int) -> str:
+    base = "A" if sequence[index] != "A" else "C"
+    return sequence[:index] + base + sequence[index + 1 :]
+
+
+@pytest.mark.parametrize("mismatch_model", list(MismatchModel))
+@pytest.mark.parametrize("processes", [1, 2])
+def test_primer_scanner__scan_all__with_mismatches(mismatch_model, processes):
+    # Given
+    forward_primers = (
+        [EXAMPLE_FWD_PRIMER] * 6
+        + [_substitute(EXAMPLE_FWD_PRIMER, 3)] * 3
+        + [_substitute(_substitute(EXAMPLE_FWD_PRIMER, 3), 10)]
+    )
+    oligos = [
+        TEMPLATE_OLIGO.format(
+            fwd=fwd, middle=EXAMPLE_MIDDLE_OLIGO_1, rev=EXAMPLE_REV_PRIMER
+        )
+        for fwd in forward_primers
+    ]
+    exact_scanner = PrimerScanner(
+        forward_primer=EXAMPLE_FWD_PRIMER, reverse_primer=EXAMPLE_REV_PRIMER
+    )
+    exact_scanner.scan_all(oligos)
+    scanner = PrimerScanner(
+        forward_primer=EXAMPLE_FWD_PRIMER,
+        reverse_primer=EXAMPLE_REV_PRIMER,
+        max_mismatches=1,
+        mismatch_model=mismatch_model,
+    )
+
+    # When
+    scanner.scan_all(oligos, chunk_size=3, processes=processes)
+
+    # Then
+    exact_summary = exact_scanner.summary()
+    summary = scanner.summary()
+    assert "Forward primer found 6 times in 10 sequences scanned." in exact_summary
+    assert "Forward primer found 9 times in 10 sequences scanned." in summary
+    assert (
+        "Chosen forward primer found with 0 mismatches (6), 1 mismatch (3)." in summary
+    )
+    assert "Chosen reverse primer found with 0 mismatches (10)." in summary
+    assert scanner.predict_forward_primer() == EXAMPLE_FWD_PRIMER
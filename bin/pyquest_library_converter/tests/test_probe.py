@@ -0,0 +1,184 @@
+import csv
+import os
+from pathlib import Path
+
+import pytest
+
+from tests import test_data
+from src.csv import probe as csv_probe
+from src.csv.probe import count_lines, get_csv_file_probe, scan_lines
+from src.csv.csv_helper import CSVHelper
+from src.csv.csv_reader import CSVReaderFactory
+
+
+EXAMPLE_CSV = "##file_header\noligo_name,sequence\noligo_1,ACGT\noligo_2,TGCA\n"
+EXAMPLE_TSV = "oligo_name\tsequence\toffset\noligo_1\tACGT\t1\noligo_2\tTGCA\t2\n"
+
+
+def test_get_csv_file_probe__shared_for_unchanged_file(tmp_path: Path):
+    # Given
+    csv_file = tmp_path / "example.csv"
+    csv_file.write_text(EXAMPLE_CSV)
+
+    # When
+    probe = get_csv_file_probe(csv_file)
+    same_probe = get_csv_file_probe(str(csv_file))
+
+    # Then
+    assert probe is same_probe
+    assert probe.dialect is same_probe.dialect
+
+
+def test_get_csv_file_probe__renewed_for_rewritten_file(tmp_path: Path):
+    # Given
+    csv_file = tmp_path / "example.csv"
+    csv_file.write_text(EXAMPLE_CSV)
+    probe = get_csv_file_probe(csv_file)
+    assert probe.dialect.delimiter == ","
+    assert probe.first_tabular_row == (1, len("##file_header\n"))
+
+    # When
+    csv_file.write_text(EXAMPLE_TSV)
+    stat = csv_file.stat()
+    os.utime(csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    new_probe = get_csv_file_probe(csv_file)
+
+    # Then
+    assert new_probe is not probe
+    assert new_probe.dialect.delimiter == "\t"
+    assert new_probe.first_tabular_row == (0, 0)
+    assert new_probe.columns_count == 3
+
+
+@pytest.mark.parametrize(
+    "csv_file",
+    [
+        test_data.get.example_data_1_csv(),
+        test_data.get.example_data_3_csv_w_file_and_column_headers(),
+        test_data.get.example_data_3_csv_wo_headers(),
+    ],
+)
+def test_get_csv_file_probe__matches_csv_helper(csv_file: Path):
+    # Given
+    csv_helper = CSVHelper(csv_file, delimiter=",")
+
+    # When
+    probe = get_csv_file_probe(csv_file)
+
+    # Then
+    assert probe.dialect.delimiter == ","
+    assert probe.columns_count == csv_helper.columns_count
+    assert (
+        probe.first_tabular_row == csv_helper._find_first_tabular_row_idx_and_offset()
+    )
+
+
+MULTILINE_CSV = 'name,sequence\n"oligo\n1",ACGT\noligo_2,TGCA\n\n"oligo,3","AC\nGT"\n'
+
+
+@pytest.mark.parametrize("delimiter", [None, ","])
+@pytest.mark.parametrize("skip_n_rows", range(7))
+def test_csv_reader_factory__seeks_like_skipping_rows(
+    tmp_path: Path, skip_n_rows: int, delimiter
+):
+    # Given
+    csv_file = tmp_path / "multiline.csv"
+    csv_file.write_text(MULTILINE_CSV)
+    with open(csv_file, newline="") as f:
+        reader = csv.reader(f)
+        for _ in range(skip_n_rows):
+            next(reader, None)
+        expected_rows = list(reader)
+        expected_line_num = reader.line_num
+
+    # When
+    csv_reader_factory = CSVReaderFactory(csv_file, skip_n_rows, delimiter=delimiter)
+    with csv_reader_factory.get_csv_reader() as reader:
+        actual_rows = list(reader)
+
+    # Then
+    assert actual_rows == expected_rows
+    assert reader.line_num == expected_line_num
+
+
+SEEK_CSV_PARAMS = [
+    pytest.param(MULTILINE_CSV.encode(), id="multiline"),
+    pytest.param(
+        b"name,sequence\noligo_1,ACGT\r\noligo_2,TGCA\r\n\noligo_3,AA", id="lf"
+    ),
+    pytest.param(b"name,sequence\roligo_1,ACGT\roligo_2,TGCA\r", id="cr"),
+    pytest.param(
+        b'name,seq\noligo_1,ACGT\n"oligo\n2",TGCA\noligo_3,CC\n', id="late_quote"
+    ),
+]
+
+
+@pytest.mark.parametrize("block_size", [1, 3, 7, 1024])
+@pytest.mark.parametrize("contents", SEEK_CSV_PARAMS)
+def test_csv_reader_factory__seeks_to_checkpoint_like_skipping_rows(
+    tmp_path: Path, monkeypatch, contents: bytes, block_size: int
+):
+    # Given
+    monkeypatch.setattr(csv_probe, "_LINE_COUNT_BLOCK_SIZE", block_size)
+    csv_file = tmp_path / "seek.csv"
+    csv_file.write_bytes(contents)
+
+    for skip_n_rows in range(8):
+        with open(csv_file, newline="") as f:
+            reader = csv.reader(f)
+            for _ in range(skip_n_rows):
+                next(reader, None)
+            expected_rows = list(reader)
+            expected_line_num = reader.line_num
+
+        # When
+        csv_reader_factory = CSVReaderFactory(csv_file, skip_n_rows, delimiter=",")
+        with csv_reader_factory.get_csv_reader() as reader:
+            actual_rows = list(reader)
+
+        # Then
+        assert actual_rows == expected_rows
+        assert reader.line_num == expected_line_num
+
+
+def test_line_scan__row_checkpoint_stops_at_first_quote(tmp_path: Path):
+    # Given
+    csv_file = tmp_path / "quoted.csv"
+    csv_file.write_bytes(b'a,b\nc,d\ne,f\n"g\nh",i\nj,k\n')
+
+    # When
+    line_scan = scan_lines(csv_file, block_size=4)
+
+    # Then
+    assert line_scan.line_count == 6
+    assert line_scan.row_checkpoint(2, ('"', None)) == (8, 2)
+    assert line_scan.row_checkpoint(5, ('"', None)) == (12, 3)
+    assert line_scan.row_checkpoint(5, ("'", None)) == (20, 5)
+    assert line_scan.row_checkpoint(5, ("|", None)) == (0, 0)
+
+
+LINE_COUNT_PARAMS = [
+    pytest.param(b"", id="empty"),
+    pytest.param(b"a,b\nc,d\n", id="lf"),
+    pytest.param(b"a,b\nc,d", id="no_trailing_newline"),
+    pytest.param(b"a,b\r\nc,d\r\n", id="crlf"),
+    pytest.param(b"a,b\rc,d\r", id="cr"),
+    pytest.param(b"a,b\r\n\r\nc,d\n\re", id="mixed"),
+    pytest.param(b"\n\n\n", id="blank_lines"),
+]
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 3, 1024])
+@pytest.mark.parametrize("contents", LINE_COUNT_PARAMS)
+def test_count_lines__matches_text_mode(tmp_path: Path, contents: bytes, block_size):
+    # Given
+    csv_file = tmp_path / "lines.csv"
+    csv_file.write_bytes(contents)
+    with open(csv_file, "r") as f:
+        expected_line_count = sum(1 for _ in f)
+
+    # When
+    line_count = count_lines(csv_file, block_size=block_size)
+
+    # Then
+    assert line_count == expected_line_count
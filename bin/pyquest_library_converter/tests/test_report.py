@@ -0,0 +1,51 @@
+from src.report import Report
+
+
+def test_report__summary_counts():
+    # Given
+    report = Report()
+    trimmed_flags = [
+        (True, True),
+        (True, False),
+        (False, True),
+        (False, False),
+        (True, True),
+    ]
+    expected_summary = "\n".join(
+        [
+            "Forward primer trimmed in 3 of 5 sequences.",
+            "Reverse primer trimmed in 3 of 5 sequences.",
+            "Forward + reverse primer trimmed in 2 out of 5 sequences.",
+        ]
+    )
+
+    # When
+    for row_id, (forward, reverse) in enumerate(trimmed_flags, start=1):
+        report.add_row(row_id, forward, reverse)
+
+    # Then
+    assert report.summary() == expected_summary
+    assert list(report.forward_primers_trimmed) == [1, 2, 5]
+    assert list(report.reverse_primers_trimmed) == [1, 3, 5]
+    assert report.both_trimmed == [1, 5]
+
+
+def test_report__primer_mismatches():
+    # Given
+    report = Report()
+    mismatches = [(0, 0), (1, None), (None, 2), (0, 1)]
+
+    # When
+    for row_id, (forward, reverse) in enumerate(mismatches, start=1):
+        report.add_row(row_id, forward is not None, reverse is not None)
+        report.add_primer_mismatches(forward, reverse)
+
+    # Then
+    assert report.forward_primer_mismatches == {0: 2, 1: 1}
+    assert report.reverse_primer_mismatches == {0: 1, 1: 1, 2: 1}
+    summary = report.summary().split("\n")
+    assert summary[-2:] == [
+        "Forward primer trimmed with 0 mismatches (2), 1 mismatch (1).",
+        "Reverse primer trimmed with 0 mismatches (1), 1 mismatch (1), 2 mismatches (1).",
+    ]
+    assert report.to_dict()["reverse_primer_mismatches"] == {"0": 1, "1": 1, "2": 1}
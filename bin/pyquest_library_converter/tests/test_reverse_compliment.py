@@ -1,9 +1,11 @@
 import pytest
-from src.dna.helpers import reverse_complement, reverse_complement_sequences
+from src.dna.helpers import (
+    reverse_complement,
+    reverse_complement_batch,
+    reverse_complement_sequences,
+)
 
 
-EXAMPLE_CSV_HEADER = "sequence"
-
 REV_COMP_PARAMS = [
     pytest.param("AGCT", "AGCT", id="case1"),
     pytest.param("CGTA", "TACG", id="case2"),
@@ -11,6 +13,10 @@ REV_COMP_PARAMS = [
     pytest.param("ATCGATCG", "CGATCGAT", id="case4"),
     pytest.param("", "", id="case5"),
     pytest.param("CCCTGGGAAGGTAATTTTAGATTTC", "GAAATCTAAAATTACCTTCCCAGGG", id="case6"),
+    pytest.param("cgtan", "ntacg", id="lower_case"),
+    pytest.param("AAcgNn", "nNcgTT", id="mixed_case"),
+    pytest.param("RYKMSWBDHV", "BDHVWSKMRY", id="iupac"),
+    pytest.param("ACGT-X", "X-ACGT", id="unknown_chars_kept"),
 ]
 
 
@@ -24,29 +30,46 @@ def test_reverse_complement(input_sequence, expected_output):
 
 
 REV_COMP_SEQUENCES_PARAMS = [
-    pytest.param([{"sequence": "AGCT"}], [{"sequence": "AGCT"}], id="case1"),
-    pytest.param([{"sequence": "CGTA"}], [{"sequence": "TACG"}], id="case2"),
+    pytest.param([(1, "oligo", "AGCT")], [(1, "oligo", "AGCT")], id="case1"),
+    pytest.param([(1, "oligo", "CGTA")], [(1, "oligo", "TACG")], id="case2"),
     pytest.param(
         [
-            {"sequence": "AAAGGGCCCTTT"},
-            {"sequence": "CCCTGGGAAGGTAATTTTAGATTTC"},
+            (1, "oligo", "AAAGGGCCCTTT"),
+            (1, "oligo", "CCCTGGGAAGGTAATTTTAGATTTC"),
         ],
         [
-            {"sequence": "AAAGGGCCCTTT"},
-            {"sequence": "GAAATCTAAAATTACCTTCCCAGGG"},
+            (1, "oligo", "AAAGGGCCCTTT"),
+            (1, "oligo", "GAAATCTAAAATTACCTTCCCAGGG"),
         ],
         id="case3",
     ),
-    pytest.param([{"sequence": "ATCGATCG"}], [{"sequence": "CGATCGAT"}], id="case4"),
+    pytest.param([(1, "oligo", "ATCGATCG")], [(1, "oligo", "CGATCGAT")], id="case4"),
 ]
 
 
 @pytest.mark.parametrize("input_sequence, expected_output", REV_COMP_SEQUENCES_PARAMS)
 def test_reverse_complement_sequences(input_sequence, expected_output):
     # When
-    actual_output = list(
-        reverse_complement_sequences(input_sequence, header=EXAMPLE_CSV_HEADER)
-    )
+    actual_output = list(reverse_complement_sequences(iter(input_sequence)))
+
+    # Then
+    assert actual_output == expected_output
+
+
+REV_COMP_BATCH_PARAMS = [
+    pytest.param([], id="empty_batch"),
+    pytest.param(["AGCT", "CGTA", "", "acgtn"], id="mixed"),
+    pytest.param(["AC\nGT", "CGTA"], id="separator_in_sequence"),
+]
+
+
+@pytest.mark.parametrize("sequences", REV_COMP_BATCH_PARAMS)
+def test_reverse_complement_batch(sequences):
+    # Given
+    expected_output = [reverse_complement(sequence) for sequence in sequences]
+
+    # When
+    actual_output = reverse_complement_batch(sequences)
 
     # Then
     assert actual_output == expected_output
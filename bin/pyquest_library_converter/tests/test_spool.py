@@ -0,0 +1,45 @@
+import pytest
+
+from src.csv.spool import RowSpool
+
+
+SPOOL_PARAMS = [
+    pytest.param([], id="empty"),
+    pytest.param([(1, "oligo_1", "ACGT")], id="single_row"),
+    pytest.param(
+        [
+            (1, "oligo_1", "ACGT"),
+            (3, "oligo_3", "acgtn"),
+            (10, "oligo_10", ""),
+        ],
+        id="non_contiguous_ids",
+    ),
+    pytest.param(
+        [
+            (1, "name,with,commas", "ACGT"),
+            (2, "name\twith\ttabs", "ACGT"),
+            (3, 'name "with" quotes', "ACGT"),
+            (4, "name\nwith\nnewlines", "ACGT"),
+        ],
+        id="special_characters",
+    ),
+]
+
+
+@pytest.mark.parametrize("rows", SPOOL_PARAMS)
+@pytest.mark.parametrize("max_size", [0, 1024 * 1024], ids=["on_disk", "in_memory"])
+def test_row_spool__replays_rows_unchanged(rows, max_size):
+    # Given
+    expected_rows = [tuple(row) for row in rows]
+
+    # When
+    with RowSpool(max_size=max_size) as row_spool:
+        passed_through_rows = list(row_spool.spool(rows))
+        replayed_rows = list(row_spool.rows())
+        replayed_rows_again = list(row_spool.rows())
+
+    # Then
+    assert passed_through_rows == expected_rows
+    assert replayed_rows == expected_rows
+    assert replayed_rows_again == expected_rows
+    assert len(row_spool) == len(expected_rows)
@@ -0,0 +1,166 @@
+import itertools
+
+import pytest
+
+from src.dna import helpers as dna_helpers
+from src.dna.transform import SequenceTransformPlan
+from src.enums import MismatchModel, OligoCasing
+from src.exceptions import UndevelopedFeatureError
+from src.report import Report
+
+
+FORWARD_PRIMER = "AATG"
+REVERSE_PRIMER = "CCGA"
+EXAMPLE_SEQUENCES = [
+    "AATGACGTACGTCCGA",
+    "AATGACGTACGT",
+    "ACGTACGTCCGA",
+    "ACGTNACGT",
+    "",
+]
+
+
+def _make_rows(oligo_case: OligoCasing):
+    rows = []
+    for row_id, sequence in enumerate(EXAMPLE_SEQUENCES, start=1):
+        if oligo_case == OligoCasing.LOWER:
+            sequence = sequence.lower()
+        rows.append((row_id, f"oligo_{row_id}", sequence))
+    return rows
+
+
+def _chain_helpers(rows, forward_primer, reverse_primer, revcomp, oligo_case, report):
+    is_lower = oligo_case == OligoCasing.LOWER
+    if is_lower:
+        rows = dna_helpers.upper_case_sequences(rows)
+    rows = dna_helpers.trim_sequences(
+        rows,
+        forward_primer=forward_primer,
+        reverse_primer=reverse_primer,
+        report=report,
+    )
+    if revcomp:
+        rows = dna_helpers.reverse_complement_sequences(rows)
+    if is_lower:
+        rows = dna_helpers.lower_case_sequences(rows)
+    return list(rows)
+
+
+PLAN_PARAMS = [
+    pytest.param(
+        forward_primer,
+        reverse_primer,
+        revcomp,
+        oligo_case,
+        id=f"fwd={bool(forward_primer)}-rev={bool(reverse_primer)}-revcomp={revcomp}-{oligo_case.value}",
+    )
+    for forward_primer, reverse_primer, revcomp, oligo_case in itertools.product(
+        ["", FORWARD_PRIMER],
+        ["", REVERSE_PRIMER],
+        [False, True],
+        [OligoCasing.UPPER, OligoCasing.LOWER],
+    )
+]
+
+
+@pytest.mark.parametrize(
+    "forward_primer, reverse_primer, revcomp, oligo_case", PLAN_PARAMS
+)
+def test_sequence_transform_plan__matches_helpers(
+    forward_primer, reverse_primer, revcomp, oligo_case
+):
+    # Given
+    rows = _make_rows(oligo_case)
+    expected_report = Report()
+    expected_rows = _chain_helpers(
+        iter(rows), forward_primer, reverse_primer, revcomp, oligo_case, expected_report
+    )
+    plan = SequenceTransformPlan(forward_primer, reverse_primer, revcomp, oligo_case)
+
+    # When
+    report = Report()
+    actual_rows = list(plan.transform_rows(iter(rows), report=report, batch_size=2))
+    batch_report = Report()
+    batch_rows = plan.transform_batch(rows, report=batch_report)
+
+    # Then
+    assert actual_rows == expected_rows
+    assert batch_rows == expected_rows
+    assert report.summary() == expected_report.summary()
+    assert batch_report.summary() == expected_report.summary()
+
+
+def test_sequence_transform_plan__overlapping_primers_raise():
+    # Given
+    plan = SequenceTransformPlan("AATGC", "GCCGA", False, OligoCasing.UPPER)
+
+    # When / Then
+    with pytest.raises(UndevelopedFeatureError):
+        plan.transform_batch([(1, "oligo_1", "AATGCCGA")], report=Report())
+
+
+def test_sequence_transform_plan__with_mismatches_matches_exact_plan():
+    # Given
+    rows = _make_rows(OligoCasing.UPPER)
+    exact_plan = SequenceTransformPlan(
+        FORWARD_PRIMER, REVERSE_PRIMER, False, OligoCasing.UPPER
+    )
+    expected_rows = exact_plan.transform_batch(rows, report=Report())
+    plan = SequenceTransformPlan(
+        FORWARD_PRIMER,
+        REVERSE_PRIMER,
+        False,
+        OligoCasing.UPPER,
+        max_mismatches=1,
+    )
+
+    # When
+    report = Report()
+    actual_rows = plan.transform_batch(rows, report=report)
+
+    # Then
+    assert actual_rows == expected_rows
+    assert report.forward_primer_mismatches == {0: 2}
+    assert report.reverse_primer_mismatches == {0: 2}
+
+
+@pytest.mark.parametrize("mismatch_model", list(MismatchModel))
+@pytest.mark.parametrize("oligo_case", [OligoCasing.UPPER, OligoCasing.LOWER])
+def test_sequence_transform_plan__trims_primers_with_mismatches(
+    mismatch_model, oligo_case
+):
+    # Given
+    sequences = [
+        "AATGACGTACGTCCGA",
+        "AATCACGTACGTCCGA",
+        "AATGACGTACGTCGGA",
+        "ATTCACGTACGTCCGA",
+    ]
+    expected_sequences = ["ACGTACGT", "ACGTACGT", "ACGTACGT", "ATTCACGTACGT"]
+    if oligo_case == OligoCasing.LOWER:
+        sequences = [sequence.lower() for sequence in sequences]
+        expected_sequences = [sequence.lower() for sequence in expected_sequences]
+    rows = [(i, f"oligo_{i}", sequence) for i, sequence in enumerate(sequences, 1)]
+    plan = SequenceTransformPlan(
+        FORWARD_PRIMER,
+        REVERSE_PRIMER,
+        False,
+        oligo_case,
+        max_mismatches=1,
+        mismatch_model=mismatch_model,
+    )
+
+    # When
+    report = Report()
+    actual_rows = list(plan.transform_rows(rows, report=report, batch_size=3))
+
+    # Then
+    assert [sequence for _, _, sequence in actual_rows] == expected_sequences
+    assert list(report.forward_primers_trimmed) == [1, 2, 3]
+    assert list(report.reverse_primers_trimmed) == [1, 2, 3, 4]
+    assert report.forward_primer_mismatches == {0: 2, 1: 1}
+    assert report.reverse_primer_mismatches == {0: 3, 1: 1}
+    assert (
+        "Forward primer trimmed with 0 mismatches (2), 1 mismatch (1)."
+        in report.summary()
+    )
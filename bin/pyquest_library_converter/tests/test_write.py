@@ -0,0 +1,65 @@
+import os
+import stat
+from pathlib import Path
+
+import pytest
+
+from src.csv.write import atomic_output_file
+
+
+@pytest.mark.parametrize("exists", [True, False], ids=["replace", "create"])
+def test_atomic_output_file__writes_output(tmp_path: Path, exists: bool):
+    # Given
+    output_file = tmp_path / "output.tsv"
+    if exists:
+        output_file.write_text("old contents\n")
+
+    # When
+    with atomic_output_file(output_file) as output:
+        output.write("new contents\n")
+
+    # Then
+    assert output_file.read_text() == "new contents\n"
+    assert list(tmp_path.iterdir()) == [output_file]
+
+
+def test_atomic_output_file__error_leaves_output_untouched(tmp_path: Path):
+    # Given
+    output_file = tmp_path / "output.tsv"
+    output_file.write_text("old contents\n")
+
+    # When
+    with pytest.raises(RuntimeError):
+        with atomic_output_file(output_file) as output:
+            output.write("partial contents")
+            raise RuntimeError("Failed while writing")
+
+    # Then
+    assert output_file.read_text() == "old contents\n"
+    assert list(tmp_path.iterdir()) == [output_file]
+
+
+@pytest.mark.parametrize(
+    "existing_mode, expected_mode",
+    [(0o640, 0o640), (0o604, 0o604), (None, 0o644)],
+    ids=["replace", "replace_other_readable", "create"],
+)
+def test_atomic_output_file__output_mode(
+    tmp_path: Path, existing_mode, expected_mode: int
+):
+    # Given
+    output_file = tmp_path / "output.tsv"
+    if existing_mode is not None:
+        output_file.write_text("old contents\n")
+        output_file.chmod(existing_mode)
+    old_umask = os.umask(0o022)
+
+    # When
+    try:
+        with atomic_output_file(output_file) as output:
+            output.write("new contents\n")
+    finally:
+        os.umask(old_umask)
+
+    # Then
+    assert stat.S_IMODE(output_file.stat().st_mode) == expected_mode
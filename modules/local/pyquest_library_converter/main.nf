@@ -28,6 +28,7 @@ process TRANSFORM_LIBRARY_FOR_PYQUEST {
     ${projectDir}/bin/pyquest_library_converter/pyquest_library_converter.py \\
         $input \\
         $output \\
+        --cpus $task.cpus \\
         $options.args
     """
 }